@@ -1,39 +1,59 @@
 """The Essent integration."""
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.importlib import async_import_module
 from homeassistant.helpers.typing import ConfigType
 
 from .const import DOMAIN
-from .coordinator import EssentConfigEntry, EssentDataUpdateCoordinator
+from .services import async_setup_services
+
+if TYPE_CHECKING:
+    from .coordinator import EssentConfigEntry
 
-PLATFORMS: list[Platform] = [Platform.SENSOR]
+PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the Essent integration."""
+    async_setup_services(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: EssentConfigEntry) -> bool:
     """Set up Essent from a config entry."""
-    coordinator = EssentDataUpdateCoordinator(hass, entry)
+    # Imported on first setup, in the executor, so loading the integration
+    # for its config flow or services stays cheap
+    coordinator_module = await async_import_module(hass, f"{__name__}.coordinator")
+    coordinator = coordinator_module.EssentDataUpdateCoordinator(hass, entry)
+    await coordinator.async_load_history()
     await coordinator.async_config_entry_first_refresh()
 
     # Start independent schedules for API fetch and listener updates
     # These will continue running regardless of API success/failure
     coordinator.start_schedules()
+    await coordinator.async_resume_backfill()
 
     entry.async_on_unload(coordinator.async_shutdown)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     entry.runtime_data = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+async def _async_update_listener(
+    hass: HomeAssistant, entry: EssentConfigEntry
+) -> None:
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: EssentConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
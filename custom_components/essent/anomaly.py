@@ -0,0 +1,251 @@
+"""Price anomaly detection against locally retained history.
+
+Each finalized day is reduced to its average price per local hour of day and
+pushed into a window per hour covering the last calendar days; the median and
+the median absolute deviation (MAD) of a window form that hour's baseline.
+Published slots are scored once per new data with the robust z-score of their
+price against the baseline of the hour they start in.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, tzinfo
+from statistics import median
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .history import EssentPriceHistory, HistorySlot
+from .timeline import PriceSlot
+
+BASELINE_DAYS = 28
+# An hour is only scored once its baseline covers this many days
+MIN_BASELINE_DAYS = 7
+# Robust z-score above which a slot is flagged (Iglewicz and Hoaglin)
+SCORE_THRESHOLD = 3.5
+# Scales the MAD to the standard deviation of normally distributed prices
+MAD_SCALE = 0.6745
+# Lower bound of the MAD in the price unit, so hours with nearly flat prices
+# do not flag every fraction of a cent
+MAD_FLOOR = 0.005
+
+ANOMALY_HIGH = "high"
+ANOMALY_LOW = "low"
+HOURS = 24
+
+
+@dataclass(frozen=True, slots=True)
+class HourBaseline:
+    """Median and median absolute deviation of one hour of the day."""
+
+    median: float
+    mad: float
+    days: int
+
+
+@dataclass(frozen=True, slots=True)
+class PriceAnomaly:
+    """A published slot whose price is far from its hour's baseline."""
+
+    start: float
+    end: float
+    price: float
+    median: float
+    score: float
+
+    @property
+    def direction(self) -> str:
+        """Return whether the price is abnormally high or low."""
+        return ANOMALY_HIGH if self.score > 0 else ANOMALY_LOW
+
+
+@dataclass(frozen=True, slots=True)
+class AnomalyReport:
+    """The scoring of the published slots of one energy type."""
+
+    scored: int
+    unscored: int
+    anomalies: tuple[PriceAnomaly, ...]
+
+    @property
+    def max_score(self) -> float | None:
+        """Return the score furthest from zero, if any slot is flagged."""
+        return max(
+            (anomaly.score for anomaly in self.anomalies), key=abs, default=None
+        )
+
+
+def hourly_averages(slots: list[HistorySlot], time_zone: tzinfo) -> dict[int, float]:
+    """Return the average slot price per local hour a day's slots start in."""
+    sums: dict[int, tuple[float, int]] = {}
+    for start, _, price in slots:
+        hour = datetime.fromtimestamp(start, time_zone).hour
+        total, count = sums.get(hour, (0.0, 0))
+        sums[hour] = (total + price, count + 1)
+    return {hour: total / count for hour, (total, count) in sums.items()}
+
+
+def robust_score(price: float, baseline: HourBaseline) -> float:
+    """Return the robust z-score of a price against a baseline."""
+    return MAD_SCALE * (price - baseline.median) / max(baseline.mad, MAD_FLOOR)
+
+
+class _HourWindows:
+    """The average prices per hour of the last days, with a baseline per hour.
+
+    Prices are kept with their date, so a window covers a fixed number of
+    calendar days and days missing from the history are left out of it.
+    """
+
+    def __init__(self) -> None:
+        self._prices: list[deque[tuple[date, float]]] = [
+            deque() for _ in range(HOURS)
+        ]
+        self.baselines: list[HourBaseline | None] = [None] * HOURS
+
+    def advance(self, end: date, days: list[tuple[date, dict[int, float]]]) -> None:
+        """Add the days finalized up to ``end`` and update changed baselines.
+
+        Each window holds at most one price per day, so resolving its median
+        costs the same however long the history is.
+        """
+        changed: set[int] = set()
+        for day, averages in days:
+            for hour, price in averages.items():
+                self._prices[hour].append((day, price))
+                changed.add(hour)
+        first = end - timedelta(days=BASELINE_DAYS)
+        for hour, window in enumerate(self._prices):
+            while window and window[0][0] <= first:
+                window.popleft()
+                changed.add(hour)
+        for hour in changed:
+            if not (prices := [price for _, price in self._prices[hour]]):
+                self.baselines[hour] = None
+                continue
+            center = median(prices)
+            self.baselines[hour] = HourBaseline(
+                median=center,
+                mad=median(abs(value - center) for value in prices),
+                days=len(prices),
+            )
+
+
+class EssentAnomalyDetector:
+    """Scores published prices against per-hour baselines of each energy type.
+
+    The baselines are built from history on the first scoring; after that
+    only the days finalized since are pushed. A day recorded late, at or
+    before the last finalized day, drops the baselines of its energy type
+    so the next scoring rebuilds them.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the detector."""
+        self._windows: dict[str, _HourWindows] = {}
+        self._finalized: dict[str, date] = {}
+        self.reports: dict[str, AnomalyReport] = {}
+
+    @callback
+    def _async_rollover(
+        self, history: EssentPriceHistory, energy_type: str, today: date
+    ) -> None:
+        """Push every day before today that was not pushed yet."""
+        yesterday = today - timedelta(days=1)
+        finalized = self._finalized.get(energy_type)
+        first = max(
+            finalized + timedelta(days=1) if finalized else date.min,
+            today - timedelta(days=BASELINE_DAYS),
+        )
+        if first > yesterday:
+            return
+        time_zone = dt_util.get_default_time_zone()
+        self._windows.setdefault(energy_type, _HourWindows()).advance(
+            yesterday,
+            [
+                (day, hourly_averages(slots, time_zone))
+                for day, slots in history.days(energy_type, first, yesterday)
+                if slots
+            ],
+        )
+        self._finalized[energy_type] = yesterday
+
+    @callback
+    def async_history_changed(self, energy_type: str, day: date) -> bool:
+        """Drop the baselines of an energy type when a finalized day changed.
+
+        Returns whether they were dropped.
+        """
+        finalized = self._finalized.get(energy_type)
+        if finalized is None or day > finalized:
+            return False
+        del self._windows[energy_type]
+        del self._finalized[energy_type]
+        return True
+
+    @callback
+    def async_score(
+        self,
+        history: EssentPriceHistory,
+        energy_type: str,
+        slots: Iterable[PriceSlot],
+        today: date,
+    ) -> AnomalyReport:
+        """Score published slots against the baselines of the days before today.
+
+        One pass over the slots, each looked up in its hour's baseline.
+        """
+        self._async_rollover(history, energy_type, today)
+        baselines = self._windows[energy_type].baselines
+        scored = unscored = 0
+        anomalies: list[PriceAnomaly] = []
+        for slot in slots:
+            if slot.price is None:
+                continue
+            baseline = baselines[slot.start_dt.hour]
+            if baseline is None or baseline.days < MIN_BASELINE_DAYS:
+                unscored += 1
+                continue
+            scored += 1
+            score = robust_score(slot.price, baseline)
+            if abs(score) >= SCORE_THRESHOLD:
+                anomalies.append(
+                    PriceAnomaly(
+                        slot.start,
+                        slot.end,
+                        slot.price,
+                        baseline.median,
+                        round(score, 2),
+                    )
+                )
+        report = self.reports[energy_type] = AnomalyReport(
+            scored, unscored, tuple(anomalies)
+        )
+        return report
+
+    def baseline_days(self, energy_type: str) -> int:
+        """Return the most days any hour's baseline of an energy type covers."""
+        windows = self._windows.get(energy_type)
+        if windows is None:
+            return 0
+        return max(
+            (baseline.days for baseline in windows.baselines if baseline), default=0
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary for diagnostics."""
+        summary: dict[str, Any] = {}
+        for energy_type, finalized in self._finalized.items():
+            report = self.reports.get(energy_type)
+            summary[energy_type] = {
+                "finalized": finalized.isoformat(),
+                "baseline_days": self.baseline_days(energy_type),
+                "scored": report.scored if report else None,
+                "unscored": report.unscored if report else None,
+                "anomalies": len(report.anomalies) if report else None,
+            }
+        return summary
@@ -0,0 +1,284 @@
+"""Backfill of historical Essent prices into the local price history."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from http import HTTPStatus
+import logging
+import time
+from typing import TYPE_CHECKING, Any
+
+from aiohttp import ClientError, ClientSession, ClientTimeout
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+from .const import (
+    API_ENDPOINT,
+    BACKFILL_STORAGE_KEY,
+    BACKFILL_STORAGE_VERSION,
+    DOMAIN,
+    ENERGY_TYPE_ELECTRICITY,
+    ENERGY_TYPE_GAS,
+)
+from .history import HistorySlot
+from .pipeline import normalize_energy_block
+from .schema import validate_price_document
+from .timeline import build_timeline
+
+if TYPE_CHECKING:
+    from .coordinator import EssentDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = BACKFILL_STORAGE_VERSION
+STORAGE_KEY = BACKFILL_STORAGE_KEY
+NOTIFICATION_ID = f"{DOMAIN}_backfill"
+CLIENT_TIMEOUT = ClientTimeout(total=10)
+# At most this many requests in flight, and at least this many seconds
+# between the start of two requests
+BACKFILL_CONCURRENCY = 4
+BACKFILL_REQUEST_INTERVAL = 0.5
+# Days fetched before their prices are written to the history together
+BACKFILL_BATCH_DAYS = 31
+
+ENERGY_TYPES = (ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS)
+
+
+class DateMismatch(Exception):
+    """The API answered a day's request with the documents of other dates."""
+
+    def __init__(self, day: date, returned: list[str | None]) -> None:
+        """Initialize the error."""
+        super().__init__(f"Requested {day}, received {returned}")
+        self.returned = returned
+
+
+@dataclass(slots=True)
+class BackfillProgress:
+    """Progress of a backfill run."""
+
+    start: date
+    end: date
+    total: int
+    skipped: int = 0
+    fetched: int = 0
+    failed: list[str] = field(default_factory=list)
+    # Days answered with the documents of other dates
+    mismatched: list[str] = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+    finished: bool = False
+
+    @property
+    def days_per_second(self) -> float:
+        """Return the fetch throughput so far."""
+        elapsed = time.monotonic() - self.started
+        return self.fetched / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation for diagnostics."""
+        return {
+            "start": self.start.isoformat(),
+            "end": self.end.isoformat(),
+            "total": self.total,
+            "skipped": self.skipped,
+            "fetched": self.fetched,
+            "failed": self.failed,
+            "mismatched": self.mismatched,
+            "days_per_second": round(self.days_per_second, 2),
+            "finished": self.finished,
+        }
+
+
+class EssentBackfill:
+    """Fetch past days from the API and write them to the price history.
+
+    Days already held by the history are skipped, so an interrupted run
+    picks up where it left off. The requested range is persisted until the
+    run completes and is resumed by the coordinator when the integration
+    starts again.
+    """
+
+    def __init__(self, coordinator: EssentDataUpdateCoordinator) -> None:
+        """Initialize the backfill."""
+        self._coordinator = coordinator
+        self.hass = coordinator.hass
+        self._store: Store[dict[str, str]] = Store(
+            self.hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._task: asyncio.Task[None] | None = None
+        self._rate_lock = asyncio.Lock()
+        self._next_request = 0.0
+        self.progress: BackfillProgress | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return whether a backfill is in progress."""
+        return self._task is not None and not self._task.done()
+
+    @callback
+    def async_start(self, start: date, end: date) -> None:
+        """Start backfilling ``[start, end]`` in the background."""
+        coro = self._async_run(start, end)
+        name = f"{DOMAIN} backfill"
+        if (entry := self._coordinator.config_entry) is not None:
+            self._task = entry.async_create_background_task(self.hass, coro, name)
+        else:
+            self._task = self.hass.async_create_background_task(coro, name)
+
+    async def _async_run(self, start: date, end: date) -> None:
+        """Fetch every missing day in batches and record them."""
+        await self._store.async_save(
+            {"start": start.isoformat(), "end": end.isoformat()}
+        )
+        history = self._coordinator.history
+        days = [
+            start + timedelta(days=offset) for offset in range((end - start).days + 1)
+        ]
+        complete = set.intersection(
+            *(
+                {day for day, _ in history.days(energy_type, start, end)}
+                for energy_type in ENERGY_TYPES
+            )
+        )
+        pending = [day for day in days if day not in complete]
+        progress = self.progress = BackfillProgress(
+            start, end, len(days), skipped=len(days) - len(pending)
+        )
+        session = async_get_clientsession(self.hass)
+        semaphore = asyncio.Semaphore(BACKFILL_CONCURRENCY)
+
+        for offset in range(0, len(pending), BACKFILL_BATCH_DAYS):
+            batch = pending[offset : offset + BACKFILL_BATCH_DAYS]
+            results = await asyncio.gather(
+                *(self._async_fetch_day(session, semaphore, day) for day in batch),
+                return_exceptions=True,
+            )
+            recorded: dict[str, dict[str, list[HistorySlot]]] = {
+                energy_type: {} for energy_type in ENERGY_TYPES
+            }
+            for day, slots in zip(batch, results):
+                if isinstance(slots, DateMismatch):
+                    if not progress.mismatched:
+                        _LOGGER.warning(
+                            "The price API answered the backfill of %s with the "
+                            "prices of %s; past dates may not be available",
+                            day,
+                            ", ".join(str(returned) for returned in slots.returned),
+                        )
+                    progress.mismatched.append(day.isoformat())
+                    continue
+                if isinstance(slots, BaseException):
+                    raise slots
+                if slots is None:
+                    progress.failed.append(day.isoformat())
+                    continue
+                progress.fetched += 1
+                for energy_type, day_slots in slots.items():
+                    recorded[energy_type][day.isoformat()] = day_slots
+            for energy_type, recorded_days in recorded.items():
+                history.async_record_days(energy_type, recorded_days)
+            self._async_notify()
+
+        progress.finished = True
+        await self._store.async_remove()
+        self._async_notify()
+
+    async def _async_fetch_day(
+        self, session: ClientSession, semaphore: asyncio.Semaphore, day: date
+    ) -> dict[str, list[HistorySlot]] | None:
+        """Fetch and normalize the document of a single day.
+
+        Raises DateMismatch when the response holds no document of the day.
+        """
+        async with semaphore:
+            await self._async_rate_limit()
+            try:
+                response = await session.get(
+                    API_ENDPOINT,
+                    params={"date": day.isoformat()},
+                    timeout=CLIENT_TIMEOUT,
+                    headers={"Accept": "application/json"},
+                )
+                if response.status != HTTPStatus.OK:
+                    _LOGGER.debug("Backfill of %s returned %s", day, response.status)
+                    return None
+                data = await response.json()
+            except (ClientError, TimeoutError, ValueError) as err:
+                _LOGGER.debug("Backfill of %s failed: %s", day, err)
+                return None
+
+        if (errors := validate_price_document(data)) is not None:
+            _LOGGER.debug("Backfill of %s rejected: %s", day, errors[0])
+            return None
+        document = next(
+            (
+                price
+                for price in data["prices"]
+                if price.get("date") == day.isoformat()
+            ),
+            None,
+        )
+        if document is None:
+            raise DateMismatch(day, [price.get("date") for price in data["prices"]])
+        slots: dict[str, list[HistorySlot]] = {}
+        for energy_type in ENERGY_TYPES:
+            try:
+                block = normalize_energy_block(
+                    document.get(energy_type) or {}, energy_type, None
+                )
+            except UpdateFailed as err:
+                _LOGGER.debug("Backfill of %s skipped: %s", day, err)
+                return None
+            slots[energy_type] = [
+                (slot.start, slot.end, slot.price)
+                for slot in build_timeline(block["tariffs"]).slots
+                if slot.price is not None
+            ]
+        return slots
+
+    async def _async_rate_limit(self) -> None:
+        """Wait until the next request may start."""
+        async with self._rate_lock:
+            now = self.hass.loop.time()
+            if (wait := self._next_request - now) > 0:
+                await asyncio.sleep(wait)
+            self._next_request = (
+                max(now, self._next_request) + BACKFILL_REQUEST_INTERVAL
+            )
+
+    @callback
+    def _async_notify(self) -> None:
+        """Report the progress in a persistent notification."""
+        if (progress := self.progress) is None:
+            return
+        done = progress.skipped + progress.fetched + len(progress.failed)
+        if progress.finished:
+            message = (
+                f"Backfilled {progress.fetched} days from {progress.start} to "
+                f"{progress.end} ({progress.skipped} already present)."
+            )
+        else:
+            message = (
+                f"Backfilling prices from {progress.start} to {progress.end}: "
+                f"{done} of {progress.total} days, "
+                f"{progress.days_per_second:.1f} days per second."
+            )
+        if progress.failed:
+            message += f" {len(progress.failed)} days could not be fetched."
+        if progress.mismatched:
+            message += (
+                f" {len(progress.mismatched)} days were answered with the prices "
+                "of other dates and were not recorded."
+            )
+        persistent_notification.async_create(
+            self.hass,
+            message,
+            title="Essent price backfill",
+            notification_id=NOTIFICATION_ID,
+        )
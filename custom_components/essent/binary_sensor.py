@@ -0,0 +1,269 @@
+"""Binary sensor platform for Essent integration."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_CHEAPEST_HORIZON,
+    CONF_CHEAPEST_SLOTS,
+    DEFAULT_CHEAPEST_HORIZON,
+    DEFAULT_CHEAPEST_SLOTS,
+    ENERGY_TYPE_ELECTRICITY,
+    ENERGY_TYPE_GAS,
+)
+from .coordinator import (
+    EssentConfigEntry,
+    EssentDataUpdateCoordinator,
+    EssentEnergyData,
+)
+from .entity import EssentEntity
+from .timeline import cheapest_windows
+
+PARALLEL_UPDATES = 1
+
+
+@dataclass(frozen=True, kw_only=True)
+class EssentBinarySensorEntityDescription(BinarySensorEntityDescription):
+    """Describes an Essent binary sensor evaluated against fetched data."""
+
+    is_on_fn: Callable[[EssentEnergyData], bool]
+    energy_types: tuple[str, ...] = (ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS)
+
+
+BINARY_SENSORS: tuple[EssentBinarySensorEntityDescription, ...] = (
+    EssentBinarySensorEntityDescription(
+        key="tomorrow_available",
+        name="tomorrow available",
+        is_on_fn=lambda data: data["tomorrow"] is not None,
+    ),
+)
+
+CHEAPEST_SLOTS = BinarySensorEntityDescription(
+    key="cheapest_slots",
+    name="cheapest slots",
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: EssentConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Essent binary sensors."""
+    coordinator: EssentDataUpdateCoordinator = entry.runtime_data
+
+    entities: list[BinarySensorEntity] = [
+        EssentBinarySensor(coordinator, energy_type, description)
+        for energy_type in (ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS)
+        for description in BINARY_SENSORS
+        if energy_type in description.energy_types
+    ]
+    horizon = float(entry.options.get(CONF_CHEAPEST_HORIZON, DEFAULT_CHEAPEST_HORIZON))
+    entities.extend(
+        EssentCheapestSlotsBinarySensor(
+            coordinator, ENERGY_TYPE_ELECTRICITY, count, horizon
+        )
+        for count in _cheapest_slot_counts(entry.options)
+    )
+    async_add_entities(entities)
+
+
+def _cheapest_slot_counts(options: Mapping[str, Any]) -> list[int]:
+    """Return the configured slot counts of the cheapest slots sensors."""
+    counts = cv.ensure_list(options.get(CONF_CHEAPEST_SLOTS, DEFAULT_CHEAPEST_SLOTS))
+    return sorted({int(count) for count in counts})
+
+
+class EssentBinarySensor(EssentEntity, BinarySensorEntity):
+    """Essent binary sensor that only changes when new data is fetched."""
+
+    entity_description: EssentBinarySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: EssentDataUpdateCoordinator,
+        energy_type: str,
+        description: EssentBinarySensorEntityDescription,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, energy_type)
+        self.entity_description = description
+        self._attr_unique_id = f"essent_{energy_type}_{description.key}"
+        self._attr_name = f"{energy_type.capitalize()} {description.name}"
+        self._attr_translation_key = f"{energy_type}_{description.key}"
+        self._written_state: tuple[Any, ...] | None = None
+        self._written_data: Any = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state once per new data or availability change."""
+        data = self.coordinator.data
+        if (
+            self._written_state is not None
+            and self._written_data is data
+            and self._written_state[0] == self.available
+        ):
+            return
+        self._written_data = data
+        state = (self.available, self.is_on)
+        if state == self._written_state:
+            return
+        self._written_state = state
+        self.async_write_ha_state()
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if the binary sensor is on."""
+        if not self.coordinator.data:
+            return None
+        return self.entity_description.is_on_fn(
+            self.coordinator.data[self.energy_type]
+        )
+
+
+class EssentCheapestSlotsBinarySensor(EssentEntity, BinarySensorEntity):
+    """On during the cheapest slots of each day, or of a rolling horizon.
+
+    The on/off windows are selected once per new data and, with a horizon,
+    again at every transition so the horizon moves along with the time. A
+    timer is set at the next transition only, so nothing runs between
+    transitions; listener ticks that bring no new data are ignored.
+    """
+
+    entity_description = CHEAPEST_SLOTS
+
+    def __init__(
+        self,
+        coordinator: EssentDataUpdateCoordinator,
+        energy_type: str,
+        count: int,
+        horizon_hours: float,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, energy_type)
+        self._count = count
+        self._horizon = horizon_hours * 3600 or None
+        self._attr_unique_id = f"essent_{energy_type}_cheapest_{count}_slots"
+        self._attr_name = f"{energy_type.capitalize()} cheapest {count} slots"
+        self._attr_translation_key = f"{energy_type}_{CHEAPEST_SLOTS.key}"
+        self._attr_translation_placeholders = {"count": str(count)}
+        self._windows: list[tuple[float, float]] = []
+        self._windows_data: Any = None
+        self._horizon_end: float | None = None
+        self._written_state: tuple[Any, ...] | None = None
+        self._unsub_transition: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Select the windows and set the first transition timer."""
+        await super().async_added_to_hass()
+        self._async_evaluate()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the transition timer."""
+        await super().async_will_remove_from_hass()
+        self._async_cancel_transition()
+
+    @callback
+    def _async_cancel_transition(self) -> None:
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Reselect the windows when new data arrives."""
+        if (
+            self._windows_data is self.coordinator.data
+            and self._written_state is not None
+            and self._written_state[0] == self.available
+        ):
+            return
+        self._async_evaluate()
+
+    @callback
+    def _handle_transition(self, _: datetime) -> None:
+        """Switch state at a window boundary."""
+        self._unsub_transition = None
+        self._async_evaluate(reanchor=True)
+
+    @callback
+    def _async_select_windows(self, now: float) -> None:
+        """Select the windows of the cheapest slots in the current data."""
+        self._windows_data = self.coordinator.data
+        if not self.coordinator.data:
+            self._windows = []
+            return
+        if self._horizon is None:
+            self._windows = self.coordinator.cheapest_windows(
+                self.energy_type, self._count
+            )
+        else:
+            # The horizon moves on at every transition, so its windows are
+            # selected here rather than kept with the derived data
+            timeline = self.coordinator.timeline(self.energy_type)
+            anchor = slot.start if (slot := timeline.slot_at(now)) else now
+            self._horizon_end = anchor + self._horizon
+            self._windows = cheapest_windows(
+                timeline, self._count, horizon=(anchor, self._horizon_end)
+            )
+        self._attr_extra_state_attributes = {
+            "windows": [
+                {
+                    "start": dt_util.as_local(dt_util.utc_from_timestamp(start)),
+                    "end": dt_util.as_local(dt_util.utc_from_timestamp(end)),
+                }
+                for start, end in self._windows
+            ]
+        }
+
+    @callback
+    def _async_evaluate(self, reanchor: bool = False) -> None:
+        """Update the state and set a timer at the next transition.
+
+        With ``reanchor``, a horizon is moved to start at the current slot.
+        """
+        now = dt_util.utcnow().timestamp()
+        if self._windows_data is not self.coordinator.data or (
+            reanchor and self._horizon is not None
+        ):
+            self._async_select_windows(now)
+
+        windows = self._windows
+        idx = bisect_right(windows, now, key=lambda window: window[0]) - 1
+        is_on = idx >= 0 and now < windows[idx][1]
+        self._attr_is_on = is_on if self.coordinator.data else None
+        transition = windows[idx][1] if is_on else None
+        if transition is None and idx + 1 < len(windows):
+            transition = windows[idx + 1][0]
+        if self._horizon_end is not None and (
+            transition is None or self._horizon_end < transition
+        ):
+            transition = self._horizon_end
+
+        self._async_cancel_transition()
+        if transition is not None:
+            self._unsub_transition = async_track_point_in_utc_time(
+                self.hass,
+                self._handle_transition,
+                dt_util.utc_from_timestamp(transition),
+            )
+
+        state = (self.available, self._attr_is_on, windows)
+        if state == self._written_state:
+            return
+        self._written_state = state
+        self.async_write_ha_state()
@@ -3,10 +3,98 @@ from __future__ import annotations
 
 from typing import Any
 
+import voluptuous as vol
+
 from homeassistant import config_entries
+from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers.selector import (
+    EntitySelector,
+    EntitySelectorConfig,
+    NumberSelector,
+    NumberSelectorConfig,
+    NumberSelectorMode,
+    SelectSelector,
+    SelectSelectorConfig,
+    SelectSelectorMode,
+)
+
+from .const import (
+    CONF_CHEAP_PERCENTILE,
+    CONF_CHEAPEST_HORIZON,
+    CONF_CHEAPEST_SLOTS,
+    CONF_ELECTRICITY_METER,
+    CONF_EXPENSIVE_PERCENTILE,
+    CONF_GAS_METER,
+    CONF_VERY_CHEAP_PERCENTILE,
+    CONF_VERY_EXPENSIVE_PERCENTILE,
+    DEFAULT_CHEAP_PERCENTILE,
+    DEFAULT_CHEAPEST_HORIZON,
+    DEFAULT_CHEAPEST_SLOTS,
+    DEFAULT_EXPENSIVE_PERCENTILE,
+    DEFAULT_VERY_CHEAP_PERCENTILE,
+    DEFAULT_VERY_EXPENSIVE_PERCENTILE,
+    DOMAIN,
+    MAX_CHEAPEST_SLOTS,
+)
+
+PERCENTILE_SELECTOR = NumberSelector(
+    NumberSelectorConfig(
+        min=0, max=100, step=1, unit_of_measurement="%", mode=NumberSelectorMode.BOX
+    )
+)
 
-from .const import DOMAIN
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_ELECTRICITY_METER): EntitySelector(
+            EntitySelectorConfig(domain="sensor", device_class=SensorDeviceClass.ENERGY)
+        ),
+        vol.Optional(CONF_GAS_METER): EntitySelector(
+            EntitySelectorConfig(domain="sensor", device_class=SensorDeviceClass.GAS)
+        ),
+        vol.Optional(
+            CONF_VERY_CHEAP_PERCENTILE, default=DEFAULT_VERY_CHEAP_PERCENTILE
+        ): PERCENTILE_SELECTOR,
+        vol.Optional(
+            CONF_CHEAP_PERCENTILE, default=DEFAULT_CHEAP_PERCENTILE
+        ): PERCENTILE_SELECTOR,
+        vol.Optional(
+            CONF_EXPENSIVE_PERCENTILE, default=DEFAULT_EXPENSIVE_PERCENTILE
+        ): PERCENTILE_SELECTOR,
+        vol.Optional(
+            CONF_VERY_EXPENSIVE_PERCENTILE, default=DEFAULT_VERY_EXPENSIVE_PERCENTILE
+        ): PERCENTILE_SELECTOR,
+        vol.Optional(
+            CONF_CHEAPEST_SLOTS, default=[str(DEFAULT_CHEAPEST_SLOTS)]
+        ): SelectSelector(
+            SelectSelectorConfig(
+                options=["1", "2", "3", "4", "6", "8", "12"],
+                multiple=True,
+                custom_value=True,
+                mode=SelectSelectorMode.DROPDOWN,
+            )
+        ),
+        vol.Optional(
+            CONF_CHEAPEST_HORIZON, default=DEFAULT_CHEAPEST_HORIZON
+        ): NumberSelector(
+            NumberSelectorConfig(
+                min=0,
+                max=48,
+                step=1,
+                unit_of_measurement="h",
+                mode=NumberSelectorMode.BOX,
+            )
+        ),
+    }
+)
+
+
+def _valid_slot_counts(counts: list[str]) -> bool:
+    """Return whether every cheapest slot count is a whole number in range."""
+    return bool(counts) and all(
+        count.isdigit() and 1 <= int(count) <= MAX_CHEAPEST_SLOTS for count in counts
+    )
 
 
 class EssentConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -14,6 +102,14 @@ class EssentConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> EssentOptionsFlow:
+        """Return the options flow handler."""
+        return EssentOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -27,3 +123,33 @@ class EssentConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         await self.async_set_unique_id(DOMAIN)
         self._abort_if_unique_id_configured()
         return self.async_create_entry(title="Essent", data={})
+
+
+class EssentOptionsFlow(config_entries.OptionsFlow):
+    """Handle Essent options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage cost tracking meters, price levels and cheapest slots."""
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if not (
+                user_input[CONF_VERY_CHEAP_PERCENTILE]
+                <= user_input[CONF_CHEAP_PERCENTILE]
+                < user_input[CONF_EXPENSIVE_PERCENTILE]
+                <= user_input[CONF_VERY_EXPENSIVE_PERCENTILE]
+            ):
+                errors["base"] = "invalid_thresholds"
+            elif not _valid_slot_counts(user_input[CONF_CHEAPEST_SLOTS]):
+                errors[CONF_CHEAPEST_SLOTS] = "invalid_cheapest_slots"
+            else:
+                return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, user_input or self.config_entry.options
+            ),
+            errors=errors,
+        )
@@ -10,6 +10,12 @@ API_ENDPOINT: Final = (
     "https://www.essent.nl/api/public/tariffmanagement/dynamic-prices/v1/"
 )
 UPDATE_INTERVAL: Final = timedelta(hours=1)
+# On-demand refreshes within this interval of the last fetch are answered
+# from the cached data
+REFRESH_MIN_INTERVAL: Final = timedelta(minutes=1)
+# Listener updates within this window of a slot boundary are coalesced into
+# the update at the boundary
+FANOUT_COALESCE_WINDOW: Final = timedelta(seconds=10)
 ATTRIBUTION: Final = "Data provided by Essent"
 
 # Energy types
@@ -20,3 +26,92 @@ ENERGY_TYPE_GAS: Final = "gas"
 PRICE_GROUP_MARKET: Final = "MARKET_PRICE"
 PRICE_GROUP_PURCHASING_FEE: Final = "PURCHASING_FEE"
 PRICE_GROUP_TAX: Final = "TAX"
+
+# Options
+CONF_ELECTRICITY_METER: Final = "electricity_meter"
+CONF_GAS_METER: Final = "gas_meter"
+
+# Locally retained price history
+HISTORY_RETENTION_DAYS: Final = 400
+FORECAST_HISTORY_DAYS: Final = 28
+FORECAST_MIN_HISTORY_DAYS: Final = 3
+FORECAST_ENERGY_TYPES: Final = (ENERGY_TYPE_ELECTRICITY,)
+
+# Services
+SERVICE_GET_FORECAST: Final = "get_forecast"
+SERVICE_GET_PRICE_AT: Final = "get_price_at"
+SERVICE_BACKFILL: Final = "backfill"
+SERVICE_REFRESH: Final = "refresh"
+SERVICE_COMPARE_CONTRACT: Final = "compare_contract"
+SERVICE_PROFILE: Final = "profile"
+SERVICE_GET_ANOMALIES: Final = "get_anomalies"
+ATTR_ENERGY_TYPE: Final = "energy_type"
+ATTR_TIMESTAMPS: Final = "timestamps"
+ATTR_RESOLUTION: Final = "resolution"
+ATTR_START_DATE: Final = "start_date"
+ATTR_END_DATE: Final = "end_date"
+ATTR_STATISTIC_ID: Final = "statistic_id"
+ATTR_FIXED_PRICE: Final = "fixed_price"
+ATTR_FIXED_DAILY_FEE: Final = "fixed_daily_fee"
+ATTR_DYNAMIC_DAILY_FEE: Final = "dynamic_daily_fee"
+ATTR_TRACE_ALLOCATIONS: Final = "trace_allocations"
+ATTR_TOP: Final = "top"
+
+# Resolutions of the resampled timeline views
+RESOLUTION_QUARTER_HOUR: Final = "15min"
+RESOLUTION_HOUR: Final = "hour"
+RESOLUTION_DAY: Final = "day"
+RESOLUTIONS: Final = [RESOLUTION_QUARTER_HOUR, RESOLUTION_HOUR, RESOLUTION_DAY]
+
+# Fired when a refresh brings new or changed prices
+EVENT_PRICES_UPDATED: Final = f"{DOMAIN}_prices_updated"
+
+# Dispatched with the coordinator once per new data, and with None on unload
+SIGNAL_DATA_PROCESSED: Final = f"{DOMAIN}_data_processed"
+
+# Storage of an unfinished backfill run, read at setup to resume it
+BACKFILL_STORAGE_VERSION: Final = 1
+BACKFILL_STORAGE_KEY: Final = f"{DOMAIN}.backfill"
+
+# Outcomes of an on-demand refresh
+REFRESH_FETCHED: Final = "fetched"
+REFRESH_FAILED: Final = "failed"
+REFRESH_TOO_SOON: Final = "too_soon"
+
+# Raw API responses kept for diagnostics
+RESPONSE_LOG_SIZE: Final = 24
+RESPONSE_LOG_MAX_BYTES: Final = 256 * 1024
+
+# Price levels, classified by a slot's percentile within its day
+PRICE_LEVEL_VERY_CHEAP: Final = "very_cheap"
+PRICE_LEVEL_CHEAP: Final = "cheap"
+PRICE_LEVEL_NORMAL: Final = "normal"
+PRICE_LEVEL_EXPENSIVE: Final = "expensive"
+PRICE_LEVEL_VERY_EXPENSIVE: Final = "very_expensive"
+PRICE_LEVELS: Final = [
+    PRICE_LEVEL_VERY_CHEAP,
+    PRICE_LEVEL_CHEAP,
+    PRICE_LEVEL_NORMAL,
+    PRICE_LEVEL_EXPENSIVE,
+    PRICE_LEVEL_VERY_EXPENSIVE,
+]
+CHEAP_PRICE_LEVELS: Final = frozenset({PRICE_LEVEL_VERY_CHEAP, PRICE_LEVEL_CHEAP})
+PEAK_PRICE_LEVELS: Final = frozenset(
+    {PRICE_LEVEL_EXPENSIVE, PRICE_LEVEL_VERY_EXPENSIVE}
+)
+CONF_VERY_CHEAP_PERCENTILE: Final = "very_cheap_percentile"
+CONF_CHEAP_PERCENTILE: Final = "cheap_percentile"
+CONF_EXPENSIVE_PERCENTILE: Final = "expensive_percentile"
+CONF_VERY_EXPENSIVE_PERCENTILE: Final = "very_expensive_percentile"
+DEFAULT_VERY_CHEAP_PERCENTILE: Final = 10
+DEFAULT_CHEAP_PERCENTILE: Final = 30
+DEFAULT_EXPENSIVE_PERCENTILE: Final = 70
+DEFAULT_VERY_EXPENSIVE_PERCENTILE: Final = 90
+
+# Binary sensors, one per slot count, that are on during the cheapest slots of
+# each day, or of a rolling horizon when one is set
+CONF_CHEAPEST_SLOTS: Final = "cheapest_slots"
+CONF_CHEAPEST_HORIZON: Final = "cheapest_horizon"
+DEFAULT_CHEAPEST_SLOTS: Final = 4
+MAX_CHEAPEST_SLOTS: Final = 96
+DEFAULT_CHEAPEST_HORIZON: Final = 0
@@ -0,0 +1,214 @@
+"""Compare recorded consumption on the dynamic and a fixed tariff.
+
+Hourly consumption statistics are read from the recorder one chunk of days
+at a time and priced with a single sorted merge against the locally retained
+slot prices. Only per-month totals are kept between chunks, so memory stays
+bounded whatever the length of the range.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, tzinfo
+
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.statistics import (
+    get_metadata,
+    statistics_during_period,
+)
+from homeassistant.const import UnitOfEnergy, UnitOfVolume
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util.unit_conversion import EnergyConverter, VolumeConverter
+
+from .const import ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS
+from .history import EssentPriceHistory, HistorySlot
+
+CHUNK_DAYS = 7
+PRICE_UNITS = {
+    ENERGY_TYPE_ELECTRICITY: UnitOfEnergy.KILO_WATT_HOUR,
+    ENERGY_TYPE_GAS: UnitOfVolume.CUBIC_METERS,
+}
+
+# Hourly consumption as (start, end, change) with UTC epoch bounds
+type ConsumptionRow = tuple[float, float, float]
+
+
+class UnknownStatistic(Exception):
+    """The statistic does not exist in the recorder."""
+
+
+class IncompatibleUnit(Exception):
+    """The statistic is not recorded in a unit prices can be applied to."""
+
+    def __init__(self, unit: str | None, target: str) -> None:
+        """Initialize the error."""
+        super().__init__(f"Cannot convert {unit} to {target}")
+        self.unit = unit
+        self.target = target
+
+
+@dataclass(frozen=True, slots=True)
+class FixedTariff:
+    """Price per unit and daily standing charges to compare against."""
+
+    price: float
+    daily_fee: float = 0.0
+    dynamic_daily_fee: float = 0.0
+
+
+@dataclass(slots=True)
+class MonthTotals:
+    """Consumption and dynamic energy cost of one local calendar month.
+
+    Hours are only priced when retained slots cover them completely; the
+    consumption of other hours is counted as unpriced and left out of both
+    costs, so the comparison is like for like.
+    """
+
+    days: int
+    hours: int = 0
+    consumption: float = 0.0
+    unpriced_hours: int = 0
+    unpriced_consumption: float = 0.0
+    dynamic_energy_cost: float = 0.0
+
+    @property
+    def priced_consumption(self) -> float:
+        """Return the consumption in hours with a known dynamic price."""
+        return self.consumption - self.unpriced_consumption
+
+
+def month_key(day: date) -> str:
+    """Return the ``YYYY-MM`` key of the month a day is in."""
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def empty_months(start: date, end: date) -> dict[str, MonthTotals]:
+    """Return empty totals for every month in ``[start, end]``, in order."""
+    months: dict[str, MonthTotals] = {}
+    day = start
+    while day <= end:
+        key = month_key(day)
+        if key in months:
+            months[key].days += 1
+        else:
+            months[key] = MonthTotals(days=1)
+        day += timedelta(days=1)
+    return months
+
+
+def price_chunk(
+    rows: list[ConsumptionRow],
+    slots: list[HistorySlot],
+    time_zone: tzinfo,
+    months: dict[str, MonthTotals],
+) -> None:
+    """Price a chunk of hourly consumption and add it to the month totals.
+
+    Both inputs are sorted by start, so one pass advances a single slot
+    index. Runs in the executor.
+    """
+    idx = 0
+    count = len(slots)
+    for start, end, change in rows:
+        local = datetime.fromtimestamp(start, time_zone)
+        totals = months[month_key(local.date())]
+        totals.hours += 1
+        totals.consumption += change
+        while idx < count and slots[idx][1] <= start:
+            idx += 1
+        covered = weighted = 0.0
+        current = idx
+        while current < count and slots[current][0] < end:
+            slot_start, slot_end, price = slots[current]
+            overlap = min(slot_end, end) - max(slot_start, start)
+            if overlap > 0:
+                covered += overlap
+                weighted += price * overlap
+            current += 1
+        if covered < end - start - 1e-6:
+            totals.unpriced_hours += 1
+            totals.unpriced_consumption += change
+            continue
+        totals.dynamic_energy_cost += change * weighted / covered
+
+
+def _statistic_units(
+    hass: HomeAssistant, statistic_id: str, target: str
+) -> dict[str, str] | None:
+    """Return the unit conversion that reads a statistic in the price unit."""
+    if not (metadata := get_metadata(hass, statistic_ids={statistic_id})):
+        raise UnknownStatistic(statistic_id)
+    unit = metadata[statistic_id][1]["unit_of_measurement"]
+    if unit == target:
+        return None
+    for converter in (EnergyConverter, VolumeConverter):
+        if unit in converter.VALID_UNITS and target in converter.VALID_UNITS:
+            return {converter.UNIT_CLASS: target}
+    raise IncompatibleUnit(unit, target)
+
+
+def _hourly_consumption(
+    hass: HomeAssistant,
+    statistic_id: str,
+    start: datetime,
+    end: datetime,
+    units: dict[str, str] | None,
+) -> list[ConsumptionRow]:
+    """Read the hourly consumption of a statistic in ``[start, end)``."""
+    stats = statistics_during_period(
+        hass, start, end, {statistic_id}, "hour", units, {"change"}
+    )
+    return [
+        (row["start"], row["end"], row["change"])
+        for row in stats.get(statistic_id, [])
+        if row.get("change") is not None
+    ]
+
+
+async def async_compare_contract(
+    hass: HomeAssistant,
+    history: EssentPriceHistory,
+    energy_type: str,
+    statistic_id: str,
+    start: date,
+    end: date,
+) -> dict[str, MonthTotals]:
+    """Price recorded consumption in ``[start, end]`` per local month.
+
+    Raises ``UnknownStatistic`` or ``IncompatibleUnit`` when the statistic
+    cannot be priced.
+    """
+    recorder = get_instance(hass)
+    time_zone = dt_util.get_default_time_zone()
+    units = await recorder.async_add_executor_job(
+        _statistic_units, hass, statistic_id, PRICE_UNITS[energy_type]
+    )
+    months = empty_months(start, end)
+    chunk_start = start
+    while chunk_start <= end:
+        chunk_end = min(chunk_start + timedelta(days=CHUNK_DAYS - 1), end)
+        rows = await recorder.async_add_executor_job(
+            _hourly_consumption,
+            hass,
+            statistic_id,
+            dt_util.start_of_local_day(chunk_start),
+            dt_util.start_of_local_day(chunk_end + timedelta(days=1)),
+            units,
+        )
+        if rows:
+            # Slots are kept under their local start date, so a daily gas
+            # slot covering the first hours started the day before
+            slots = [
+                slot
+                for _, day_slots in history.days(
+                    energy_type, chunk_start - timedelta(days=1), chunk_end
+                )
+                for slot in day_slots
+            ]
+            await hass.async_add_executor_job(
+                price_chunk, rows, slots, time_zone, months
+            )
+        chunk_start = chunk_end + timedelta(days=1)
+    return months
@@ -2,57 +2,142 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
-from datetime import datetime, timedelta
-from http import HTTPStatus
+import asyncio
+from bisect import bisect_right
+from collections import Counter, deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 import logging
 import random
-from typing import Any, TypedDict
-
-from aiohttp import ClientError, ClientTimeout
+from typing import TYPE_CHECKING, Any
+import zlib
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfEnergy, UnitOfVolume
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_track_point_in_utc_time
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.importlib import async_import_module
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import dt as dt_util
 
-from .const import API_ENDPOINT, DOMAIN, UPDATE_INTERVAL
+from .const import (
+    BACKFILL_STORAGE_KEY,
+    BACKFILL_STORAGE_VERSION,
+    CONF_CHEAP_PERCENTILE,
+    CONF_EXPENSIVE_PERCENTILE,
+    CONF_VERY_CHEAP_PERCENTILE,
+    CONF_VERY_EXPENSIVE_PERCENTILE,
+    DEFAULT_CHEAP_PERCENTILE,
+    DEFAULT_EXPENSIVE_PERCENTILE,
+    DEFAULT_VERY_CHEAP_PERCENTILE,
+    DEFAULT_VERY_EXPENSIVE_PERCENTILE,
+    DOMAIN,
+    EVENT_PRICES_UPDATED,
+    FANOUT_COALESCE_WINDOW,
+    FORECAST_ENERGY_TYPES,
+    FORECAST_HISTORY_DAYS,
+    FORECAST_MIN_HISTORY_DAYS,
+    REFRESH_FAILED,
+    REFRESH_FETCHED,
+    REFRESH_MIN_INTERVAL,
+    REFRESH_TOO_SOON,
+    RESPONSE_LOG_MAX_BYTES,
+    RESPONSE_LOG_SIZE,
+    SIGNAL_DATA_PROCESSED,
+    UPDATE_INTERVAL,
+)
+from .anomaly import EssentAnomalyDetector, PriceAnomaly
+from .history import EssentPriceHistory
+from .pipeline import (
+    ENERGY_TYPES,
+    EssentApiSource,
+    EssentData,
+    EssentDayAggregates,
+    EssentEnergyData,
+    PricePipeline,
+    PriceSource,
+)
+from .rolling import EssentRollingStats, RollingAggregate
+from .timeline import (
+    PriceSlot,
+    PriceTimeline,
+    SlotRanking,
+    build_timeline,
+    cheapest_windows,
+    rank_slots,
+    resample,
+)
+
+if TYPE_CHECKING:
+    from .backfill import EssentBackfill
+    from .forecast import ForecastResult
 
 _LOGGER = logging.getLogger(__name__)
-CLIENT_TIMEOUT = ClientTimeout(total=10)
 
 
-class EssentEnergyData(TypedDict):
-    """Data for a single Essent energy type."""
+@dataclass(frozen=True, slots=True)
+class EssentPriceSnapshot:
+    """Prices for one energy type as seen at a single listener tick."""
 
-    tariffs: list[dict[str, Any]]
-    tariffs_tomorrow: list[dict[str, Any]]
+    energy_type: str
     unit: str
-    min_price: float
-    avg_price: float
-    max_price: float
+    current: PriceSlot | None
+    next: PriceSlot | None
+    min_price: float | None
+    avg_price: float | None
+    max_price: float | None
+    cheapest: PriceSlot | None
+    most_expensive: PriceSlot | None
+    current_rank: int | None
+    current_percentile: float | None
+    current_level: str | None
+    tomorrow: EssentDayAggregates | None
+    rolling: dict[int, RollingAggregate]
+    # Flagged slots that have not ended; None until a slot could be scored
+    anomalies: tuple[PriceAnomaly, ...] | None
 
 
-type EssentData = dict[str, EssentEnergyData]
 type EssentConfigEntry = ConfigEntry["EssentDataUpdateCoordinator"]
 
 
-def _tariff_sort_key(tariff: dict[str, Any]) -> str:
-    """Sort key for tariffs based on start time."""
-    return tariff.get("startDateTime", "")
-
-
-def _normalize_unit(unit: str) -> str:
-    """Normalize unit strings to HA's canonical constants."""
-    unit_normalized = unit.replace("³", "3").lower()
-    if unit_normalized == "kwh":
-        return UnitOfEnergy.KILO_WATT_HOUR
-    if unit_normalized in {"m3", "m^3"}:
-        return UnitOfVolume.CUBIC_METERS
-    return unit
+def _run_starts(slots: list[PriceSlot], matches: Iterable[bool]) -> list[float]:
+    """Return the starts of the runs of contiguous matching slots."""
+    starts: list[float] = []
+    previous_end = None
+    for slot, match in zip(slots, matches):
+        if match:
+            if slot.start != previous_end:
+                starts.append(slot.start)
+            previous_end = slot.end
+        else:
+            previous_end = None
+    return starts
+
+
+@dataclass(frozen=True, slots=True)
+class RecordedResponse:
+    """A raw API response kept for diagnostics, with its body compressed."""
+
+    fetched_at: datetime
+    latency: float
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    body_size: int
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation, decompressing the body."""
+        return {
+            "fetched_at": self.fetched_at.isoformat(),
+            "latency_ms": round(self.latency * 1000, 1),
+            "status": self.status,
+            "headers": self.headers,
+            "body_size": self.body_size,
+            "compressed_size": len(self.body),
+            "body": zlib.decompress(self.body).decode("utf-8", errors="replace"),
+        }
 
 
 class EssentDataUpdateCoordinator(DataUpdateCoordinator[EssentData]):
@@ -61,7 +146,10 @@ class EssentDataUpdateCoordinator(DataUpdateCoordinator[EssentData]):
     config_entry: EssentConfigEntry | None
 
     def __init__(
-        self, hass: HomeAssistant, config_entry: EssentConfigEntry | None = None
+        self,
+        hass: HomeAssistant,
+        config_entry: EssentConfigEntry | None = None,
+        source: PriceSource | None = None,
     ) -> None:
         """Initialize."""
         super().__init__(
@@ -71,16 +159,55 @@ class EssentDataUpdateCoordinator(DataUpdateCoordinator[EssentData]):
             name=DOMAIN,
             update_interval=None,  # explicit scheduling
         )
+        self.pipeline = PricePipeline(source or EssentApiSource(hass))
         self._unsub_data: Callable[[], None] | None = None
-        self._unsub_listener: Callable[[], None] | None = None
+        # Listener ticks run per energy type, at that type's slot boundaries
+        self._unsub_ticks: dict[str, Callable[[], None]] = {}
+        self._next_ticks: dict[str, datetime] = {}
+        self.tick_counts: Counter[str] = Counter()
+        # Last listener update per energy type, as (time, data, success), and
+        # whether the next update must reach the listeners uncoalesced
+        self._fanouts: dict[str, tuple[datetime, EssentData, bool]] = {}
+        self._force_fanout = False
+        self.coalesced_fanouts = 0
         # Random minute offset for API fetches (0-59 minutes)
         self._api_fetch_minute_offset = random.randint(0, 59)
+        # Values derived from the data (timelines, day extremes), rebuilt
+        # lazily whenever a new data snapshot arrives
+        self._derived: dict[tuple[str, str], Any] = {}
+        self._derived_source: EssentData | None = None
+        # Per-tick view of the prices, shared by all entities
+        self._snapshots: dict[str, EssentPriceSnapshot] = {}
+        self._snapshots_source: EssentData | None = None
+        self._processed_data: EssentData | None = None
+        self.history = EssentPriceHistory(hass)
+        self.history.async_add_listener(self._async_history_changed)
+        self.rolling = EssentRollingStats(hass)
+        self._rollover_day: date | None = None
+        self.anomalies = EssentAnomalyDetector()
+        # Created on the first backfill, so setup does not import it
+        self.backfill: EssentBackfill | None = None
+        self.forecasts: dict[str, ForecastResult] = {}
+        self._forecast_triggers: dict[str, str | None] = {}
+        # Published slots per energy type, to tell new prices from old ones
+        self._fingerprints: dict[str, int] = {}
+        self._published: dict[str, dict[float, tuple[float, float | None]]] = {}
+        self._had_tomorrow: dict[str, bool] = {}
+        self._responses: deque[RecordedResponse] = deque(maxlen=RESPONSE_LOG_SIZE)
+        self.last_fetch_attempt: datetime | None = None
+        self.data_fetched_at: datetime | None = None
+        self._on_demand_refresh: asyncio.Task[str] | None = None
 
     @property
     def api_fetch_minute_offset(self) -> int:
         """Return the configured minute offset for API fetches."""
         return self._api_fetch_minute_offset
 
+    @property
+    def recent_responses(self) -> list[RecordedResponse]:
+        """Return the most recent raw API responses, oldest first."""
+        return list(self._responses)
+
     @property
     def api_refresh_scheduled(self) -> bool:
         """Return whether the API refresh task is scheduled."""
@@ -89,7 +216,522 @@ class EssentDataUpdateCoordinator(DataUpdateCoordinator[EssentData]):
     @property
     def listener_tick_scheduled(self) -> bool:
         """Return whether the listener tick task is scheduled."""
-        return self._unsub_listener is not None
+        return bool(self._unsub_ticks)
+
+    @property
+    def listener_ticks(self) -> dict[str, dict[str, Any]]:
+        """Return the tick count and next tick of every energy type."""
+        return {
+            energy_type: {
+                "ticks": self.tick_counts[energy_type],
+                "next_tick": (
+                    next_tick.isoformat()
+                    if (next_tick := self._next_ticks.get(energy_type))
+                    else None
+                ),
+            }
+            for energy_type in ENERGY_TYPES
+        }
+
+    def _derived_cache(self) -> dict[tuple[str, str], Any]:
+        """Return the cache of values derived from the current data."""
+        if self._derived_source is not self.data:
+            self._derived = {}
+            self._derived_source = self.data
+        return self._derived
+
+    def timeline(self, energy_type: str) -> PriceTimeline:
+        """Return the merged today+tomorrow timeline for an energy type."""
+        cache = self._derived_cache()
+        if (timeline := cache.get(("timeline", energy_type))) is None:
+            block = self.data.get(energy_type) if self.data else None
+            tariffs: list[dict[str, Any]] = (
+                block["tariffs"] + block.get("tariffs_tomorrow", []) if block else []
+            )
+            timeline = cache[("timeline", energy_type)] = build_timeline(tariffs)
+        return timeline
+
+    def resampled(self, energy_type: str, resolution: str) -> PriceTimeline:
+        """Return the timeline at a fixed resolution, built once per data."""
+        cache = self._derived_cache()
+        key = (f"resampled_{resolution}", energy_type)
+        if (timeline := cache.get(key)) is None:
+            timeline = cache[key] = resample(self.timeline(energy_type), resolution)
+        return timeline
+
+    def cheapest_windows(
+        self, energy_type: str, count: int
+    ) -> list[tuple[float, float]]:
+        """Return the windows of the cheapest slots per day, built once per data."""
+        cache = self._derived_cache()
+        key = (f"cheapest_{count}", energy_type)
+        if (windows := cache.get(key)) is None:
+            windows = cache[key] = cheapest_windows(self.timeline(energy_type), count)
+        return windows
+
+    def level_starts(self, energy_type: str, levels: frozenset[str]) -> list[float]:
+        """Return the starts of the runs of slots at one of the given levels."""
+        cache = self._derived_cache()
+        key = (f"level_starts_{sorted(levels)}", energy_type)
+        if (starts := cache.get(key)) is None:
+            starts = cache[key] = _run_starts(
+                self.timeline(energy_type).slots,
+                (level in levels for level in self.ranking(energy_type).levels),
+            )
+        return starts
+
+    def price_below_starts(self, energy_type: str, threshold: float) -> list[float]:
+        """Return the starts of the runs of slots priced below a threshold."""
+        cache = self._derived_cache()
+        key = (f"price_below_{threshold}", energy_type)
+        if (starts := cache.get(key)) is None:
+            starts = cache[key] = _run_starts(
+                self.timeline(energy_type).slots,
+                (
+                    slot.price is not None and slot.price < threshold
+                    for slot in self.timeline(energy_type).slots
+                ),
+            )
+        return starts
+
+    def level_changes(
+        self, energy_type: str, levels: frozenset[str] | None = None
+    ) -> list[float]:
+        """Return the slot starts where the level changes, to one of ``levels``.
+
+        A slot after a gap in the timeline counts as a change.
+        """
+        cache = self._derived_cache()
+        key = (f"level_changes_{sorted(levels) if levels else None}", energy_type)
+        if (changes := cache.get(key)) is None:
+            changes = cache[key] = []
+            # End and level of the previous slot; a contiguous slot at the
+            # same level compares equal to its own start and level
+            previous: tuple[float, str | None] | None = None
+            for slot, level in zip(
+                self.timeline(energy_type).slots, self.ranking(energy_type).levels
+            ):
+                if (
+                    level is not None
+                    and (previous is None or previous != (slot.start, level))
+                    and (levels is None or level in levels)
+                ):
+                    changes.append(slot.start)
+                previous = (slot.end, level)
+        return changes
+
+    def slot_ends(self, energy_type: str) -> list[float]:
+        """Return the end of every timeline slot."""
+        cache = self._derived_cache()
+        if (ends := cache.get(("slot_ends", energy_type))) is None:
+            ends = cache[("slot_ends", energy_type)] = [
+                slot.end for slot in self.timeline(energy_type).slots
+            ]
+        return ends
+
+    def slot_boundaries(self, energy_type: str) -> list[float]:
+        """Return the sorted starts and ends of the timeline slots."""
+        cache = self._derived_cache()
+        if (boundaries := cache.get(("slot_boundaries", energy_type))) is None:
+            slots = self.timeline(energy_type).slots
+            boundaries = cache[("slot_boundaries", energy_type)] = sorted(
+                {slot.start for slot in slots} | {slot.end for slot in slots}
+            )
+        return boundaries
+
+    def _day_extremes(
+        self, energy_type: str
+    ) -> tuple[PriceSlot | None, PriceSlot | None]:
+        """Return the first cheapest and most expensive slot of today."""
+        cache = self._derived_cache()
+        if (extremes := cache.get(("extremes", energy_type))) is None:
+            today = {id(tariff) for tariff in self.data[energy_type]["tariffs"]}
+            slots = [
+                slot
+                for slot in self.timeline(energy_type).slots
+                if slot.price is not None and id(slot.tariff) in today
+            ]
+            extremes = cache[("extremes", energy_type)] = (
+                min(slots, key=lambda slot: slot.price, default=None),
+                max(slots, key=lambda slot: slot.price, default=None),
+            )
+        return extremes
+
+    @property
+    def level_thresholds(self) -> tuple[float, float, float, float]:
+        """Return the percentile bounds of the price levels."""
+        options = self.config_entry.options if self.config_entry else {}
+        return (
+            options.get(CONF_VERY_CHEAP_PERCENTILE, DEFAULT_VERY_CHEAP_PERCENTILE),
+            options.get(CONF_CHEAP_PERCENTILE, DEFAULT_CHEAP_PERCENTILE),
+            options.get(CONF_EXPENSIVE_PERCENTILE, DEFAULT_EXPENSIVE_PERCENTILE),
+            options.get(
+                CONF_VERY_EXPENSIVE_PERCENTILE, DEFAULT_VERY_EXPENSIVE_PERCENTILE
+            ),
+        )
+
+    def ranking(self, energy_type: str) -> SlotRanking:
+        """Return the rank, percentile and level of every timeline slot."""
+        cache = self._derived_cache()
+        if (ranking := cache.get(("ranking", energy_type))) is None:
+            ranking = cache[("ranking", energy_type)] = rank_slots(
+                self.timeline(energy_type), self.level_thresholds
+            )
+        return ranking
+
+    def _build_snapshot(self, energy_type: str, now: float) -> EssentPriceSnapshot:
+        """Resolve the current and next slot for an energy type."""
+        block = self.data[energy_type]
+        timeline = self.timeline(energy_type)
+        ranking = self.ranking(energy_type)
+        cheapest, most_expensive = self._day_extremes(energy_type)
+        idx = timeline.index_at(now)
+        report = self.anomalies.reports.get(energy_type)
+        return EssentPriceSnapshot(
+            energy_type=energy_type,
+            unit=block["unit"],
+            current=timeline.slots[idx] if idx is not None else None,
+            next=timeline.next_after(now),
+            min_price=block.get("min_price"),
+            avg_price=block.get("avg_price"),
+            max_price=block.get("max_price"),
+            cheapest=cheapest,
+            most_expensive=most_expensive,
+            current_rank=ranking.ranks[idx] if idx is not None else None,
+            current_percentile=ranking.percentiles[idx] if idx is not None else None,
+            current_level=ranking.levels[idx] if idx is not None else None,
+            tomorrow=block.get("tomorrow"),
+            rolling=self.rolling.aggregates(energy_type),
+            anomalies=(
+                tuple(anomaly for anomaly in report.anomalies if anomaly.end > now)
+                if report and report.scored
+                else None
+            ),
+        )
+
+    @callback
+    def _async_refresh_snapshots(self) -> None:
+        """Compute the per-tick snapshot of every energy type."""
+        now = dt_util.utcnow().timestamp()
+        self._snapshots = {
+            energy_type: self._build_snapshot(energy_type, now)
+            for energy_type in (self.data or {})
+        }
+        self._snapshots_source = self.data
+
+    def snapshot(self, energy_type: str) -> EssentPriceSnapshot:
+        """Return the snapshot computed at the last listener tick."""
+        if self._snapshots_source is not self.data:
+            self._async_refresh_snapshots()
+        return self._snapshots[energy_type]
+
+    async def async_refresh_on_demand(self) -> tuple[str, bool]:
+        """Fetch now, unless a fetch ran too recently.
+
+        Concurrent callers share a single in-flight fetch. Returns the
+        outcome and whether the caller joined a fetch started by another.
+        """
+        if self._on_demand_refresh is not None:
+            return await asyncio.shield(self._on_demand_refresh), True
+        if (
+            self.last_fetch_attempt is not None
+            and dt_util.utcnow() - self.last_fetch_attempt < REFRESH_MIN_INTERVAL
+        ):
+            return REFRESH_TOO_SOON, False
+        self._on_demand_refresh = self.hass.async_create_task(
+            self._async_refresh_once(), f"{DOMAIN} on-demand refresh"
+        )
+        return await asyncio.shield(self._on_demand_refresh), False
+
+    async def _async_refresh_once(self) -> str:
+        """Run a single refresh and report its outcome."""
+        try:
+            await self.async_refresh()
+        finally:
+            self._on_demand_refresh = None
+        return REFRESH_FETCHED if self.last_update_success else REFRESH_FAILED
+
+    async def async_load_history(self) -> None:
+        """Load the locally retained price history and rolling aggregates."""
+        await self.history.async_load()
+        await self.rolling.async_load()
+
+    async def async_refresh_and_fan_out(self) -> None:
+        """Refresh and update all listeners, even with unchanged data."""
+        self._force_fanout = True
+        try:
+            await self.async_refresh()
+        finally:
+            self._force_fanout = False
+
+    async def async_get_backfill(self) -> EssentBackfill:
+        """Return the backfill, creating it on first use."""
+        if self.backfill is None:
+            backfill = await async_import_module(self.hass, f"{__package__}.backfill")
+            self.backfill = backfill.EssentBackfill(self)
+        return self.backfill
+
+    async def async_resume_backfill(self) -> None:
+        """Resume a backfill interrupted by a restart."""
+        store: Store[dict[str, str]] = Store(
+            self.hass, BACKFILL_STORAGE_VERSION, BACKFILL_STORAGE_KEY
+        )
+        if (stored := await store.async_load()) is None:
+            return
+        backfill = await self.async_get_backfill()
+        backfill.async_start(
+            date.fromisoformat(stored["start"]), date.fromisoformat(stored["end"])
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Refresh the shared snapshot once, then update all listeners.
+
+        The update is skipped for energy types whose listeners already show
+        it, and left to the listener tick of an energy type when that tick
+        is due within the coalesce window.
+        """
+        self._async_catch_up()
+        now = dt_util.utcnow()
+        if self._force_fanout or not self.data:
+            self._async_fan_out(now)
+            return
+        stale = [
+            energy_type
+            for energy_type in self.data
+            if not self._fanout_current(energy_type, now)
+        ]
+        pending = [
+            energy_type
+            for energy_type in stale
+            if energy_type not in self._unsub_ticks
+            or self._next_ticks[energy_type] - now > FANOUT_COALESCE_WINDOW
+        ]
+        if len(pending) < len(self.data):
+            self.coalesced_fanouts += 1
+        if len(pending) == len(self.data):
+            self._async_fan_out(now)
+        elif pending:
+            self._async_fan_out(now, pending)
+
+    @callback
+    def _async_fan_out(
+        self, now: datetime, energy_types: list[str] | None = None
+    ) -> None:
+        """Update the listeners of some or all energy types from a fresh snapshot."""
+        self._async_refresh_snapshots()
+        for energy_type in self.data or {}:
+            if energy_types is None or energy_type in energy_types:
+                self._fanouts[energy_type] = (now, self.data, self.last_update_success)
+        if energy_types is None:
+            super().async_update_listeners()
+            return
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in energy_types:
+                update_callback()
+
+    def _fanout_current(self, energy_type: str, now: datetime) -> bool:
+        """Return whether an energy type's listeners already show ``now``.
+
+        They do when they were updated within the coalesce window, with
+        the same data and outcome, and no boundary of the type lies between.
+        """
+        if (fanout := self._fanouts.get(energy_type)) is None:
+            return False
+        at, data, success = fanout
+        return (
+            data is self.data
+            and success == self.last_update_success
+            and now - at <= FANOUT_COALESCE_WINDOW
+            and self._next_tick(energy_type, at) > now
+        )
+
+    @callback
+    def async_update_energy_type_listeners(self, energy_type: str) -> None:
+        """Refresh one energy type's snapshot and update only its listeners.
+
+        Entities register with their energy type as context; listeners
+        registered without a context are updated on every tick.
+        """
+        self._async_catch_up()
+        now = dt_util.utcnow()
+        if self._snapshots_source is not self.data:
+            self._async_refresh_snapshots()
+        elif self.data is not None and energy_type in self.data:
+            self._snapshots[energy_type] = self._build_snapshot(
+                energy_type, now.timestamp()
+            )
+        if self.data is not None and energy_type in self.data:
+            self._fanouts[energy_type] = (now, self.data, self.last_update_success)
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context == energy_type:
+                update_callback()
+
+    @callback
+    def _async_catch_up(self) -> None:
+        """Process new data and finalize past days, each only once."""
+        if self.data is None:
+            return
+        if self.data is not self._processed_data:
+            self._processed_data = self.data
+            self._async_process_new_data()
+            if self._unsub_ticks:
+                # New slots can move the boundaries the ticks were set for
+                for energy_type in list(self._unsub_ticks):
+                    self._schedule_listener_tick(energy_type)
+        today = dt_util.now().date()
+        if today != self._rollover_day:
+            # Finalize the previous days once per local date
+            self._rollover_day = today
+            self.rolling.async_rollover(self.history, list(self.data), today)
+
+    @callback
+    def _async_history_changed(self, energy_type: str, day: date) -> None:
+        """Rebuild what was derived from finalized days that changed."""
+        self.rolling.async_history_changed(self.history, energy_type, day)
+        if (
+            self.anomalies.async_history_changed(energy_type, day)
+            and self.data is not None
+            and energy_type in self.data
+        ):
+            # Rescore the published prices against the rebuilt baselines
+            self.anomalies.async_score(
+                self.history,
+                energy_type,
+                self.timeline(energy_type).slots,
+                dt_util.now().date(),
+            )
+        # The next snapshot picks up the rebuilt aggregates
+        self._snapshots_source = None
+
+    @callback
+    def _async_process_new_data(self) -> None:
+        """Retain and score the new prices, forecast and notify triggers."""
+        self._async_fire_prices_updated()
+        today = dt_util.now().date()
+        for energy_type, block in self.data.items():
+            timeline = self.timeline(energy_type)
+            self.history.async_record_timeline(energy_type, timeline)
+            self.anomalies.async_score(
+                self.history, energy_type, timeline.slots, today
+            )
+
+            tomorrow = block.get("tariffs_tomorrow")
+            if (
+                energy_type not in FORECAST_ENERGY_TYPES
+                or not tomorrow
+                or not timeline.slots
+            ):
+                continue
+            trigger = tomorrow[0].get("startDateTime")
+            if trigger == self._forecast_triggers.get(energy_type):
+                continue
+            self._forecast_triggers[energy_type] = trigger
+            target = timeline.slots[-1].start_dt.date() + timedelta(days=1)
+            coro = self._async_forecast(energy_type, target)
+            name = f"{DOMAIN} {energy_type} forecast"
+            if self.config_entry is not None:
+                self.config_entry.async_create_background_task(self.hass, coro, name)
+            else:
+                self.hass.async_create_background_task(coro, name)
+        async_dispatcher_send(self.hass, SIGNAL_DATA_PROCESSED, self)
+
+    @callback
+    def _async_fire_prices_updated(self) -> None:
+        """Fire one event describing slots that were added or changed.
+
+        Energy types whose slots are unchanged are skipped on a fingerprint
+        comparison. Slots that merely dropped out at midnight do not count
+        as a change, and nothing is fired for the first data after startup.
+        """
+        changes: dict[str, Any] = {}
+        for energy_type, block in self.data.items():
+            slots = self.timeline(energy_type).slots
+            fingerprint = hash(tuple((slot.start, slot.end, slot.price) for slot in slots))
+            if fingerprint == self._fingerprints.get(energy_type):
+                continue
+            self._fingerprints[energy_type] = fingerprint
+            had_tomorrow = self._had_tomorrow.get(energy_type, False)
+            self._had_tomorrow[energy_type] = block.get("tomorrow") is not None
+            previous = self._published.get(energy_type)
+            self._published[energy_type] = {
+                slot.start: (slot.end, slot.price) for slot in slots
+            }
+            if previous is None:
+                continue
+
+            ranges: list[list[float]] = []
+            for slot in slots:
+                if previous.get(slot.start) == (slot.end, slot.price):
+                    continue
+                if ranges and ranges[-1][1] == slot.start:
+                    ranges[-1][1] = slot.end
+                else:
+                    ranges.append([slot.start, slot.end])
+            if not ranges:
+                continue
+            tomorrow = block.get("tomorrow")
+            changes[energy_type] = {
+                "changed_ranges": [
+                    {
+                        "start": dt_util.as_local(
+                            dt_util.utc_from_timestamp(start)
+                        ).isoformat(),
+                        "end": dt_util.as_local(
+                            dt_util.utc_from_timestamp(end)
+                        ).isoformat(),
+                    }
+                    for start, end in ranges
+                ],
+                "tomorrow_available": tomorrow is not None,
+                "tomorrow_became_available": tomorrow is not None
+                and not had_tomorrow,
+                "min_price": block["min_price"],
+                "avg_price": block["avg_price"],
+                "max_price": block["max_price"],
+                "tomorrow": (
+                    {
+                        "min_price": tomorrow["min_price"],
+                        "avg_price": tomorrow["avg_price"],
+                        "max_price": tomorrow["max_price"],
+                    }
+                    if tomorrow
+                    else None
+                ),
+            }
+        if changes:
+            self.hass.bus.async_fire(
+                EVENT_PRICES_UPDATED, {"energy_types": list(changes), **changes}
+            )
+
+    async def _async_forecast(self, energy_type: str, target: date) -> None:
+        """Train the forecast model in the executor and keep its result."""
+        days = self.history.days(energy_type, end=target - timedelta(days=1))
+        days = [(day, slots) for day, slots in days[-FORECAST_HISTORY_DAYS:] if slots]
+        if len(days) < FORECAST_MIN_HISTORY_DAYS:
+            _LOGGER.debug("Not enough %s history to forecast %s", energy_type, target)
+            return
+        # The model needs numpy, which is only loaded for the first forecast
+        forecast = await async_import_module(self.hass, f"{__package__}.forecast")
+        result = await self.hass.async_add_executor_job(
+            forecast.train_and_forecast,
+            energy_type,
+            days,
+            target,
+            dt_util.get_default_time_zone(),
+        )
+        if result is None:
+            _LOGGER.debug("Not enough %s history to forecast %s", energy_type, target)
+            return
+        self.forecasts[energy_type] = result
+        _LOGGER.debug(
+            "Forecast %s prices for %s from %d days (train %.1f ms, inference %.1f ms)",
+            energy_type,
+            target,
+            result.days_used,
+            result.train_seconds * 1000,
+            result.inference_seconds * 1000,
+        )
 
     def start_schedules(self) -> None:
         """Start both API fetch and listener tick schedules.
@@ -101,26 +743,29 @@ class EssentDataUpdateCoordinator(DataUpdateCoordinator[EssentData]):
             _LOGGER.debug("Polling disabled by config entry, not starting schedules")
             return
 
-        if self._unsub_data or self._unsub_listener:
+        if self._unsub_data or self._unsub_ticks:
             return
 
         _LOGGER.info(
             "Starting schedules: API fetch every hour at minute %d, "
-            "listener updates on the hour",
+            "listener updates at each energy type's slot boundaries",
             self._api_fetch_minute_offset,
         )
         self._schedule_data_refresh()
-        self._schedule_listener_tick()
+        for energy_type in ENERGY_TYPES:
+            self._schedule_listener_tick(energy_type)
 
     async def async_shutdown(self) -> None:
         """Cancel any scheduled call, and ignore new runs."""
         await super().async_shutdown()
+        async_dispatcher_send(self.hass, SIGNAL_DATA_PROCESSED, None)
         if self._unsub_data:
             self._unsub_data()
             self._unsub_data = None
-        if self._unsub_listener:
-            self._unsub_listener()
-            self._unsub_listener = None
+        for unsub in self._unsub_ticks.values():
+            unsub()
+        self._unsub_ticks.clear()
+        self._next_ticks.clear()
 
     def _schedule_data_refresh(self) -> None:
         """Schedule next data fetch at a random minute offset within the hour."""
@@ -151,158 +796,91 @@ class EssentDataUpdateCoordinator(DataUpdateCoordinator[EssentData]):
 
         self._unsub_data = async_track_point_in_utc_time(self.hass, _handle, candidate)
 
-    def _schedule_listener_tick(self) -> None:
-        """Schedule listener updates on the hour to advance cached tariffs."""
-        if self._unsub_listener:
-            self._unsub_listener()
+    def _next_tick(self, energy_type: str, now: datetime) -> datetime:
+        """Return the next slot boundary of an energy type or local midnight.
 
-        now = dt_util.utcnow()
-        next_hour = now + UPDATE_INTERVAL
-        next_run = datetime(
-            next_hour.year,
-            next_hour.month,
-            next_hour.day,
-            next_hour.hour,
-            tzinfo=dt_util.UTC,
+        Midnight is included because the rolling aggregates change then.
+        Without a known boundary ahead, the next hour is used.
+        """
+        midnight = dt_util.start_of_local_day(
+            dt_util.as_local(now).date() + timedelta(days=1)
         )
+        boundaries = self.slot_boundaries(energy_type) if self.data else []
+        if (idx := bisect_right(boundaries, now.timestamp())) < len(boundaries):
+            boundary = dt_util.utc_from_timestamp(boundaries[idx])
+        else:
+            boundary = now.replace(minute=0, second=0, microsecond=0) + UPDATE_INTERVAL
+        return min(boundary, dt_util.as_utc(midnight))
+
+    def _schedule_listener_tick(self, energy_type: str) -> None:
+        """Schedule a listener update at the next boundary of an energy type."""
+        if unsub := self._unsub_ticks.pop(energy_type, None):
+            unsub()
 
-        _LOGGER.debug("Scheduling next listener tick for %s", next_run)
+        next_run = self._next_tick(energy_type, dt_util.utcnow())
+        _LOGGER.debug("Scheduling next %s listener tick for %s", energy_type, next_run)
 
         @callback
         def _handle(_: datetime) -> None:
             """Handle the scheduled listener tick to update sensors."""
-            self._unsub_listener = None
-            _LOGGER.debug("Listener tick fired, updating sensors with cached data")
-            self.async_update_listeners()
-            self._schedule_listener_tick()
-
-        self._unsub_listener = async_track_point_in_utc_time(
-            self.hass,
-            _handle,
-            next_run,
+            self._unsub_ticks.pop(energy_type, None)
+            self.tick_counts[energy_type] += 1
+            if self._fanout_current(energy_type, dt_util.utcnow()):
+                # An update at the same boundary already reached these
+                # listeners
+                self.coalesced_fanouts += 1
+            else:
+                _LOGGER.debug(
+                    "%s listener tick fired, updating sensors with cached data",
+                    energy_type.capitalize(),
+                )
+                self.async_update_energy_type_listeners(energy_type)
+            if energy_type not in self._unsub_ticks:
+                self._schedule_listener_tick(energy_type)
+
+        self._next_ticks[energy_type] = next_run
+        self._unsub_ticks[energy_type] = async_track_point_in_utc_time(
+            self.hass, _handle, next_run
         )
 
-    def _normalize_energy_block(
+    def _record_response(
         self,
-        data: dict[str, Any],
-        energy_type: str,
-        tomorrow: dict[str, Any] | None,
-    ) -> EssentEnergyData:
-        """Normalize the energy block into the coordinator format."""
-        tariffs_today = sorted(
-            data.get("tariffs", []),
-            key=_tariff_sort_key,
-        )
-        if not tariffs_today:
-            _LOGGER.debug("No tariffs found for %s in payload: %s", energy_type, data)
-            raise UpdateFailed(f"No tariffs found for {energy_type}")
-
-        tariffs_tomorrow: list[dict[str, Any]] = []
-        if tomorrow:
-            tariffs_tomorrow = sorted(
-                tomorrow.get("tariffs", []),
-                key=_tariff_sort_key,
-            )
-        unit = (data.get("unitOfMeasurement") or data.get("unit") or "").strip()
-
-        amounts = [
-            float(total)
-            for tariff in tariffs_today
-            if (total := tariff.get("totalAmount")) is not None
-        ]
-        if not amounts:
-            _LOGGER.debug(
-                "No usable totalAmount values for %s in tariffs: %s",
-                energy_type,
-                tariffs_today,
+        fetched_at: datetime,
+        latency: float,
+        status: int,
+        headers: dict[str, str],
+        raw_body: str,
+    ) -> None:
+        """Keep a compressed copy of a response within the memory budget."""
+        encoded = raw_body.encode()
+        self._responses.append(
+            RecordedResponse(
+                fetched_at=fetched_at,
+                latency=latency,
+                status=status,
+                headers=headers,
+                body=zlib.compress(encoded),
+                body_size=len(encoded),
             )
-            raise UpdateFailed(f"No usable tariff values for {energy_type}")
-
-        if not unit:
-            _LOGGER.debug("No unit provided for %s in payload: %s", energy_type, data)
-            raise UpdateFailed(f"No unit provided for {energy_type}")
-
-        return {
-            "tariffs": tariffs_today,
-            "tariffs_tomorrow": tariffs_tomorrow,
-            "unit": _normalize_unit(unit),
-            "min_price": min(amounts),
-            "avg_price": sum(amounts) / len(amounts),
-            "max_price": max(amounts),
-        }
+        )
+        while (
+            len(self._responses) > 1
+            and sum(len(recorded.body) for recorded in self._responses)
+            > RESPONSE_LOG_MAX_BYTES
+        ):
+            self._responses.popleft()
 
     async def _async_update_data(self) -> EssentData:
-        """Fetch data from API."""
-        session = async_get_clientsession(self.hass)
-        try:
-            response = await session.get(
-                API_ENDPOINT,
-                timeout=CLIENT_TIMEOUT,
-                headers={"Accept": "application/json"},
-            )
-        except ClientError as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
-
-        raw_body = await response.text()
-        if response.status != HTTPStatus.OK:
-            _LOGGER.debug(
-                "Essent API %s returned %s with body: %s",
-                API_ENDPOINT,
-                response.status,
-                raw_body,
-            )
-            raise UpdateFailed(f"Error fetching data: {response.status}")
-
-        try:
-            data = await response.json()
-        except ValueError as err:
-            _LOGGER.debug("Failed to decode JSON body: %s", raw_body)
-            raise UpdateFailed(f"Invalid JSON received: {err}") from err
-
-        prices = data.get("prices") or []
-        if not prices:
-            _LOGGER.debug("No price data available in response: %s", data)
-            raise UpdateFailed("No price data available")
-
-        current_date = dt_util.now().date().isoformat()
-        today: dict[str, Any] | None = None
-        tomorrow: dict[str, Any] | None = None
-
-        for idx, price in enumerate(prices):
-            if price.get("date") == current_date:
-                today = price
-                if idx + 1 < len(prices):
-                    tomorrow = prices[idx + 1]
-                break
-
-        if today is None:
-            today = prices[0]
-            tomorrow = prices[1] if len(prices) > 1 else None
-            _LOGGER.debug(
-                "No price entry found for %s, falling back to first date %s",
-                current_date,
-                today.get("date"),
-            )
-
-        if not isinstance(today, dict):
-            raise UpdateFailed("Invalid data structure for current prices")
-
-        electricity_block = today.get("electricity")
-        gas_block = today.get("gas")
-
-        if not isinstance(electricity_block, dict) or not isinstance(gas_block, dict):
-            _LOGGER.debug("Missing electricity or gas block in payload: %s", today)
-            raise UpdateFailed("Response missing electricity or gas data")
-
-        return {
-            "electricity": self._normalize_energy_block(
-                electricity_block,
-                "electricity",
-                tomorrow.get("electricity") if isinstance(tomorrow, dict) else None,
-            ),
-            "gas": self._normalize_energy_block(
-                gas_block,
-                "gas",
-                tomorrow.get("gas") if isinstance(tomorrow, dict) else None,
-            ),
-        }
+        """Fetch data from the source and run it through the pipeline."""
+        self.last_fetch_attempt = dt_util.utcnow()
+        response = await self.pipeline.async_fetch()
+        self._record_response(
+            response.fetched_at,
+            response.latency,
+            response.status,
+            response.headers,
+            response.body,
+        )
+        result = self.pipeline.process(response, dt_util.now().date().isoformat())
+        self.data_fetched_at = response.fetched_at
+        return result
@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
 from homeassistant.core import HomeAssistant
 
 from .coordinator import EssentConfigEntry, EssentDataUpdateCoordinator
 
+TO_REDACT = {"cookie", "set-cookie"}
+
 
 async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: EssentConfigEntry
@@ -20,4 +24,32 @@ async def async_get_config_entry_diagnostics(
         "api_fetch_minute_offset": coordinator.api_fetch_minute_offset,
         "api_refresh_scheduled": coordinator.api_refresh_scheduled,
         "listener_tick_scheduled": coordinator.listener_tick_scheduled,
+        "listener_ticks": coordinator.listener_ticks,
+        "coalesced_fanouts": coordinator.coalesced_fanouts,
+        "timeline_reports": {
+            energy_type: coordinator.timeline(energy_type).report.as_dict()
+            for energy_type in (coordinator.data or {})
+        },
+        "pipeline": coordinator.pipeline.as_dict(),
+        "price_history": coordinator.history.as_dict(),
+        "rolling_stats": coordinator.rolling.as_dict(),
+        "anomalies": coordinator.anomalies.as_dict(),
+        "backfill": (
+            coordinator.backfill.progress.as_dict()
+            if coordinator.backfill and coordinator.backfill.progress
+            else None
+        ),
+        "forecasts": {
+            energy_type: {
+                "date": result.target_date.isoformat(),
+                "days_used": result.days_used,
+                "train_time_ms": result.train_seconds * 1000,
+                "inference_time_ms": result.inference_seconds * 1000,
+            }
+            for energy_type, result in coordinator.forecasts.items()
+        },
+        "recent_responses": [
+            async_redact_data(response.as_dict(), TO_REDACT)
+            for response in coordinator.recent_responses
+        ],
     }
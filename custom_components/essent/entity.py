@@ -18,7 +18,8 @@ class EssentEntity(CoordinatorEntity[EssentDataUpdateCoordinator]):
         energy_type: str,
     ) -> None:
         """Initialize the entity."""
-        super().__init__(coordinator)
+        # Listener ticks are scheduled per energy type
+        super().__init__(coordinator, context=energy_type)
         self.energy_type = energy_type
         entry_identifier = (
             coordinator.config_entry.entry_id
@@ -0,0 +1,134 @@
+"""Price forecasting beyond the published Essent horizon.
+
+The model is a per-hour seasonal profile on top of a recent price level
+fitted with a linear regression. It is trained on locally retained history
+and runs in the executor, so nothing in this module may touch ``hass``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, tzinfo
+import time
+
+import numpy as np
+
+from homeassistant.util import dt as dt_util
+
+from .const import FORECAST_MIN_HISTORY_DAYS
+from .history import HistorySlot
+
+LEVEL_DAYS = 14
+HOURS = 24
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastResult:
+    """Estimated slots for a single day and how long producing them took."""
+
+    energy_type: str
+    target_date: date
+    slots: list[HistorySlot]
+    days_used: int
+    train_seconds: float
+    inference_seconds: float
+    generated_at: datetime
+
+
+def _hourly_matrix(
+    days: list[tuple[date, list[HistorySlot]]], time_zone: tzinfo
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return time-weighted prices per local hour, weekend flags and day offsets.
+
+    Hours without data are NaN. Day offsets count days relative to the last
+    day so the regression has a stable origin.
+    """
+    rows, cols, prices, weights = [], [], [], []
+    for row, (_, slots) in enumerate(days):
+        for start, end, price in slots:
+            rows.append(row)
+            cols.append(datetime.fromtimestamp(start, time_zone).hour)
+            prices.append(price * (end - start))
+            weights.append(end - start)
+
+    sums = np.zeros((len(days), HOURS))
+    totals = np.zeros((len(days), HOURS))
+    np.add.at(sums, (rows, cols), prices)
+    np.add.at(totals, (rows, cols), weights)
+    matrix = np.divide(sums, totals, out=np.full_like(sums, np.nan), where=totals > 0)
+
+    weekend = np.array([day.weekday() >= 5 for day, _ in days], dtype=bool)
+    last = days[-1][0]
+    offsets = np.array([(day - last).days for day, _ in days], dtype=float)
+    return matrix, weekend, offsets
+
+
+def _nanmean(values: np.ndarray, axis: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the mean ignoring NaN (0 where empty) and the sample counts."""
+    present = ~np.isnan(values)
+    counts = present.sum(axis=axis)
+    sums = np.where(present, values, 0.0).sum(axis=axis)
+    return np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0), counts
+
+
+def train_and_forecast(
+    energy_type: str,
+    days: list[tuple[date, list[HistorySlot]]],
+    target: date,
+    time_zone: tzinfo,
+) -> ForecastResult | None:
+    """Train on retained days and estimate hourly prices for ``target``.
+
+    Returns None when there is not enough history to fit the model.
+    """
+    started = time.perf_counter()
+    days = [(day, slots) for day, slots in days if slots]
+    if len(days) < FORECAST_MIN_HISTORY_DAYS:
+        return None
+
+    matrix, weekend, offsets = _hourly_matrix(days, time_zone)
+    day_means, _ = _nanmean(matrix, axis=1)
+    shape = matrix - day_means[:, None]
+    profile, _ = _nanmean(shape, axis=0)
+    target_weekend = target.weekday() >= 5
+    same_kind = weekend == target_weekend
+    if same_kind.any():
+        kind_profile, counts = _nanmean(shape[same_kind], axis=0)
+        profile = np.where(counts > 0, kind_profile, profile)
+
+    recent_means = day_means[-LEVEL_DAYS:]
+    recent_offsets = offsets[-LEVEL_DAYS:]
+    target_offset = float((target - days[-1][0]).days)
+    if len(recent_means) >= 2:
+        slope, intercept = np.polyfit(recent_offsets, recent_means, 1)
+        level = float(np.clip(
+            intercept + slope * target_offset,
+            recent_means.min(),
+            recent_means.max(),
+        ))
+    else:
+        level = float(recent_means[-1])
+    trained = time.perf_counter()
+
+    slots: list[HistorySlot] = []
+    current = datetime(target.year, target.month, target.day, tzinfo=time_zone)
+    stop = datetime.combine(target + timedelta(days=1), datetime.min.time(), time_zone)
+    current, stop = current.astimezone(dt_util.UTC), stop.astimezone(dt_util.UTC)
+    while current < stop:
+        hour = current.astimezone(time_zone).hour
+        slot_end = current + timedelta(hours=1)
+        slots.append(
+            (current.timestamp(), slot_end.timestamp(), level + float(profile[hour]))
+        )
+        current = slot_end
+    finished = time.perf_counter()
+
+    return ForecastResult(
+        energy_type=energy_type,
+        target_date=target,
+        slots=slots,
+        days_used=len(days),
+        train_seconds=trained - started,
+        inference_seconds=finished - trained,
+        generated_at=dt_util.utcnow(),
+    )
@@ -0,0 +1,122 @@
+"""Locally retained Essent price history."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import date, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, HISTORY_RETENTION_DAYS
+from .timeline import PriceTimeline
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.price_history"
+SAVE_DELAY = 60
+
+type HistorySlot = tuple[float, float, float]
+# Called with the energy type and the earliest day whose slots changed
+type HistoryListener = Callable[[str, date], None]
+
+
+class EssentPriceHistory:
+    """Per-day slot prices for each energy type, persisted in a Store.
+
+    Days are keyed by their local ISO date and hold ``(start, end, price)``
+    tuples with UTC epoch bounds.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the history."""
+        self._store: Store[dict[str, dict[str, list[list[float]]]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY
+        )
+        self._days: dict[str, dict[str, list[HistorySlot]]] = {}
+        self._listeners: list[HistoryListener] = []
+
+    async def async_load(self) -> None:
+        """Load the retained history from storage."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        self._days = {
+            energy_type: {
+                day: [(slot[0], slot[1], slot[2]) for slot in slots]
+                for day, slots in days.items()
+            }
+            for energy_type, days in stored.items()
+        }
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, list[list[float]]]]:
+        """Return the history in its storage format."""
+        return {
+            energy_type: {day: [list(slot) for slot in slots] for day, slots in days.items()}
+            for energy_type, days in self._days.items()
+        }
+
+    @callback
+    def async_add_listener(self, listener: HistoryListener) -> Callable[[], None]:
+        """Listen for recorded days and return a function that stops it."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    @callback
+    def async_record_timeline(self, energy_type: str, timeline: PriceTimeline) -> None:
+        """Store every priced slot of a timeline under its local start date."""
+        grouped: dict[str, list[HistorySlot]] = {}
+        for slot in timeline.slots:
+            if slot.price is None:
+                continue
+            day = slot.start_dt.date().isoformat()
+            grouped.setdefault(day, []).append((slot.start, slot.end, slot.price))
+        self.async_record_days(energy_type, grouped)
+
+    @callback
+    def async_record_days(
+        self, energy_type: str, days: dict[str, list[HistorySlot]]
+    ) -> None:
+        """Store slots for whole days, replacing what was kept for them."""
+        if not days:
+            return
+        retained = self._days.setdefault(energy_type, {})
+        changed: list[str] = []
+        for day, slots in days.items():
+            if retained.get(day) != slots:
+                retained[day] = slots
+                changed.append(day)
+        if not changed:
+            return
+        cutoff = (dt_util.now().date() - timedelta(days=HISTORY_RETENTION_DAYS)).isoformat()
+        for day in [day for day in retained if day < cutoff]:
+            del retained[day]
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        earliest = date.fromisoformat(min(changed))
+        for listener in list(self._listeners):
+            listener(energy_type, earliest)
+
+    @callback
+    def days(
+        self, energy_type: str, start: date | None = None, end: date | None = None
+    ) -> list[tuple[date, list[HistorySlot]]]:
+        """Return retained days in ``[start, end]``, oldest first."""
+        first = start.isoformat() if start else ""
+        last = end.isoformat() if end else "9999-12-31"
+        return [
+            (date.fromisoformat(day), slots)
+            for day, slots in sorted(self._days.get(energy_type, {}).items())
+            if first <= day <= last
+        ]
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary for diagnostics."""
+        return {
+            energy_type: {
+                "days": len(days),
+                "first": min(days, default=None),
+                "last": max(days, default=None),
+            }
+            for energy_type, days in self._days.items()
+        }
@@ -0,0 +1,445 @@
+"""Price pipeline turning a source response into coordinator data.
+
+A fetch runs through a fixed sequence of stages: a source adapter returns
+the raw response, which is decoded, validated (selecting today's and
+tomorrow's documents), normalized and finally extended with derived
+aggregates. Every stage is timed, and a stage whose input fingerprint is
+unchanged since its last run returns its previous output instead of running
+again, so an unchanged publication costs a single hash of the body.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from datetime import datetime
+import hashlib
+from http import HTTPStatus
+import json
+import logging
+from pathlib import Path
+import time
+from typing import Any, Protocol, TypedDict
+
+from aiohttp import ClientError, ClientTimeout
+
+from homeassistant.const import UnitOfEnergy, UnitOfVolume
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .const import API_ENDPOINT, ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS
+from .schema import SchemaError, validate_price_document
+from .timeline import build_timeline
+
+_LOGGER = logging.getLogger(__name__)
+CLIENT_TIMEOUT = ClientTimeout(total=10)
+
+ENERGY_TYPES = (ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS)
+STAGE_FETCH = "fetch"
+STAGE_DECODE = "decode"
+STAGE_VALIDATE = "validate"
+STAGE_NORMALIZE = "normalize"
+STAGE_DERIVE = "derive"
+STAGES = (STAGE_FETCH, STAGE_DECODE, STAGE_VALIDATE, STAGE_NORMALIZE, STAGE_DERIVE)
+# Schema errors quoted in the UpdateFailed message
+MAX_REPORTED_ERRORS = 3
+
+
+class EssentDayAggregates(TypedDict):
+    """Aggregates of a single published day."""
+
+    min_price: float
+    avg_price: float
+    max_price: float
+    cheapest_start: str
+    cheapest_end: str
+    most_expensive_start: str
+    most_expensive_end: str
+
+
+class EssentNormalizedBlock(TypedDict):
+    """Sorted tariffs and unit of a single energy type."""
+
+    tariffs: list[dict[str, Any]]
+    tariffs_tomorrow: list[dict[str, Any]]
+    unit: str
+
+
+class EssentEnergyData(EssentNormalizedBlock):
+    """Data for a single Essent energy type."""
+
+    min_price: float
+    avg_price: float
+    max_price: float
+    tomorrow: EssentDayAggregates | None
+
+
+type EssentData = dict[str, EssentEnergyData]
+type SelectedDays = tuple[dict[str, Any], dict[str, Any] | None]
+
+
+class InvalidPriceData(UpdateFailed):
+    """The price document does not match the schema."""
+
+    def __init__(self, errors: list[SchemaError]) -> None:
+        """Initialize with the schema errors found."""
+        self.errors = errors
+        message = "; ".join(str(error) for error in errors[:MAX_REPORTED_ERRORS])
+        if len(errors) > MAX_REPORTED_ERRORS:
+            message += f" (and {len(errors) - MAX_REPORTED_ERRORS} more)"
+        super().__init__(f"Invalid price data: {message}")
+
+
+@dataclass(frozen=True, slots=True)
+class SourceResponse:
+    """A raw response returned by a price source."""
+
+    fetched_at: datetime
+    latency: float
+    status: int
+    headers: dict[str, str]
+    body: str
+
+
+class PriceSource(Protocol):
+    """A place the published price document can be read from."""
+
+    name: str
+
+    async def async_fetch(self) -> SourceResponse:
+        """Return the current price document, raising UpdateFailed on errors."""
+
+
+class EssentApiSource:
+    """Read the price document from the Essent dynamic prices endpoint."""
+
+    name = "essent_api"
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the source."""
+        self.hass = hass
+
+    async def async_fetch(self) -> SourceResponse:
+        """Fetch the document from the API."""
+        session = async_get_clientsession(self.hass)
+        fetched_at = dt_util.utcnow()
+        started = time.monotonic()
+        try:
+            response = await session.get(
+                API_ENDPOINT,
+                timeout=CLIENT_TIMEOUT,
+                headers={"Accept": "application/json"},
+            )
+            body = await response.text()
+        except ClientError as err:
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+        return SourceResponse(
+            fetched_at=fetched_at,
+            latency=time.monotonic() - started,
+            status=response.status,
+            headers={key.lower(): value for key, value in response.headers.items()},
+            body=body,
+        )
+
+
+class RecordedFileSource:
+    """Read a recorded API response body from a file.
+
+    Used to run the pipeline offline, in tests and benchmarks. The file is
+    read again on every fetch, so it can be replaced between runs.
+    """
+
+    name = "recorded_file"
+
+    def __init__(self, hass: HomeAssistant, path: str | Path) -> None:
+        """Initialize the source."""
+        self.hass = hass
+        self.path = Path(path)
+
+    async def async_fetch(self) -> SourceResponse:
+        """Read the recorded body."""
+        fetched_at = dt_util.utcnow()
+        started = time.monotonic()
+        try:
+            body = await self.hass.async_add_executor_job(
+                self.path.read_text, "utf-8"
+            )
+        except OSError as err:
+            raise UpdateFailed(f"Error reading {self.path}: {err}") from err
+        return SourceResponse(
+            fetched_at=fetched_at,
+            latency=time.monotonic() - started,
+            status=HTTPStatus.OK,
+            headers={"content-type": "application/json"},
+            body=body,
+        )
+
+
+def decode_response(response: SourceResponse) -> dict[str, Any]:
+    """Decode the JSON body of a successful response."""
+    if response.status != HTTPStatus.OK:
+        _LOGGER.debug(
+            "Essent API %s returned %s with a %d character body",
+            API_ENDPOINT,
+            response.status,
+            len(response.body),
+        )
+        raise UpdateFailed(f"Error fetching data: {response.status}")
+    try:
+        document = json.loads(response.body)
+    except ValueError as err:
+        raise UpdateFailed(f"Invalid JSON received: {err}") from err
+    return document
+
+
+def select_days(document: Any, current_date: str) -> SelectedDays:
+    """Validate the document and return the days of today and tomorrow."""
+    if (errors := validate_price_document(document)) is not None:
+        raise InvalidPriceData(errors)
+    prices: list[dict[str, Any]] = document["prices"]
+
+    today: dict[str, Any] | None = None
+    tomorrow: dict[str, Any] | None = None
+    for idx, price in enumerate(prices):
+        if price.get("date") == current_date:
+            today = price
+            if idx + 1 < len(prices):
+                tomorrow = prices[idx + 1]
+            break
+
+    if today is None:
+        today = prices[0]
+        tomorrow = prices[1] if len(prices) > 1 else None
+        _LOGGER.debug(
+            "No price entry found for %s, falling back to first date %s",
+            current_date,
+            today.get("date"),
+        )
+
+    if missing := [
+        energy_type for energy_type in ENERGY_TYPES if today.get(energy_type) is None
+    ]:
+        raise UpdateFailed(
+            f"Response missing electricity or gas data for {today['date']}: "
+            + ", ".join(missing)
+        )
+    return today, tomorrow
+
+
+def _tariff_sort_key(tariff: dict[str, Any]) -> str:
+    """Sort key for tariffs based on start time."""
+    return tariff.get("startDateTime", "")
+
+
+def _normalize_unit(unit: str) -> str:
+    """Normalize unit strings to HA's canonical constants."""
+    unit_normalized = unit.replace("³", "3").lower()
+    if unit_normalized == "kwh":
+        return UnitOfEnergy.KILO_WATT_HOUR
+    if unit_normalized in {"m3", "m^3"}:
+        return UnitOfVolume.CUBIC_METERS
+    return unit
+
+
+def normalize_energy_block(
+    data: dict[str, Any],
+    energy_type: str,
+    tomorrow: dict[str, Any] | None,
+) -> EssentNormalizedBlock:
+    """Sort the tariffs of an energy block and normalize its unit."""
+    tariffs_today = sorted(
+        data.get("tariffs", []),
+        key=_tariff_sort_key,
+    )
+    if not tariffs_today:
+        raise UpdateFailed(f"No tariffs found for {energy_type}")
+
+    tariffs_tomorrow: list[dict[str, Any]] = []
+    if tomorrow:
+        tariffs_tomorrow = sorted(
+            tomorrow.get("tariffs", []),
+            key=_tariff_sort_key,
+        )
+    unit = (data.get("unitOfMeasurement") or data.get("unit") or "").strip()
+
+    if all(tariff.get("totalAmount") is None for tariff in tariffs_today):
+        raise UpdateFailed(f"No usable tariff values for {energy_type}")
+
+    if not unit:
+        raise UpdateFailed(f"No unit provided for {energy_type}")
+
+    return {
+        "tariffs": tariffs_today,
+        "tariffs_tomorrow": tariffs_tomorrow,
+        "unit": _normalize_unit(unit),
+    }
+
+
+def normalize_days(selected: SelectedDays) -> dict[str, EssentNormalizedBlock]:
+    """Normalize the energy blocks of the selected days."""
+    today, tomorrow = selected
+    return {
+        energy_type: normalize_energy_block(
+            today[energy_type],
+            energy_type,
+            tomorrow.get(energy_type) if tomorrow else None,
+        )
+        for energy_type in ENERGY_TYPES
+    }
+
+
+def _day_aggregates(tariffs: list[dict[str, Any]]) -> EssentDayAggregates | None:
+    """Return the price aggregates of a day, or None when nothing is priced."""
+    slots = [slot for slot in build_timeline(tariffs).slots if slot.price is not None]
+    if not slots:
+        return None
+    prices = [slot.price for slot in slots]
+    cheapest = min(slots, key=lambda slot: slot.price)
+    most_expensive = max(slots, key=lambda slot: slot.price)
+    return {
+        "min_price": cheapest.price,
+        "avg_price": sum(prices) / len(prices),
+        "max_price": most_expensive.price,
+        "cheapest_start": cheapest.start_dt.isoformat(),
+        "cheapest_end": cheapest.end_dt.isoformat(),
+        "most_expensive_start": most_expensive.start_dt.isoformat(),
+        "most_expensive_end": most_expensive.end_dt.isoformat(),
+    }
+
+
+def derive_energy_data(block: EssentNormalizedBlock) -> EssentEnergyData:
+    """Add the price aggregates of today and tomorrow to a normalized block."""
+    amounts = [
+        float(total)
+        for tariff in block["tariffs"]
+        if (total := tariff.get("totalAmount")) is not None
+    ]
+    return {
+        **block,
+        "min_price": min(amounts),
+        "avg_price": sum(amounts) / len(amounts),
+        "max_price": max(amounts),
+        # Computed once per fetch so tomorrow's entities never recompute
+        "tomorrow": _day_aggregates(block["tariffs_tomorrow"]),
+    }
+
+
+def derive_data(normalized: dict[str, EssentNormalizedBlock]) -> EssentData:
+    """Derive the coordinator data from the normalized blocks."""
+    return {
+        energy_type: derive_energy_data(block)
+        for energy_type, block in normalized.items()
+    }
+
+
+def build_energy_data(
+    data: dict[str, Any],
+    energy_type: str,
+    tomorrow: dict[str, Any] | None,
+) -> EssentEnergyData:
+    """Normalize a single energy block and derive its aggregates."""
+    return derive_energy_data(normalize_energy_block(data, energy_type, tomorrow))
+
+
+@dataclass(slots=True)
+class StageStats:
+    """Timing of a pipeline stage."""
+
+    runs: int = 0
+    skipped: int = 0
+    failures: int = 0
+    last_seconds: float = 0.0
+    total_seconds: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record a run of the stage."""
+        self.runs += 1
+        self.last_seconds = seconds
+        self.total_seconds += seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation for diagnostics."""
+        return {
+            "runs": self.runs,
+            "skipped": self.skipped,
+            "failures": self.failures,
+            "last_ms": round(self.last_seconds * 1000, 3),
+            "total_ms": round(self.total_seconds * 1000, 3),
+        }
+
+
+class PricePipeline:
+    """Run a source response through the stages, skipping unchanged input."""
+
+    def __init__(self, source: PriceSource) -> None:
+        """Initialize the pipeline."""
+        self.source = source
+        self.stats = {stage: StageStats() for stage in STAGES}
+        # Schema errors seen so far, per error code
+        self.validation_errors: Counter[str] = Counter()
+        self._outputs: dict[str, tuple[Hashable, Any]] = {}
+
+    async def async_fetch(self) -> SourceResponse:
+        """Fetch a response from the source."""
+        stats = self.stats[STAGE_FETCH]
+        try:
+            response = await self.source.async_fetch()
+        except UpdateFailed:
+            stats.failures += 1
+            raise
+        stats.record(response.latency)
+        return response
+
+    def process(self, response: SourceResponse, current_date: str) -> EssentData:
+        """Turn a response into coordinator data.
+
+        Returns the very same data object as the previous call when neither
+        the body nor the date changed, so caches keyed on it stay valid.
+        """
+        body_key = (
+            response.status,
+            hashlib.blake2b(response.body.encode(), digest_size=16).digest(),
+        )
+        document = self._run(STAGE_DECODE, body_key, decode_response, response)
+        day_key = (*body_key, current_date)
+        selected = self._run(
+            STAGE_VALIDATE, day_key, select_days, document, current_date
+        )
+        normalized = self._run(STAGE_NORMALIZE, day_key, normalize_days, selected)
+        return self._run(STAGE_DERIVE, day_key, derive_data, normalized)
+
+    def _run(
+        self, stage: str, key: Hashable, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        """Run a stage, or return its previous output for the same input."""
+        stats = self.stats[stage]
+        if (previous := self._outputs.get(stage)) is not None and previous[0] == key:
+            stats.skipped += 1
+            return previous[1]
+        started = time.perf_counter()
+        try:
+            output = func(*args)
+        except InvalidPriceData as err:
+            stats.failures += 1
+            self.validation_errors.update(error.code for error in err.errors)
+            self._outputs.pop(stage, None)
+            raise
+        except UpdateFailed:
+            stats.failures += 1
+            self._outputs.pop(stage, None)
+            raise
+        finally:
+            stats.record(time.perf_counter() - started)
+        self._outputs[stage] = (key, output)
+        return output
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation for diagnostics."""
+        return {
+            "source": self.source.name,
+            "stages": {stage: stats.as_dict() for stage, stats in self.stats.items()},
+            "validation_errors": dict(self.validation_errors),
+        }
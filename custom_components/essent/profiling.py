@@ -0,0 +1,120 @@
+"""Profile a complete fetch and listener fan-out of the Essent integration.
+
+The profiler runs in the event loop thread for the duration of one refresh,
+so the stats file also holds whatever else the loop ran meanwhile. The
+response only lists the functions and allocations of this package.
+"""
+
+from __future__ import annotations
+
+import cProfile
+from dataclasses import dataclass
+from pathlib import Path
+import pstats
+import time
+import tracemalloc
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .coordinator import EssentDataUpdateCoordinator
+
+PACKAGE_DIR = str(Path(__file__).parent)
+
+
+class ProfilerBusy(Exception):
+    """Another profiler is active in the event loop thread."""
+
+
+@dataclass(frozen=True, slots=True)
+class ProfileResult:
+    """Where the stats were written and the top entries of this package."""
+
+    stats_file: str
+    duration: float
+    functions: list[dict[str, Any]]
+    allocations: list[dict[str, Any]] | None
+
+
+def _top_functions(profiler: cProfile.Profile, top: int) -> list[dict[str, Any]]:
+    """Return the functions of this package with the most cumulative time."""
+    stats = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+    entries = sorted(
+        (item for item in stats.items() if item[0][0].startswith(PACKAGE_DIR)),
+        key=lambda item: item[1][3],
+        reverse=True,
+    )[:top]
+    return [
+        {
+            "module": Path(filename).name,
+            "line": line,
+            "function": function,
+            "calls": calls,
+            "total_time_ms": round(total * 1000, 3),
+            "cumulative_time_ms": round(cumulative * 1000, 3),
+        }
+        for (filename, line, function), (_, calls, total, cumulative, _) in entries
+    ]
+
+
+def _top_allocations(snapshot: tracemalloc.Snapshot, top: int) -> list[dict[str, Any]]:
+    """Return the lines of this package holding the most allocated memory."""
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(True, f"{PACKAGE_DIR}/*")])
+    return [
+        {
+            "module": Path(stat.traceback[0].filename).name,
+            "line": stat.traceback[0].lineno,
+            "size_kib": round(stat.size / 1024, 3),
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+
+
+def _write_stats(
+    profiler: cProfile.Profile,
+    snapshot: tracemalloc.Snapshot | None,
+    path: str,
+    top: int,
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]] | None]:
+    """Dump the stats file and summarize both profiles. Runs in the executor."""
+    profiler.dump_stats(path)
+    allocations = _top_allocations(snapshot, top) if snapshot is not None else None
+    return _top_functions(profiler, top), allocations
+
+
+async def async_profile_refresh(
+    hass: HomeAssistant,
+    coordinator: EssentDataUpdateCoordinator,
+    trace_allocations: bool,
+    top: int,
+) -> ProfileResult:
+    """Run one refresh and listener fan-out under the profiler.
+
+    Raises ``ProfilerBusy`` when another profiler is active.
+    """
+    profiler = cProfile.Profile()
+    started_tracing = trace_allocations and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    try:
+        profiler.enable()
+    except ValueError as err:
+        if started_tracing:
+            tracemalloc.stop()
+        raise ProfilerBusy from err
+    start = time.perf_counter()
+    try:
+        await coordinator.async_refresh_and_fan_out()
+    finally:
+        profiler.disable()
+        duration = time.perf_counter() - start
+        snapshot = tracemalloc.take_snapshot() if trace_allocations else None
+        if started_tracing:
+            tracemalloc.stop()
+
+    path = hass.config.path(f"essent_profile.{int(time.time() * 1000000)}.cprof")
+    functions, allocations = await hass.async_add_executor_job(
+        _write_stats, profiler, snapshot, path, top
+    )
+    return ProfileResult(path, duration, functions, allocations)
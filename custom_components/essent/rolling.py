@@ -0,0 +1,232 @@
+"""Rolling multi-day price aggregates for the Essent integration."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .history import EssentPriceHistory, HistorySlot
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.rolling_stats"
+SAVE_DELAY = 10
+
+ROLLING_WINDOWS = (7, 30)
+RING_SIZE = max(ROLLING_WINDOWS)
+
+
+@dataclass(frozen=True, slots=True)
+class DaySummary:
+    """Average, lowest and highest slot price of a finalized day."""
+
+    day: date
+    avg_price: float
+    min_price: float
+    max_price: float
+
+
+@dataclass(frozen=True, slots=True)
+class RollingAggregate:
+    """Aggregate over the finalized days of the most recent calendar days."""
+
+    days: int
+    first_day: date
+    avg_price: float
+    min_price: float
+    max_price: float
+
+
+def summarize_day(day: date, slots: list[HistorySlot]) -> DaySummary:
+    """Reduce the retained slots of a day to its summary."""
+    prices = [price for _, _, price in slots]
+    return DaySummary(day, sum(prices) / len(prices), min(prices), max(prices))
+
+
+class _SummaryRing:
+    """The days of one energy type up to ``end``, with running sums per window.
+
+    Summaries are keyed by their date, so a window covers a fixed number of
+    calendar days and days missing from the history are left out of it.
+    """
+
+    def __init__(self, summaries: list[DaySummary], end: date) -> None:
+        self.end = end
+        first = end - timedelta(days=RING_SIZE)
+        self.days: dict[date, DaySummary] = {
+            summary.day: summary for summary in summaries if first < summary.day <= end
+        }
+        self._sums = {
+            window: sum(summary.avg_price for summary in self._window(window))
+            for window in ROLLING_WINDOWS
+        }
+        self.aggregates: dict[int, RollingAggregate] = {}
+        self._aggregate()
+
+    def _window(self, window: int) -> list[DaySummary]:
+        """Return the summaries of the last ``window`` days, oldest first."""
+        first = self.end - timedelta(days=window)
+        return [summary for summary in self.days.values() if summary.day > first]
+
+    def advance(self, end: date, summaries: list[DaySummary]) -> None:
+        """Move the windows on to ``end``, adding the days finalized since.
+
+        Only the days entering or leaving a window change its running sum.
+        """
+        for summary in summaries:
+            self.days[summary.day] = summary
+            for window in ROLLING_WINDOWS:
+                self._sums[window] += summary.avg_price
+        for window in ROLLING_WINDOWS:
+            left = self.end - timedelta(days=window)
+            first = end - timedelta(days=window)
+            self._sums[window] -= sum(
+                summary.avg_price
+                for summary in self.days.values()
+                if left < summary.day <= first
+            )
+        first = end - timedelta(days=RING_SIZE)
+        for day in [day for day in self.days if day <= first]:
+            del self.days[day]
+        self.end = end
+        self._aggregate()
+
+    def _aggregate(self) -> None:
+        """Resolve the aggregate of every window.
+
+        Averages come from the running sums; the extremes are rescanned, which
+        is bounded by the ring size.
+        """
+        self.aggregates = {}
+        for window in ROLLING_WINDOWS:
+            recent = self._window(window)
+            if not recent:
+                continue
+            self.aggregates[window] = RollingAggregate(
+                days=len(recent),
+                first_day=recent[0].day,
+                avg_price=self._sums[window] / len(recent),
+                min_price=min(summary.min_price for summary in recent),
+                max_price=max(summary.max_price for summary in recent),
+            )
+
+
+class EssentRollingStats:
+    """Rolling 7 and 30 day aggregates per energy type, persisted in a Store.
+
+    Each finalized day is reduced to a summary once, when the local date
+    rolls over, and pushed into a ring of the last calendar days. Memory and
+    the work per day stay constant however long the integration runs. A day
+    recorded late, at or before the last finalized day, rebuilds the ring
+    of its energy type from history.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the aggregates."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._rings: dict[str, _SummaryRing] = {}
+        self._finalized: dict[str, date] = {}
+
+    async def async_load(self) -> None:
+        """Load the summaries from storage."""
+        if (stored := await self._store.async_load()) is None:
+            return
+        for energy_type, data in stored.items():
+            finalized = self._finalized[energy_type] = date.fromisoformat(
+                data["finalized"]
+            )
+            self._rings[energy_type] = _SummaryRing(
+                [
+                    DaySummary(date.fromisoformat(day), avg, low, high)
+                    for day, avg, low, high in data["days"]
+                ],
+                finalized,
+            )
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the summaries in their storage format."""
+        return {
+            energy_type: {
+                "finalized": self._finalized[energy_type].isoformat(),
+                "days": [
+                    [
+                        summary.day.isoformat(),
+                        summary.avg_price,
+                        summary.min_price,
+                        summary.max_price,
+                    ]
+                    for summary in ring.days.values()
+                ],
+            }
+            for energy_type, ring in self._rings.items()
+        }
+
+    @callback
+    def async_rollover(
+        self, history: EssentPriceHistory, energy_types: list[str], today: date
+    ) -> None:
+        """Finalize every day before today that was not finalized yet."""
+        changed = False
+        yesterday = today - timedelta(days=1)
+        for energy_type in energy_types:
+            finalized = self._finalized.get(energy_type)
+            first = max(
+                finalized + timedelta(days=1) if finalized else date.min,
+                today - timedelta(days=RING_SIZE),
+            )
+            if first > yesterday:
+                continue
+            summaries = [
+                summarize_day(day, slots)
+                for day, slots in history.days(energy_type, first, yesterday)
+                if slots
+            ]
+            if (ring := self._rings.get(energy_type)) is None:
+                self._rings[energy_type] = _SummaryRing(summaries, yesterday)
+            else:
+                ring.advance(yesterday, summaries)
+            self._finalized[energy_type] = yesterday
+            changed = True
+        if changed:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def async_history_changed(
+        self, history: EssentPriceHistory, energy_type: str, day: date
+    ) -> None:
+        """Rebuild the ring of an energy type when a finalized day changed."""
+        finalized = self._finalized.get(energy_type)
+        if finalized is None or day > finalized:
+            return
+        del self._rings[energy_type]
+        del self._finalized[energy_type]
+        self.async_rollover(history, [energy_type], finalized + timedelta(days=1))
+
+    def aggregates(self, energy_type: str) -> dict[int, RollingAggregate]:
+        """Return the aggregate of every window, keyed by its length in days."""
+        ring = self._rings.get(energy_type)
+        return ring.aggregates if ring else {}
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary for diagnostics."""
+        return {
+            energy_type: {
+                "finalized": self._finalized[energy_type].isoformat(),
+                "days": len(ring.days),
+                "windows": {
+                    window: {
+                        "days": aggregate.days,
+                        "avg_price": aggregate.avg_price,
+                        "min_price": aggregate.min_price,
+                        "max_price": aggregate.max_price,
+                    }
+                    for window, aggregate in ring.aggregates.items()
+                },
+            }
+            for energy_type, ring in self._rings.items()
+        }
@@ -0,0 +1,208 @@
+"""Declarative schema of the Essent price document.
+
+The schema is described with a few node types and compiled once, at import,
+into nested validator functions. Validation is a single pass over the
+document that allocates nothing while the document is valid; the path of an
+error is only assembled when one is found, as in
+``prices[1].gas.tariffs[5].totalAmount: expected number``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+ERROR_MISSING = "missing"
+ERROR_TYPE = "wrong_type"
+ERROR_EMPTY = "empty"
+
+
+@dataclass(slots=True)
+class SchemaError:
+    """A single violation of the schema."""
+
+    code: str
+    message: str
+    # Path segments from the failing value up to the document root
+    segments: list[str | int] = field(default_factory=list)
+
+    @property
+    def path(self) -> str:
+        """Return the path of the failing value, e.g. ``prices[0].gas``."""
+        path = ""
+        for segment in reversed(self.segments):
+            if isinstance(segment, int):
+                path += f"[{segment}]"
+            else:
+                path += f".{segment}" if path else segment
+        return path
+
+    def __str__(self) -> str:
+        """Return the error with its path."""
+        return f"{self.path}: {self.message}" if self.segments else self.message
+
+
+type Validator = Callable[[Any], list[SchemaError] | None]
+
+
+@dataclass(frozen=True, slots=True)
+class Number:
+    """An int or float, but not a bool, or a string holding one."""
+
+    nullable: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class String:
+    """A string."""
+
+    nullable: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class Array:
+    """A list whose items all match one schema."""
+
+    items: Node
+    min_items: int = 0
+    nullable: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class Object:
+    """A dict with known keys; unknown keys are ignored."""
+
+    required: dict[str, Node] = field(default_factory=dict)
+    optional: dict[str, Node] = field(default_factory=dict)
+    nullable: bool = False
+
+
+type Node = Number | String | Array | Object
+
+
+def _type_error(expected: str) -> list[SchemaError]:
+    return [SchemaError(ERROR_TYPE, f"expected {expected}")]
+
+
+def compile_schema(node: Node) -> Validator:
+    """Compile a schema into a validator returning its errors, or None."""
+    if isinstance(node, Number):
+        nullable = node.nullable
+
+        def validate_number(value: Any) -> list[SchemaError] | None:
+            if type(value) is float or type(value) is int:
+                return None
+            if value is None and nullable:
+                return None
+            if type(value) is str:
+                # Consumers coerce amounts with float(), as the API has
+                # served them quoted before
+                try:
+                    float(value)
+                except ValueError:
+                    pass
+                else:
+                    return None
+            return _type_error("number")
+
+        return validate_number
+
+    if isinstance(node, String):
+        nullable = node.nullable
+
+        def validate_string(value: Any) -> list[SchemaError] | None:
+            if type(value) is str or (value is None and nullable):
+                return None
+            return _type_error("string")
+
+        return validate_string
+
+    if isinstance(node, Array):
+        validate_item = compile_schema(node.items)
+        min_items, nullable = node.min_items, node.nullable
+
+        def validate_array(value: Any) -> list[SchemaError] | None:
+            if type(value) is not list:
+                return None if value is None and nullable else _type_error("array")
+            if len(value) < min_items:
+                return [
+                    SchemaError(ERROR_EMPTY, f"expected at least {min_items} item(s)")
+                ]
+            errors = None
+            for idx, item in enumerate(value):
+                if (found := validate_item(item)) is not None:
+                    for error in found:
+                        error.segments.append(idx)
+                    errors = found if errors is None else errors + found
+            return errors
+
+        return validate_array
+
+    fields = [
+        (key, compile_schema(child), True) for key, child in node.required.items()
+    ] + [(key, compile_schema(child), False) for key, child in node.optional.items()]
+    nullable = node.nullable
+
+    def validate_object(value: Any) -> list[SchemaError] | None:
+        if type(value) is not dict:
+            return None if value is None and nullable else _type_error("object")
+        errors = None
+        for key, validate_field, required in fields:
+            if key not in value:
+                if not required:
+                    continue
+                found = [SchemaError(ERROR_MISSING, "missing")]
+            elif (found := validate_field(value[key])) is None:
+                continue
+            for error in found:
+                error.segments.append(key)
+            errors = found if errors is None else errors + found
+        return errors
+
+    return validate_object
+
+
+TARIFF_SCHEMA = Object(
+    required={
+        "startDateTime": String(),
+        "endDateTime": String(),
+    },
+    optional={
+        "totalAmount": Number(nullable=True),
+        "totalAmountEx": Number(nullable=True),
+        "totalAmountVat": Number(nullable=True),
+        "groups": Array(
+            Object(
+                optional={"type": String(), "amount": Number(nullable=True)},
+            )
+        ),
+    },
+)
+
+ENERGY_BLOCK_SCHEMA = Object(
+    required={"tariffs": Array(TARIFF_SCHEMA)},
+    optional={
+        "unitOfMeasurement": String(nullable=True),
+        "unit": String(nullable=True),
+    },
+    nullable=True,
+)
+
+PRICE_DOCUMENT_SCHEMA = Object(
+    required={
+        "prices": Array(
+            Object(
+                optional={
+                    # Without a date, today falls back to the first document
+                    "date": String(),
+                    "electricity": ENERGY_BLOCK_SCHEMA,
+                    "gas": ENERGY_BLOCK_SCHEMA,
+                },
+            ),
+            min_items=1,
+        )
+    }
+)
+
+validate_price_document = compile_schema(PRICE_DOCUMENT_SCHEMA)
@@ -1,48 +1,366 @@
 """Sensor platform for Essent integration."""
 from __future__ import annotations
 
-from datetime import datetime
-from typing import Any
+from bisect import bisect_right
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Self
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
+    SensorExtraStoredData,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    ATTR_UNIT_OF_MEASUREMENT,
+    CURRENCY_EURO,
+    PERCENTAGE,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
 )
-from homeassistant.const import CURRENCY_EURO
-from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_point_in_utc_time,
+    async_track_state_change_event,
+)
+from homeassistant.helpers.typing import StateType
 from homeassistant.util import dt as dt_util
-
-from .const import ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS
-from .coordinator import EssentConfigEntry, EssentDataUpdateCoordinator
+from homeassistant.util.unit_conversion import EnergyConverter, VolumeConverter
+
+from .const import (
+    CHEAP_PRICE_LEVELS,
+    CONF_ELECTRICITY_METER,
+    CONF_GAS_METER,
+    ENERGY_TYPE_ELECTRICITY,
+    ENERGY_TYPE_GAS,
+    PEAK_PRICE_LEVELS,
+    PRICE_LEVELS,
+)
+from .coordinator import (
+    EssentConfigEntry,
+    EssentDataUpdateCoordinator,
+    EssentPriceSnapshot,
+)
 from .entity import EssentEntity
+from .timeline import PriceSlot
 
 PARALLEL_UPDATES = 1
 
 
-def _parse_tariff_times(tariff: dict[str, Any]) -> tuple[datetime | None, datetime | None]:
-    """Parse tariff start/end times and ensure they are timezone-aware."""
-    start = dt_util.parse_datetime(tariff.get("startDateTime"))
-    end = dt_util.parse_datetime(tariff.get("endDateTime"))
+def _slot_price(slot: PriceSlot | None) -> float | None:
+    """Return the price of a slot, if any."""
+    return slot.price if slot else None
+
+
+def _slot_breakdown(slot: PriceSlot | None) -> dict[str, Any]:
+    """Return the price components and bounds of a slot."""
+    return slot.breakdown() if slot else {}
 
-    if start and start.tzinfo is None:
-        start = dt_util.as_local(start)
-    if end and end.tzinfo is None:
-        end = dt_util.as_local(end)
 
-    return start, end
+def _slot_window(slot: PriceSlot | None) -> dict[str, Any]:
+    """Return the bounds of a slot."""
+    if not slot:
+        return {}
+    return {"start": slot.start_dt.isoformat(), "end": slot.end_dt.isoformat()}
+
+
+def _tomorrow_value(snapshot: EssentPriceSnapshot, key: str) -> Any:
+    """Return an aggregate of tomorrow's prices, if published."""
+    return snapshot.tomorrow[key] if snapshot.tomorrow else None
+
+
+def _tomorrow_window(snapshot: EssentPriceSnapshot, prefix: str) -> dict[str, Any]:
+    """Return the bounds of tomorrow's cheapest or most expensive slot."""
+    if not snapshot.tomorrow:
+        return {}
+    return {
+        "start": snapshot.tomorrow[f"{prefix}_start"],
+        "end": snapshot.tomorrow[f"{prefix}_end"],
+    }
+
 
+def _rolling_value(snapshot: EssentPriceSnapshot, window: int, key: str) -> Any:
+    """Return an aggregate over the last finalized days, if any."""
+    aggregate = snapshot.rolling.get(window)
+    return getattr(aggregate, key) if aggregate else None
 
-def _format_dt_str(value: str | None) -> str | None:
-    """Format a datetime string as local ISO, falling back to original."""
-    if not value:
-        return None
-    parsed = dt_util.parse_datetime(value)
-    if not parsed:
+
+def _rolling_attributes(snapshot: EssentPriceSnapshot, window: int) -> dict[str, Any]:
+    """Return the extremes and coverage of a rolling window."""
+    if (aggregate := snapshot.rolling.get(window)) is None:
+        return {}
+    return {
+        "min_price": aggregate.min_price,
+        "max_price": aggregate.max_price,
+        "days": aggregate.days,
+        "first_day": aggregate.first_day.isoformat(),
+    }
+
+
+def _anomaly_count(snapshot: EssentPriceSnapshot) -> int | None:
+    """Return the number of flagged slots that have not ended."""
+    return len(snapshot.anomalies) if snapshot.anomalies is not None else None
+
+
+def _anomaly_attributes(snapshot: EssentPriceSnapshot) -> dict[str, Any]:
+    """Return the flagged slots that have not ended, with their scores."""
+    if not snapshot.anomalies:
+        return {}
+    return {
+        "anomalies": [
+            {
+                "start": dt_util.as_local(
+                    dt_util.utc_from_timestamp(anomaly.start)
+                ).isoformat(),
+                "end": dt_util.as_local(
+                    dt_util.utc_from_timestamp(anomaly.end)
+                ).isoformat(),
+                "price": anomaly.price,
+                "baseline": round(anomaly.median, 5),
+                "score": anomaly.score,
+                "direction": anomaly.direction,
+            }
+            for anomaly in snapshot.anomalies
+        ]
+    }
+
+
+def _convert_reading(value: float, unit: str | None, target: str) -> float | None:
+    """Convert a meter reading to the unit prices are quoted in."""
+    if unit is None or unit == target:
         return value
-    if parsed.tzinfo is None:
-        parsed = dt_util.as_local(parsed)
-    return parsed.isoformat()
+    for converter in (EnergyConverter, VolumeConverter):
+        if unit in converter.VALID_UNITS and target in converter.VALID_UNITS:
+            return converter.convert(value, unit, target)
+    return None
+
+
+@dataclass(frozen=True, kw_only=True)
+class EssentSensorEntityDescription(SensorEntityDescription):
+    """Describes an Essent price sensor evaluated against a snapshot."""
+
+    value_fn: Callable[[EssentPriceSnapshot], StateType]
+    attr_fn: Callable[[EssentPriceSnapshot], dict[str, Any]] = lambda _: {}
+    energy_types: tuple[str, ...] = (ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS)
+    price_unit: bool = True
+    # Values that only change with new data skip listener ticks entirely
+    updates_on_tick: bool = True
+
+
+SENSORS: tuple[EssentSensorEntityDescription, ...] = (
+    EssentSensorEntityDescription(
+        key="current_price",
+        name="current price",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        value_fn=lambda snapshot: _slot_price(snapshot.current),
+        attr_fn=lambda snapshot: _slot_breakdown(snapshot.current),
+    ),
+    EssentSensorEntityDescription(
+        key="next_price",
+        name="next price",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        value_fn=lambda snapshot: _slot_price(snapshot.next),
+        attr_fn=lambda snapshot: _slot_breakdown(snapshot.next),
+    ),
+    EssentSensorEntityDescription(
+        key="average_today",
+        name="average today",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        updates_on_tick=False,
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        value_fn=lambda snapshot: snapshot.avg_price,
+        attr_fn=lambda snapshot: {
+            "min_price": snapshot.min_price,
+            "max_price": snapshot.max_price,
+        },
+    ),
+    EssentSensorEntityDescription(
+        key="lowest_price_today",
+        name="lowest price today",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        updates_on_tick=False,
+        entity_registry_enabled_default=False,
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        value_fn=lambda snapshot: snapshot.min_price,
+        attr_fn=lambda snapshot: _slot_window(snapshot.cheapest),
+    ),
+    EssentSensorEntityDescription(
+        key="highest_price_today",
+        name="highest price today",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        updates_on_tick=False,
+        entity_registry_enabled_default=False,
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        value_fn=lambda snapshot: snapshot.max_price,
+        attr_fn=lambda snapshot: _slot_window(snapshot.most_expensive),
+    ),
+    EssentSensorEntityDescription(
+        key="average_tomorrow",
+        name="average tomorrow",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        updates_on_tick=False,
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        value_fn=lambda snapshot: _tomorrow_value(snapshot, "avg_price"),
+        attr_fn=lambda snapshot: {
+            "min_price": _tomorrow_value(snapshot, "min_price"),
+            "max_price": _tomorrow_value(snapshot, "max_price"),
+        },
+    ),
+    EssentSensorEntityDescription(
+        key="lowest_price_tomorrow",
+        name="lowest price tomorrow",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        updates_on_tick=False,
+        entity_registry_enabled_default=False,
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        value_fn=lambda snapshot: _tomorrow_value(snapshot, "min_price"),
+        attr_fn=lambda snapshot: _tomorrow_window(snapshot, "cheapest"),
+    ),
+    EssentSensorEntityDescription(
+        key="highest_price_tomorrow",
+        name="highest price tomorrow",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        updates_on_tick=False,
+        entity_registry_enabled_default=False,
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        value_fn=lambda snapshot: _tomorrow_value(snapshot, "max_price"),
+        attr_fn=lambda snapshot: _tomorrow_window(snapshot, "most_expensive"),
+    ),
+    EssentSensorEntityDescription(
+        key="average_7_days",
+        name="average 7 days",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        value_fn=lambda snapshot: _rolling_value(snapshot, 7, "avg_price"),
+        attr_fn=lambda snapshot: _rolling_attributes(snapshot, 7),
+    ),
+    EssentSensorEntityDescription(
+        key="lowest_price_7_days",
+        name="lowest price 7 days",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        entity_registry_enabled_default=False,
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        value_fn=lambda snapshot: _rolling_value(snapshot, 7, "min_price"),
+    ),
+    EssentSensorEntityDescription(
+        key="highest_price_7_days",
+        name="highest price 7 days",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        entity_registry_enabled_default=False,
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        value_fn=lambda snapshot: _rolling_value(snapshot, 7, "max_price"),
+    ),
+    EssentSensorEntityDescription(
+        key="average_30_days",
+        name="average 30 days",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        value_fn=lambda snapshot: _rolling_value(snapshot, 30, "avg_price"),
+        attr_fn=lambda snapshot: _rolling_attributes(snapshot, 30),
+    ),
+    EssentSensorEntityDescription(
+        key="lowest_price_30_days",
+        name="lowest price 30 days",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        entity_registry_enabled_default=False,
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        value_fn=lambda snapshot: _rolling_value(snapshot, 30, "min_price"),
+    ),
+    EssentSensorEntityDescription(
+        key="highest_price_30_days",
+        name="highest price 30 days",
+        device_class=SensorDeviceClass.MONETARY,
+        suggested_display_precision=3,
+        entity_registry_enabled_default=False,
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        value_fn=lambda snapshot: _rolling_value(snapshot, 30, "max_price"),
+    ),
+    EssentSensorEntityDescription(
+        key="price_level",
+        name="price level",
+        device_class=SensorDeviceClass.ENUM,
+        options=PRICE_LEVELS,
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        price_unit=False,
+        value_fn=lambda snapshot: snapshot.current_level,
+    ),
+    EssentSensorEntityDescription(
+        key="price_percentile",
+        name="price percentile",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=0,
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        price_unit=False,
+        value_fn=lambda snapshot: snapshot.current_percentile,
+        attr_fn=lambda snapshot: {"rank": snapshot.current_rank},
+    ),
+    EssentSensorEntityDescription(
+        key="price_anomalies",
+        name="price anomalies",
+        price_unit=False,
+        value_fn=_anomaly_count,
+        attr_fn=_anomaly_attributes,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class EssentTimestampSensorEntityDescription(SensorEntityDescription):
+    """Describes an Essent sensor holding the next of a series of boundaries."""
+
+    device_class: SensorDeviceClass = SensorDeviceClass.TIMESTAMP
+    boundaries_fn: Callable[[EssentDataUpdateCoordinator, str], Sequence[float]]
+    energy_types: tuple[str, ...] = (ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS)
+
+
+TIMESTAMP_SENSORS: tuple[EssentTimestampSensorEntityDescription, ...] = (
+    EssentTimestampSensorEntityDescription(
+        key="next_cheap_start",
+        name="next cheap start",
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        boundaries_fn=lambda coordinator, energy_type: coordinator.level_starts(
+            energy_type, CHEAP_PRICE_LEVELS
+        ),
+    ),
+    EssentTimestampSensorEntityDescription(
+        key="next_peak_start",
+        name="next peak start",
+        energy_types=(ENERGY_TYPE_ELECTRICITY,),
+        boundaries_fn=lambda coordinator, energy_type: coordinator.level_starts(
+            energy_type, PEAK_PRICE_LEVELS
+        ),
+    ),
+    EssentTimestampSensorEntityDescription(
+        key="current_slot_end",
+        name="current slot end",
+        boundaries_fn=lambda coordinator, energy_type: coordinator.slot_ends(
+            energy_type
+        ),
+    ),
+)
 
 
 async def async_setup_entry(
@@ -53,305 +371,379 @@ async def async_setup_entry(
     """Set up Essent sensors."""
     coordinator: EssentDataUpdateCoordinator = entry.runtime_data
 
-    entities: list[SensorEntity] = []
-
-    for energy_type in [ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS]:
-        entities.append(EssentCurrentPriceSensor(coordinator, energy_type))
-        entities.append(EssentNextPriceSensor(coordinator, energy_type))
-        if energy_type == ENERGY_TYPE_ELECTRICITY:
-            entities.append(EssentAveragePriceSensor(coordinator, energy_type))
-            entities.append(EssentLowestPriceSensor(coordinator, energy_type))
-            entities.append(EssentHighestPriceSensor(coordinator, energy_type))
+    entities: list[SensorEntity] = [
+        EssentSensor(coordinator, energy_type, description)
+        for energy_type in (ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS)
+        for description in SENSORS
+        if energy_type in description.energy_types
+    ]
+    entities.extend(
+        EssentTimestampSensor(coordinator, energy_type, description)
+        for energy_type in (ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS)
+        for description in TIMESTAMP_SENSORS
+        if energy_type in description.energy_types
+    )
+
+    meters = {
+        ENERGY_TYPE_ELECTRICITY: entry.options.get(CONF_ELECTRICITY_METER),
+        ENERGY_TYPE_GAS: entry.options.get(CONF_GAS_METER),
+    }
+    for energy_type, meter_entity_id in meters.items():
+        if meter_entity_id:
+            entities.append(EssentCostSensor(coordinator, energy_type, meter_entity_id))
 
     async_add_entities(entities)
 
 
-class EssentCurrentPriceSensor(EssentEntity, SensorEntity):
-    """Current price sensor."""
+class EssentSensor(EssentEntity, SensorEntity):
+    """Essent price sensor reading from the coordinator's snapshot."""
 
-    _attr_device_class = SensorDeviceClass.MONETARY
-    _attr_state_class = None
-    _attr_suggested_display_precision = 3
+    entity_description: EssentSensorEntityDescription
 
     def __init__(
         self,
         coordinator: EssentDataUpdateCoordinator,
         energy_type: str,
+        description: EssentSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, energy_type)
-        self._attr_unique_id = f"essent_{energy_type}_current_price"
-        self._attr_name = f"{energy_type.capitalize()} current price"
-        self._attr_translation_key = f"{energy_type}_current_price"
+        self.entity_description = description
+        self._attr_unique_id = f"essent_{energy_type}_{description.key}"
+        self._attr_name = f"{energy_type.capitalize()} {description.name}"
+        self._attr_translation_key = f"{energy_type}_{description.key}"
+        self._written_state: tuple[Any, ...] | None = None
+        self._written_data: Any = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when something visible changed."""
+        if (
+            not self.entity_description.updates_on_tick
+            and self._written_state is not None
+            and self._written_data is self.coordinator.data
+            and self._written_state[0] == self.available
+        ):
+            return
+        self._written_data = self.coordinator.data
+        state = (
+            self.available,
+            self.native_value,
+            self.native_unit_of_measurement,
+            self.extra_state_attributes,
+        )
+        if state == self._written_state:
+            return
+        self._written_state = state
+        self.async_write_ha_state()
 
     @property
-    def native_value(self) -> float | None:
-        """Return the current price."""
-        now = dt_util.now()
-        data = self.coordinator.data[self.energy_type]
-        tariffs: list[dict[str, Any]] = data["tariffs"] + data.get(
-            "tariffs_tomorrow", []
+    def native_value(self) -> StateType:
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(
+            self.coordinator.snapshot(self.energy_type)
         )
 
-        for tariff in tariffs:
-            start, end = _parse_tariff_times(tariff)
-            if start and end and start <= now < end:
-                return tariff.get("totalAmount")
-
-        return None
-
     @property
-    def native_unit_of_measurement(self) -> str:
+    def native_unit_of_measurement(self) -> str | None:
         """Return the unit of measurement."""
-        unit = self.coordinator.data[self.energy_type]["unit"]
+        if not self.entity_description.price_unit:
+            return self.entity_description.native_unit_of_measurement
+        unit = self.coordinator.snapshot(self.energy_type).unit
         return f"{CURRENCY_EURO}/{unit}"
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra attributes."""
-        now = dt_util.now()
-        data = self.coordinator.data[self.energy_type]
-        tariffs: list[dict[str, Any]] = data["tariffs"] + data.get(
-            "tariffs_tomorrow", []
+        return self.entity_description.attr_fn(
+            self.coordinator.snapshot(self.energy_type)
         )
 
-        # Find current tariff
-        current_tariff = None
-        for tariff in tariffs:
-            start, end = _parse_tariff_times(tariff)
-            if start and end and start <= now < end:
-                current_tariff = tariff
-                break
-
-        attributes: dict[str, Any] = {}
-
-        # Current price breakdown
-        if current_tariff:
-            groups = {
-                group["type"]: group.get("amount")
-                for group in current_tariff.get("groups", [])
-                if "type" in group
-            }
-            attributes.update(
-                {
-                    "price_ex_vat": current_tariff.get("totalAmountEx"),
-                    "vat": current_tariff.get("totalAmountVat"),
-                    "market_price": groups.get("MARKET_PRICE"),
-                    "purchasing_fee": groups.get("PURCHASING_FEE"),
-                    "tax": groups.get("TAX"),
-                    "start_time": _format_dt_str(
-                        current_tariff.get("startDateTime")
-                    ),
-                    "end_time": _format_dt_str(current_tariff.get("endDateTime")),
-                }
-            )
 
-        return attributes
+class EssentTimestampSensor(EssentEntity, SensorEntity):
+    """Essent sensor holding the next boundary, such as a cheap period start.
 
+    The value is the first boundary after now. It only changes when that
+    boundary is reached, where a timer is set, or when new data arrives, so
+    the frontend renders the countdown without per-minute state writes.
+    """
 
-class EssentNextPriceSensor(EssentEntity, SensorEntity):
-    """Next price sensor."""
-
-    _attr_device_class = SensorDeviceClass.MONETARY
-    _attr_state_class = None
-    _attr_suggested_display_precision = 3
+    entity_description: EssentTimestampSensorEntityDescription
 
     def __init__(
         self,
         coordinator: EssentDataUpdateCoordinator,
         energy_type: str,
+        description: EssentTimestampSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, energy_type)
-        self._attr_unique_id = f"essent_{energy_type}_next_price"
-        self._attr_name = f"{energy_type.capitalize()} next price"
-        self._attr_translation_key = f"{energy_type}_next_price"
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the next price."""
-        now = dt_util.now()
-        data = self.coordinator.data[self.energy_type]
-        tariffs: list[dict[str, Any]] = data["tariffs"] + data.get(
-            "tariffs_tomorrow", []
+        self.entity_description = description
+        self._attr_unique_id = f"essent_{energy_type}_{description.key}"
+        self._attr_name = f"{energy_type.capitalize()} {description.name}"
+        self._attr_translation_key = f"{energy_type}_{description.key}"
+        self._written_state: tuple[Any, ...] | None = None
+        self._written_data: Any = None
+        self._unsub_boundary: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Resolve the first value and set its timer."""
+        await super().async_added_to_hass()
+        self._async_evaluate()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the boundary timer."""
+        await super().async_will_remove_from_hass()
+        self._async_cancel_boundary()
+
+    @callback
+    def _async_cancel_boundary(self) -> None:
+        if self._unsub_boundary is not None:
+            self._unsub_boundary()
+            self._unsub_boundary = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Resolve the value again when new data arrives."""
+        if (
+            self._written_state is not None
+            and self._written_data is self.coordinator.data
+            and self._written_state[0] == self.available
+        ):
+            return
+        self._async_evaluate()
+
+    @callback
+    def _handle_boundary(self, _: datetime) -> None:
+        """Move on to the next boundary."""
+        self._unsub_boundary = None
+        self._async_evaluate()
+
+    @callback
+    def _async_evaluate(self) -> None:
+        """Resolve the next boundary, set its timer and write on a change."""
+        self._written_data = self.coordinator.data
+        boundaries: Sequence[float] = (
+            self.entity_description.boundaries_fn(self.coordinator, self.energy_type)
+            if self.coordinator.data
+            else ()
         )
-
-        for tariff in tariffs:
-            start, _ = _parse_tariff_times(tariff)
-            if start and start > now:
-                return tariff.get("totalAmount")
-
-        return None
-
-    @property
-    def native_unit_of_measurement(self) -> str:
-        """Return the unit of measurement."""
-        unit = self.coordinator.data[self.energy_type]["unit"]
-        return f"{CURRENCY_EURO}/{unit}"
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra attributes."""
-        now = dt_util.now()
-        data = self.coordinator.data[self.energy_type]
-        tariffs: list[dict[str, Any]] = data["tariffs"] + data.get(
-            "tariffs_tomorrow", []
+        idx = bisect_right(boundaries, dt_util.utcnow().timestamp())
+        value = (
+            dt_util.utc_from_timestamp(boundaries[idx])
+            if idx < len(boundaries)
+            else None
         )
+        self._attr_native_value = value
 
-        next_tariff = None
-        for tariff in tariffs:
-            start, _ = _parse_tariff_times(tariff)
-            if start and start > now:
-                next_tariff = tariff
-                break
-
-        if not next_tariff:
-            return {}
-
-        groups = {
-            group["type"]: group.get("amount")
-            for group in next_tariff.get("groups", [])
-            if "type" in group
-        }
+        self._async_cancel_boundary()
+        if value is not None:
+            self._unsub_boundary = async_track_point_in_utc_time(
+                self.hass, self._handle_boundary, value
+            )
 
-        return {
-            "price_ex_vat": next_tariff.get("totalAmountEx"),
-            "vat": next_tariff.get("totalAmountVat"),
-            "market_price": groups.get("MARKET_PRICE"),
-            "purchasing_fee": groups.get("PURCHASING_FEE"),
-            "tax": groups.get("TAX"),
-            "start_time": _format_dt_str(next_tariff.get("startDateTime")),
-            "end_time": _format_dt_str(next_tariff.get("endDateTime")),
-        }
+        state = (self.available, value)
+        if state == self._written_state:
+            return
+        self._written_state = state
+        self.async_write_ha_state()
+
+
+@dataclass
+class EssentCostExtraStoredData(SensorExtraStoredData):
+    """Cost sensor state persisted across restarts."""
+
+    last_reset: datetime | None
+    last_reading: float | None
+    last_reading_ts: float | None
+    unpriced_consumption: float
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation of the stored data."""
+        data = super().as_dict()
+        data.update(
+            {
+                "last_reset": self.last_reset.isoformat() if self.last_reset else None,
+                "last_reading": self.last_reading,
+                "last_reading_ts": self.last_reading_ts,
+                "unpriced_consumption": self.unpriced_consumption,
+            }
+        )
+        return data
+
+    @classmethod
+    def from_dict(cls, restored: dict[str, Any]) -> Self | None:
+        """Initialize the stored data from a dict."""
+        if (base := SensorExtraStoredData.from_dict(restored)) is None:
+            return None
+        last_reset = restored.get("last_reset")
+        return cls(
+            base.native_value,
+            base.native_unit_of_measurement,
+            dt_util.parse_datetime(last_reset) if last_reset else None,
+            restored.get("last_reading"),
+            restored.get("last_reading_ts"),
+            restored.get("unpriced_consumption", 0.0),
+        )
 
 
-class EssentAveragePriceSensor(EssentEntity, SensorEntity):
-    """Average price today sensor."""
+class EssentCostSensor(EssentEntity, RestoreSensor):
+    """Energy cost today, accumulated from meter updates per tariff slot."""
 
     _attr_device_class = SensorDeviceClass.MONETARY
-    _attr_state_class = None
-    _attr_suggested_display_precision = 3
+    _attr_state_class = SensorStateClass.TOTAL
+    _attr_native_unit_of_measurement = CURRENCY_EURO
+    _attr_suggested_display_precision = 2
 
     def __init__(
         self,
         coordinator: EssentDataUpdateCoordinator,
         energy_type: str,
+        meter_entity_id: str,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, energy_type)
-        self._attr_unique_id = f"essent_{energy_type}_average_today"
-        self._attr_name = f"{energy_type.capitalize()} average today"
-        self._attr_translation_key = f"{energy_type}_average_today"
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the average price."""
-        return self.coordinator.data[self.energy_type]["avg_price"]
+        self._attr_unique_id = f"essent_{energy_type}_cost_today"
+        self._attr_name = f"{energy_type.capitalize()} cost today"
+        self._attr_translation_key = f"{energy_type}_cost_today"
+        self._attr_last_reset = dt_util.start_of_local_day()
+        self._meter_entity_id = meter_entity_id
+        self._total = 0.0
+        self._unpriced_consumption = 0.0
+        self._last_reading: float | None = None
+        self._last_reading_ts: float | None = None
+        self._slot_hint: int | None = None
+        self._unsub_reset: CALLBACK_TYPE | None = None
+        self._written_available: bool | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when availability changed.
+
+        The total follows meter updates and local midnight, not prices.
+        """
+        if self.available == self._written_available:
+            return
+        self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state and remember the availability it was written with."""
+        self._written_available = self.available
+        super().async_write_ha_state()
 
     @property
-    def native_unit_of_measurement(self) -> str:
-        """Return the unit of measurement."""
-        unit = self.coordinator.data[self.energy_type]["unit"]
-        return f"{CURRENCY_EURO}/{unit}"
+    def native_value(self) -> float:
+        """Return the accumulated cost."""
+        return self._total
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return extra attributes."""
         return {
-            "min_price": self.coordinator.data[self.energy_type]["min_price"],
-            "max_price": self.coordinator.data[self.energy_type]["max_price"],
+            "meter_entity": self._meter_entity_id,
+            "unpriced_consumption": self._unpriced_consumption,
         }
 
-
-class EssentLowestPriceSensor(EssentEntity, SensorEntity):
-    """Lowest price today sensor."""
-
-    _attr_device_class = SensorDeviceClass.MONETARY
-    _attr_state_class = None
-    _attr_entity_registry_enabled_default = False
-    _attr_suggested_display_precision = 3
-
-    def __init__(
-        self,
-        coordinator: EssentDataUpdateCoordinator,
-        energy_type: str,
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, energy_type)
-        self._attr_unique_id = f"essent_{energy_type}_lowest_price_today"
-        self._attr_name = f"{energy_type.capitalize()} lowest price today"
-        self._attr_translation_key = f"{energy_type}_lowest_price_today"
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the lowest price."""
-        return self.coordinator.data[self.energy_type]["min_price"]
-
-    @property
-    def native_unit_of_measurement(self) -> str:
-        """Return the unit of measurement."""
-        unit = self.coordinator.data[self.energy_type]["unit"]
-        return f"{CURRENCY_EURO}/{unit}"
-
     @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra attributes."""
-        tariffs = self.coordinator.data[self.energy_type]["tariffs"]
-        min_price = self.coordinator.data[self.energy_type]["min_price"]
-
-        # Find tariff with minimum price
-        for tariff in tariffs:
-            if tariff.get("totalAmount") == min_price:
-                return {
-                    "start": _format_dt_str(tariff.get("startDateTime")),
-                    "end": _format_dt_str(tariff.get("endDateTime")),
-                }
-
-        return {}
-
-
-class EssentHighestPriceSensor(EssentEntity, SensorEntity):
-    """Highest price today sensor."""
-
-    _attr_device_class = SensorDeviceClass.MONETARY
-    _attr_state_class = None
-    _attr_entity_registry_enabled_default = False
-    _attr_suggested_display_precision = 3
-
-    def __init__(
-        self,
-        coordinator: EssentDataUpdateCoordinator,
-        energy_type: str,
-    ) -> None:
-        """Initialize the sensor."""
-        super().__init__(coordinator, energy_type)
-        self._attr_unique_id = f"essent_{energy_type}_highest_price_today"
-        self._attr_name = f"{energy_type.capitalize()} highest price today"
-        self._attr_translation_key = f"{energy_type}_highest_price_today"
-
-    @property
-    def native_value(self) -> float | None:
-        """Return the highest price."""
-        return self.coordinator.data[self.energy_type]["max_price"]
-
-    @property
-    def native_unit_of_measurement(self) -> str:
-        """Return the unit of measurement."""
-        unit = self.coordinator.data[self.energy_type]["unit"]
-        return f"{CURRENCY_EURO}/{unit}"
-
-    @property
-    def extra_state_attributes(self) -> dict[str, Any]:
-        """Return extra attributes."""
-        tariffs = self.coordinator.data[self.energy_type]["tariffs"]
-        max_price = self.coordinator.data[self.energy_type]["max_price"]
+    def extra_restore_state_data(self) -> EssentCostExtraStoredData:
+        """Return the state and meter baseline to restore after a restart."""
+        return EssentCostExtraStoredData(
+            self._total,
+            self.native_unit_of_measurement,
+            self._attr_last_reset,
+            self._last_reading,
+            self._last_reading_ts,
+            self._unpriced_consumption,
+        )
 
-        # Find tariff with maximum price
-        for tariff in tariffs:
-            if tariff.get("totalAmount") == max_price:
-                return {
-                    "start": _format_dt_str(tariff.get("startDateTime")),
-                    "end": _format_dt_str(tariff.get("endDateTime")),
-                }
+    async def async_added_to_hass(self) -> None:
+        """Restore the running total and start listening to the meter."""
+        await super().async_added_to_hass()
+
+        if (last_extra := await self.async_get_last_extra_data()) is not None and (
+            restored := EssentCostExtraStoredData.from_dict(last_extra.as_dict())
+        ) is not None:
+            self._last_reading = restored.last_reading
+            self._last_reading_ts = restored.last_reading_ts
+            # Only carry the total over when it belongs to the current day
+            if restored.last_reset == self._attr_last_reset:
+                self._total = float(restored.native_value or 0.0)
+                self._unpriced_consumption = restored.unpriced_consumption
+
+        self.async_on_remove(
+            async_track_state_change_event(
+                self.hass, [self._meter_entity_id], self._async_meter_changed
+            )
+        )
+        self._schedule_reset()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the scheduled daily reset."""
+        await super().async_will_remove_from_hass()
+        if self._unsub_reset:
+            self._unsub_reset()
+            self._unsub_reset = None
+
+    @callback
+    def _schedule_reset(self) -> None:
+        """Schedule the reset of the total at the next local midnight."""
+        next_midnight = dt_util.start_of_local_day(
+            self._attr_last_reset.date() + timedelta(days=1)
+        )
+        self._unsub_reset = async_track_point_in_time(
+            self.hass, self._async_reset, next_midnight
+        )
 
-        return {}
+    @callback
+    def _async_reset(self, now: datetime) -> None:
+        """Start a new day."""
+        self._unsub_reset = None
+        self._attr_last_reset = dt_util.start_of_local_day(now)
+        self._total = 0.0
+        self._unpriced_consumption = 0.0
+        self.async_write_ha_state()
+        self._schedule_reset()
+
+    @callback
+    def _async_meter_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Price the consumption since the previous meter reading."""
+        new_state = event.data["new_state"]
+        if new_state is None or new_state.state in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            return
+        try:
+            reading = float(new_state.state)
+        except ValueError:
+            return
+        # The price unit is only known once prices were fetched
+        if not self.coordinator.data or self.energy_type not in self.coordinator.data:
+            return
+        reading = _convert_reading(
+            reading,
+            new_state.attributes.get(ATTR_UNIT_OF_MEASUREMENT),
+            self.coordinator.data[self.energy_type]["unit"],
+        )
+        if reading is None:
+            return
+
+        timestamp = new_state.last_updated.timestamp()
+        previous, previous_ts = self._last_reading, self._last_reading_ts
+        self._last_reading, self._last_reading_ts = reading, timestamp
+
+        # A first reading or a meter reset only establishes a new baseline
+        if previous is None or previous_ts is None or reading <= previous:
+            return
+        if timestamp <= previous_ts:
+            return
+
+        rate = (reading - previous) / (timestamp - previous_ts)
+        start = max(previous_ts, self._attr_last_reset.timestamp())
+        if timestamp <= start:
+            return
+
+        cost, unpriced_seconds, self._slot_hint = self.coordinator.timeline(
+            self.energy_type
+        ).cost_between(start, timestamp, rate, self._slot_hint)
+        self._total += cost
+        self._unpriced_consumption += rate * unpriced_seconds
+        self.async_write_ha_state()
@@ -0,0 +1,420 @@
+"""Services for the Essent integration."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.importlib import async_import_module
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_DYNAMIC_DAILY_FEE,
+    ATTR_END_DATE,
+    ATTR_ENERGY_TYPE,
+    ATTR_FIXED_DAILY_FEE,
+    ATTR_FIXED_PRICE,
+    ATTR_RESOLUTION,
+    ATTR_START_DATE,
+    ATTR_STATISTIC_ID,
+    ATTR_TIMESTAMPS,
+    ATTR_TOP,
+    ATTR_TRACE_ALLOCATIONS,
+    DOMAIN,
+    ENERGY_TYPE_ELECTRICITY,
+    ENERGY_TYPE_GAS,
+    HISTORY_RETENTION_DAYS,
+    RESOLUTIONS,
+    SERVICE_BACKFILL,
+    SERVICE_COMPARE_CONTRACT,
+    SERVICE_GET_ANOMALIES,
+    SERVICE_GET_FORECAST,
+    SERVICE_GET_PRICE_AT,
+    SERVICE_PROFILE,
+    SERVICE_REFRESH,
+)
+
+if TYPE_CHECKING:
+    from .contract import FixedTariff, MonthTotals
+    from .coordinator import EssentDataUpdateCoordinator, EssentPriceSnapshot
+
+GET_FORECAST_SCHEMA = vol.Schema({})
+
+GET_PRICE_AT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENERGY_TYPE): vol.In(
+            [ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS]
+        ),
+        vol.Required(ATTR_TIMESTAMPS): vol.All(
+            cv.ensure_list, vol.Length(min=1), [cv.datetime]
+        ),
+        vol.Optional(ATTR_RESOLUTION): vol.In(RESOLUTIONS),
+    }
+)
+
+REFRESH_SCHEMA = vol.Schema({})
+
+BACKFILL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Required(ATTR_END_DATE): cv.date,
+    }
+)
+
+COMPARE_CONTRACT_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_STATISTIC_ID): cv.string,
+        vol.Required(ATTR_START_DATE): cv.date,
+        vol.Required(ATTR_END_DATE): cv.date,
+        vol.Required(ATTR_FIXED_PRICE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(ATTR_ENERGY_TYPE, default=ENERGY_TYPE_ELECTRICITY): vol.In(
+            [ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS]
+        ),
+        vol.Optional(ATTR_FIXED_DAILY_FEE, default=0.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional(ATTR_DYNAMIC_DAILY_FEE, default=0.0): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+
+GET_ANOMALIES_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENERGY_TYPE, default=ENERGY_TYPE_ELECTRICITY): vol.In(
+            [ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS]
+        ),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_TRACE_ALLOCATIONS, default=False): cv.boolean,
+        vol.Optional(ATTR_TOP, default=10): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=100)
+        ),
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant) -> EssentDataUpdateCoordinator:
+    """Return the coordinator of the loaded config entry."""
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.state is ConfigEntryState.LOADED:
+            return entry.runtime_data
+    raise ServiceValidationError(
+        translation_domain=DOMAIN,
+        translation_key="not_loaded",
+    )
+
+
+def _isoformat(timestamp: float) -> str:
+    """Format a UTC epoch as a local ISO timestamp."""
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).isoformat()
+
+
+async def _async_get_forecast(call: ServiceCall) -> ServiceResponse:
+    """Return the estimated prices beyond the published horizon."""
+    coordinator = _get_coordinator(call.hass)
+    if (result := coordinator.forecasts.get(ENERGY_TYPE_ELECTRICITY)) is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="forecast_unavailable",
+        )
+    return {
+        "energy_type": result.energy_type,
+        "estimate": True,
+        "date": result.target_date.isoformat(),
+        "generated_at": result.generated_at.isoformat(),
+        "days_used": result.days_used,
+        "train_time_ms": round(result.train_seconds * 1000, 3),
+        "inference_time_ms": round(result.inference_seconds * 1000, 3),
+        "slots": [
+            {
+                "start": _isoformat(start),
+                "end": _isoformat(end),
+                "price": round(price, 5),
+                "estimate": True,
+            }
+            for start, end, price in result.slots
+        ],
+    }
+
+
+async def _async_get_price_at(call: ServiceCall) -> ServiceResponse:
+    """Return the price in effect at each of the requested timestamps."""
+    coordinator = _get_coordinator(call.hass)
+    energy_type: str = call.data[ATTR_ENERGY_TYPE]
+    timestamps = [dt_util.as_utc(when) for when in call.data[ATTR_TIMESTAMPS]]
+    if (resolution := call.data.get(ATTR_RESOLUTION)) is not None:
+        timeline = coordinator.resampled(energy_type, resolution)
+    else:
+        timeline = coordinator.timeline(energy_type)
+    block = coordinator.data.get(energy_type) if coordinator.data else None
+
+    # Readings often share a slot, so each slot is only broken down once
+    breakdowns: dict[int, dict[str, Any]] = {}
+    prices: list[dict[str, Any] | None] = []
+    for when, idx in zip(
+        timestamps, timeline.indices_at([when.timestamp() for when in timestamps])
+    ):
+        if idx is None:
+            prices.append(None)
+            continue
+        if (breakdown := breakdowns.get(idx)) is None:
+            slot = timeline.slots[idx]
+            breakdown = breakdowns[idx] = {"price": slot.price, **slot.breakdown()}
+        prices.append({"timestamp": dt_util.as_local(when).isoformat(), **breakdown})
+    return {
+        "energy_type": energy_type,
+        "resolution": resolution,
+        "unit": block["unit"] if block else None,
+        "prices": prices,
+    }
+
+
+async def _async_get_anomalies(call: ServiceCall) -> ServiceResponse:
+    """Return the published slots flagged against their hour's baseline."""
+    coordinator = _get_coordinator(call.hass)
+    energy_type: str = call.data[ATTR_ENERGY_TYPE]
+    report = coordinator.anomalies.reports.get(energy_type)
+    return {
+        "energy_type": energy_type,
+        "baseline_days": coordinator.anomalies.baseline_days(energy_type),
+        "scored_slots": report.scored if report else 0,
+        "unscored_slots": report.unscored if report else 0,
+        "max_score": report.max_score if report else None,
+        "anomalies": [
+            {
+                "start": _isoformat(anomaly.start),
+                "end": _isoformat(anomaly.end),
+                "price": anomaly.price,
+                "baseline": round(anomaly.median, 5),
+                "score": anomaly.score,
+                "direction": anomaly.direction,
+            }
+            for anomaly in (report.anomalies if report else ())
+        ],
+    }
+
+
+async def _async_backfill(call: ServiceCall) -> None:
+    """Start fetching past prices into the local history."""
+    coordinator = _get_coordinator(call.hass)
+    start: date = call.data[ATTR_START_DATE]
+    end: date = call.data[ATTR_END_DATE]
+    today = dt_util.now().date()
+    if not today - timedelta(days=HISTORY_RETENTION_DAYS) <= start <= end < today:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="invalid_backfill_range",
+            translation_placeholders={"days": str(HISTORY_RETENTION_DAYS)},
+        )
+    backfill = await coordinator.async_get_backfill()
+    if backfill.running:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="backfill_running",
+        )
+    backfill.async_start(start, end)
+
+
+def _snapshot_prices(snapshot: EssentPriceSnapshot) -> dict[str, Any]:
+    """Return the current and next price of a snapshot."""
+    return {
+        "unit": snapshot.unit,
+        "current_price": snapshot.current.price if snapshot.current else None,
+        "next_price": snapshot.next.price if snapshot.next else None,
+        "tomorrow_available": snapshot.tomorrow is not None,
+    }
+
+
+async def _async_refresh(call: ServiceCall) -> ServiceResponse:
+    """Fetch prices now and report how fresh the data is."""
+    coordinator = _get_coordinator(call.hass)
+    outcome, coalesced = await coordinator.async_refresh_on_demand()
+    now = dt_util.utcnow()
+    fetched_at = coordinator.data_fetched_at
+    attempted_at = coordinator.last_fetch_attempt
+    return {
+        "outcome": outcome,
+        "coalesced": coalesced,
+        "last_update_success": coordinator.last_update_success,
+        "last_fetch_attempt": attempted_at.isoformat() if attempted_at else None,
+        "data_fetched_at": fetched_at.isoformat() if fetched_at else None,
+        "data_age_seconds": (
+            round((now - fetched_at).total_seconds(), 1) if fetched_at else None
+        ),
+        "prices": {
+            energy_type: _snapshot_prices(coordinator.snapshot(energy_type))
+            for energy_type in (coordinator.data or {})
+        },
+    }
+
+
+def _contract_totals(months: list[MonthTotals], tariff: FixedTariff) -> dict[str, Any]:
+    """Return the consumption and both costs of one or more months."""
+    days = sum(month.days for month in months)
+    priced = sum(month.priced_consumption for month in months)
+    dynamic_cost = (
+        sum(month.dynamic_energy_cost for month in months)
+        + days * tariff.dynamic_daily_fee
+    )
+    fixed_cost = priced * tariff.price + days * tariff.daily_fee
+    return {
+        "days": days,
+        "consumption": round(sum(month.consumption for month in months), 3),
+        "priced_consumption": round(priced, 3),
+        "unpriced_consumption": round(
+            sum(month.unpriced_consumption for month in months), 3
+        ),
+        "unpriced_hours": sum(month.unpriced_hours for month in months),
+        "dynamic_cost": round(dynamic_cost, 2),
+        "fixed_cost": round(fixed_cost, 2),
+        "difference": round(dynamic_cost - fixed_cost, 2),
+    }
+
+
+async def _async_compare_contract(call: ServiceCall) -> ServiceResponse:
+    """Price recorded consumption on the dynamic and a fixed tariff."""
+    hass = call.hass
+    coordinator = _get_coordinator(hass)
+    if "recorder" not in hass.config.components:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="recorder_unavailable",
+        )
+    statistic_id: str = call.data[ATTR_STATISTIC_ID]
+    energy_type: str = call.data[ATTR_ENERGY_TYPE]
+    start: date = call.data[ATTR_START_DATE]
+    end: date = call.data[ATTR_END_DATE]
+    if not start <= end <= dt_util.now().date():
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="invalid_compare_range",
+        )
+    # The recorder and its database layer are only loaded once this is used
+    contract = await async_import_module(hass, f"{__package__}.contract")
+    tariff = contract.FixedTariff(
+        call.data[ATTR_FIXED_PRICE],
+        call.data[ATTR_FIXED_DAILY_FEE],
+        call.data[ATTR_DYNAMIC_DAILY_FEE],
+    )
+    try:
+        months = await contract.async_compare_contract(
+            hass, coordinator.history, energy_type, statistic_id, start, end
+        )
+    except contract.UnknownStatistic as err:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="unknown_statistic",
+            translation_placeholders={"statistic_id": statistic_id},
+        ) from err
+    except contract.IncompatibleUnit as err:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="incompatible_statistic_unit",
+            translation_placeholders={
+                "statistic_id": statistic_id,
+                "unit": str(err.unit),
+                "target": err.target,
+            },
+        ) from err
+    return {
+        "statistic_id": statistic_id,
+        "energy_type": energy_type,
+        "start_date": start.isoformat(),
+        "end_date": end.isoformat(),
+        "months": [
+            {"month": key, **_contract_totals([month], tariff)}
+            for key, month in months.items()
+        ],
+        "total": _contract_totals(list(months.values()), tariff),
+    }
+
+
+async def _async_profile(call: ServiceCall) -> ServiceResponse:
+    """Profile one refresh with its listener fan-out."""
+    coordinator = _get_coordinator(call.hass)
+    profiling = await async_import_module(call.hass, f"{__package__}.profiling")
+    try:
+        result = await profiling.async_profile_refresh(
+            call.hass,
+            coordinator,
+            call.data[ATTR_TRACE_ALLOCATIONS],
+            call.data[ATTR_TOP],
+        )
+    except profiling.ProfilerBusy as err:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN,
+            translation_key="profiler_busy",
+        ) from err
+    return {
+        "stats_file": result.stats_file,
+        "duration_ms": round(result.duration * 1000, 3),
+        "last_update_success": coordinator.last_update_success,
+        "functions": result.functions,
+        "allocations": result.allocations,
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Essent services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FORECAST,
+        _async_get_forecast,
+        schema=GET_FORECAST_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_PRICE_AT,
+        _async_get_price_at,
+        schema=GET_PRICE_AT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_ANOMALIES,
+        _async_get_anomalies,
+        schema=GET_ANOMALIES_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN, SERVICE_BACKFILL, _async_backfill, schema=BACKFILL_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        _async_refresh,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_COMPARE_CONTRACT,
+        _async_compare_contract,
+        schema=COMPARE_CONTRACT_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
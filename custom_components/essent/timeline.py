@@ -0,0 +1,478 @@
+"""Parsed tariff timeline helpers for the Essent integration."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, tzinfo
+import heapq
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    PRICE_GROUP_MARKET,
+    PRICE_GROUP_PURCHASING_FEE,
+    PRICE_GROUP_TAX,
+    PRICE_LEVEL_CHEAP,
+    PRICE_LEVEL_EXPENSIVE,
+    PRICE_LEVEL_NORMAL,
+    PRICE_LEVEL_VERY_CHEAP,
+    PRICE_LEVEL_VERY_EXPENSIVE,
+    RESOLUTION_DAY,
+    RESOLUTION_HOUR,
+    RESOLUTION_QUARTER_HOUR,
+)
+
+RESOLUTION_SECONDS = {RESOLUTION_QUARTER_HOUR: 900, RESOLUTION_HOUR: 3600}
+
+
+@dataclass(frozen=True, slots=True)
+class PriceSlot:
+    """A single tariff slot with its bounds as UTC epoch seconds."""
+
+    start: float
+    end: float
+    price: float | None
+    tariff: dict[str, Any]
+
+    @property
+    def start_dt(self) -> datetime:
+        """Return the slot start as a local datetime."""
+        return dt_util.as_local(dt_util.utc_from_timestamp(self.start))
+
+    @property
+    def end_dt(self) -> datetime:
+        """Return the slot end as a local datetime."""
+        return dt_util.as_local(dt_util.utc_from_timestamp(self.end))
+
+    def breakdown(self) -> dict[str, Any]:
+        """Return the price components and bounds of the slot."""
+        tariff = self.tariff
+        groups = {
+            group["type"]: group.get("amount")
+            for group in tariff.get("groups", [])
+            if "type" in group
+        }
+        return {
+            "price_ex_vat": tariff.get("totalAmountEx"),
+            "vat": tariff.get("totalAmountVat"),
+            "market_price": groups.get(PRICE_GROUP_MARKET),
+            "purchasing_fee": groups.get(PRICE_GROUP_PURCHASING_FEE),
+            "tax": groups.get(PRICE_GROUP_TAX),
+            "start_time": self.start_dt.isoformat(),
+            "end_time": self.end_dt.isoformat(),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class TimelineIssue:
+    """A problem found while validating the timeline."""
+
+    kind: str
+    start: str | None
+    detail: str
+
+
+@dataclass(slots=True)
+class TimelineReport:
+    """Findings of the timeline validation pass."""
+
+    slot_count: int = 0
+    issues: list[TimelineIssue] = field(default_factory=list)
+    dst_days: list[dict[str, Any]] = field(default_factory=list)
+
+    def add(self, kind: str, start: str | None, detail: str) -> None:
+        """Record an issue."""
+        self.issues.append(TimelineIssue(kind, start, detail))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dict representation for diagnostics."""
+        counts: dict[str, int] = {}
+        for issue in self.issues:
+            counts[issue.kind] = counts.get(issue.kind, 0) + 1
+        return {
+            "slot_count": self.slot_count,
+            "issue_counts": counts,
+            "issues": [
+                {"kind": issue.kind, "start": issue.start, "detail": issue.detail}
+                for issue in self.issues
+            ],
+            "dst_days": self.dst_days,
+        }
+
+
+def _localize(naive: datetime, time_zone: tzinfo, after: float | None) -> float | None:
+    """Resolve a naive wall-clock time to a UTC epoch.
+
+    Wall times repeated when clocks go back resolve to their first occurrence
+    unless that would not move past ``after``, in which case the second
+    occurrence is used. Wall times skipped when clocks go forward return None.
+    """
+    first = naive.replace(tzinfo=time_zone, fold=0)
+    second = naive.replace(tzinfo=time_zone, fold=1)
+    if first.utcoffset() == second.utcoffset():
+        return first.timestamp()
+    if first.astimezone(dt_util.UTC).astimezone(time_zone).replace(tzinfo=None) != naive:
+        return None
+    if after is not None and first.timestamp() <= after:
+        return second.timestamp()
+    return first.timestamp()
+
+
+def _resolve(
+    value: str | None, time_zone: tzinfo, after: float | None
+) -> tuple[float | None, datetime | None]:
+    """Parse an API datetime string to a UTC epoch and its naive wall time."""
+    if not value or (parsed := dt_util.parse_datetime(value)) is None:
+        return None, None
+    if parsed.tzinfo is not None:
+        return parsed.timestamp(), None
+    return _localize(parsed, time_zone, after), parsed
+
+
+class PriceTimeline:
+    """Sorted, non-overlapping tariff slots with an index for fast lookups."""
+
+    def __init__(
+        self, slots: list[PriceSlot], report: TimelineReport | None = None
+    ) -> None:
+        """Initialize the timeline from slots sorted by start time."""
+        self.slots = slots
+        self.report = report or TimelineReport(slot_count=len(slots))
+        self._starts = [slot.start for slot in slots]
+
+    def __len__(self) -> int:
+        """Return the number of slots."""
+        return len(self.slots)
+
+    def index_at(self, timestamp: float, hint: int | None = None) -> int | None:
+        """Return the index of the slot covering a timestamp.
+
+        ``hint`` is the index returned by a previous lookup. Callers that move
+        forward in time hit it (or its successor) and skip the bisect.
+        """
+        slots = self.slots
+        if hint is not None:
+            for idx in (hint, hint + 1):
+                if 0 <= idx < len(slots) and slots[idx].start <= timestamp < slots[idx].end:
+                    return idx
+        idx = bisect_right(self._starts, timestamp) - 1
+        if idx >= 0 and timestamp < slots[idx].end:
+            return idx
+        return None
+
+    def slot_at(self, timestamp: float) -> PriceSlot | None:
+        """Return the slot covering a timestamp."""
+        idx = self.index_at(timestamp)
+        return self.slots[idx] if idx is not None else None
+
+    def indices_at(self, timestamps: Sequence[float]) -> list[int | None]:
+        """Return the index of the slot covering each of many timestamps.
+
+        The timestamps are visited in sorted order and merged with the slots
+        in a single forward pass, so a batch of m lookups costs
+        O(m log m + n) rather than m separate bisects.
+        """
+        slots = self.slots
+        indices: list[int | None] = [None] * len(timestamps)
+        idx = 0
+        for position in sorted(range(len(timestamps)), key=timestamps.__getitem__):
+            timestamp = timestamps[position]
+            while idx < len(slots) and slots[idx].end <= timestamp:
+                idx += 1
+            if idx < len(slots) and slots[idx].start <= timestamp:
+                indices[position] = idx
+        return indices
+
+    def next_after(self, timestamp: float) -> PriceSlot | None:
+        """Return the first slot starting after a timestamp."""
+        idx = bisect_right(self._starts, timestamp)
+        return self.slots[idx] if idx < len(self.slots) else None
+
+    def cost_between(
+        self,
+        start: float,
+        end: float,
+        rate: float,
+        hint: int | None = None,
+    ) -> tuple[float, float, int | None]:
+        """Price a constant consumption rate over ``[start, end)``.
+
+        Returns the cost, the number of seconds not covered by a priced slot
+        and the index of the slot holding ``end`` for use as the next hint.
+        The work done is proportional to the number of slots spanned.
+        """
+        slots = self.slots
+        idx = self.index_at(start, hint)
+        if idx is None:
+            idx = bisect_right(self._starts, start)
+        cost = 0.0
+        covered = 0.0
+        last_idx: int | None = None
+        while idx < len(slots) and slots[idx].start < end:
+            slot = slots[idx]
+            overlap = min(end, slot.end) - max(start, slot.start)
+            if overlap > 0 and slot.price is not None:
+                cost += rate * overlap * slot.price
+                covered += overlap
+            last_idx = idx
+            idx += 1
+        return cost, max(end - start - covered, 0.0), last_idx
+
+
+def _record_dst_days(
+    slots: list[PriceSlot], time_zone: tzinfo, report: TimelineReport
+) -> None:
+    """Record the local days covered by the timeline that are not 24 hours."""
+    if not slots:
+        return
+    day = dt_util.utc_from_timestamp(slots[0].start).astimezone(time_zone).date()
+    last = dt_util.utc_from_timestamp(slots[-1].end - 1).astimezone(time_zone).date()
+    while day <= last:
+        day_start = _day_start(day, time_zone)
+        day_end = _day_start(day + timedelta(days=1), time_zone)
+        hours = (day_end - day_start) / 3600
+        if hours != 24:
+            report.dst_days.append({"date": day.isoformat(), "hours": hours})
+        day += timedelta(days=1)
+
+
+def _day_start(day: date, time_zone: tzinfo) -> float:
+    """Return the UTC epoch of local midnight."""
+    return datetime(day.year, day.month, day.day, tzinfo=time_zone).timestamp()
+
+
+def build_timeline(
+    tariffs: list[dict[str, Any]], time_zone: tzinfo | None = None
+) -> PriceTimeline:
+    """Validate raw tariffs and build a timeline in linear time.
+
+    All bounds are normalised to UTC epochs. Naive times are read as wall
+    clock times in ``time_zone``, resolving the repeated hour on the day
+    clocks go back by payload order. Duplicates are dropped, overlaps are
+    clipped and gaps are flagged; every finding ends up in the report.
+    """
+    time_zone = time_zone or dt_util.get_default_time_zone()
+    report = TimelineReport()
+
+    # Resolve starts in payload order so repeated wall times map to the
+    # second occurrence once the first has been seen.
+    parsed: list[tuple[dict[str, Any], float, datetime | None]] = []
+    previous_start: float | None = None
+    for tariff in tariffs:
+        raw_start = tariff.get("startDateTime")
+        start, naive_start = _resolve(raw_start, time_zone, previous_start)
+        if start is None:
+            report.add("invalid_start", raw_start, "unparseable or nonexistent time")
+            continue
+        parsed.append((tariff, start, naive_start))
+        previous_start = start
+
+    slots: list[PriceSlot] = []
+    for idx, (tariff, start, naive_start) in enumerate(parsed):
+        raw_end = tariff.get("endDateTime")
+        end, naive_end = _resolve(raw_end, time_zone, start)
+        # A wall-clock end that names the next slot's start (or a clock that
+        # runs backwards into it) ends this slot where the next one begins.
+        if idx + 1 < len(parsed) and naive_start is not None:
+            _, next_start, next_naive = parsed[idx + 1]
+            if (
+                next_naive is not None
+                and next_start > start
+                and (next_naive == naive_end or next_naive <= naive_start)
+            ):
+                end = next_start
+        if end is None or end <= start:
+            report.add("invalid_end", raw_end, "end missing or not after start")
+            continue
+        total = tariff.get("totalAmount")
+        if total is None:
+            report.add("missing_price", tariff.get("startDateTime"), "no totalAmount")
+        slots.append(
+            PriceSlot(
+                start=start,
+                end=end,
+                price=float(total) if total is not None else None,
+                tariff=tariff,
+            )
+        )
+
+    if any(slots[i].start < slots[i - 1].start for i in range(1, len(slots))):
+        report.add("out_of_order", None, "slots were not sorted by start time")
+        slots.sort(key=lambda slot: slot.start)
+
+    validated: list[PriceSlot] = []
+    for slot in slots:
+        if validated:
+            previous = validated[-1]
+            label = slot.tariff.get("startDateTime")
+            if slot.start == previous.start and slot.end == previous.end:
+                report.add("duplicate", label, "identical slot dropped")
+                continue
+            if slot.start < previous.end:
+                if slot.end <= previous.end:
+                    report.add("overlap", label, "slot inside previous slot dropped")
+                    continue
+                report.add(
+                    "overlap",
+                    label,
+                    f"start clipped by {previous.end - slot.start:.0f}s",
+                )
+                slot = PriceSlot(previous.end, slot.end, slot.price, slot.tariff)
+            elif slot.start > previous.end:
+                report.add("gap", label, f"{slot.start - previous.end:.0f}s uncovered")
+        validated.append(slot)
+
+    report.slot_count = len(validated)
+    _record_dst_days(validated, time_zone, report)
+    return PriceTimeline(validated, report)
+
+
+def resample(
+    timeline: PriceTimeline, resolution: str, time_zone: tzinfo | None = None
+) -> PriceTimeline:
+    """Return a view of the timeline at a fixed resolution.
+
+    Each bucket holds the time-weighted average price of the slots covering
+    it, so slots longer than a bucket are repeated and shorter ones averaged.
+    Daily buckets follow local midnight and last 23 or 25 hours on DST days.
+    Buckets not covered by any priced slot are left out.
+    """
+    time_zone = time_zone or dt_util.get_default_time_zone()
+    step = RESOLUTION_SECONDS.get(resolution)
+    if step is None and resolution != RESOLUTION_DAY:
+        raise ValueError(f"Unknown resolution {resolution}")
+
+    def bucket(timestamp: float) -> tuple[float, float]:
+        if step is not None:
+            start = timestamp - timestamp % step
+            return start, start + step
+        day = dt_util.utc_from_timestamp(timestamp).astimezone(time_zone).date()
+        return _day_start(day, time_zone), _day_start(day + timedelta(days=1), time_zone)
+
+    # Slots are sorted, so buckets are filled in order: bucket start ->
+    # [bucket end, price seconds, covered seconds]
+    buckets: dict[float, list[float]] = {}
+    for slot in timeline.slots:
+        if slot.price is None:
+            continue
+        current = slot.start
+        while current < slot.end:
+            bucket_start, bucket_end = bucket(current)
+            until = min(slot.end, bucket_end)
+            totals = buckets.setdefault(bucket_start, [bucket_end, 0.0, 0.0])
+            totals[1] += slot.price * (until - current)
+            totals[2] += until - current
+            current = until
+
+    return PriceTimeline(
+        [
+            PriceSlot(start, end, weighted / covered, {})
+            for start, (end, weighted, covered) in buckets.items()
+        ]
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class SlotRanking:
+    """Rank, percentile and level of every slot, aligned with the timeline.
+
+    Slots are ranked against the other slots of their local day: rank 0 is the
+    cheapest, percentile 0 the cheapest and 100 the most expensive.
+    """
+
+    ranks: list[int | None]
+    percentiles: list[float | None]
+    levels: list[str | None]
+
+
+def classify_percentile(
+    percentile: float, thresholds: tuple[float, float, float, float]
+) -> str:
+    """Classify a percentile using very cheap/cheap/expensive/very expensive bounds."""
+    very_cheap, cheap, expensive, very_expensive = thresholds
+    if percentile <= very_cheap:
+        return PRICE_LEVEL_VERY_CHEAP
+    if percentile <= cheap:
+        return PRICE_LEVEL_CHEAP
+    if percentile >= very_expensive:
+        return PRICE_LEVEL_VERY_EXPENSIVE
+    if percentile >= expensive:
+        return PRICE_LEVEL_EXPENSIVE
+    return PRICE_LEVEL_NORMAL
+
+
+def rank_slots(
+    timeline: PriceTimeline,
+    thresholds: tuple[float, float, float, float],
+    time_zone: tzinfo | None = None,
+) -> SlotRanking:
+    """Rank every priced slot within its local day."""
+    time_zone = time_zone or dt_util.get_default_time_zone()
+    days: dict[date, list[tuple[int, float]]] = {}
+    for idx, slot in enumerate(timeline.slots):
+        if slot.price is not None:
+            day = dt_util.utc_from_timestamp(slot.start).astimezone(time_zone).date()
+            days.setdefault(day, []).append((idx, slot.price))
+
+    size = len(timeline.slots)
+    ranks: list[int | None] = [None] * size
+    percentiles: list[float | None] = [None] * size
+    levels: list[str | None] = [None] * size
+    for priced in days.values():
+        prices = sorted(price for _, price in priced)
+        for idx, price in priced:
+            # Equal prices share the rank of the first of them
+            rank = bisect_left(prices, price)
+            percentile = 100 * rank / (len(prices) - 1) if len(prices) > 1 else 50.0
+            ranks[idx] = rank
+            percentiles[idx] = percentile
+            levels[idx] = classify_percentile(percentile, thresholds)
+    return SlotRanking(ranks, percentiles, levels)
+
+
+def cheapest_windows(
+    timeline: PriceTimeline,
+    count: int,
+    time_zone: tzinfo | None = None,
+    horizon: tuple[float, float] | None = None,
+) -> list[tuple[float, float]]:
+    """Return the merged ``(start, end)`` windows of the cheapest slots.
+
+    Without a horizon the ``count`` cheapest slots of every local day are
+    selected; with one, the ``count`` cheapest slots overlapping it. Equal
+    prices favour the earlier slot.
+    """
+    groups: dict[Any, list[PriceSlot]] = {}
+    if horizon is None:
+        time_zone = time_zone or dt_util.get_default_time_zone()
+        for slot in timeline.slots:
+            if slot.price is not None:
+                local = dt_util.utc_from_timestamp(slot.start).astimezone(time_zone)
+                groups.setdefault(local.date(), []).append(slot)
+    else:
+        groups[horizon] = [
+            slot
+            for slot in timeline.slots
+            if slot.price is not None
+            and slot.end > horizon[0]
+            and slot.start < horizon[1]
+        ]
+
+    selected = sorted(
+        slot.start
+        for slots in groups.values()
+        for slot in heapq.nsmallest(
+            count, slots, key=lambda slot: (slot.price, slot.start)
+        )
+    )
+    ends = {slot.start: slot.end for slot in timeline.slots}
+    windows: list[tuple[float, float]] = []
+    for start in selected:
+        if windows and windows[-1][1] == start:
+            windows[-1] = (windows[-1][0], ends[start])
+        else:
+            windows.append((start, ends[start]))
+    return windows
@@ -0,0 +1,287 @@
+"""Automation triggers for the Essent integration.
+
+The firing times of a trigger are looked up once per new data, from lists
+the coordinator derives from its timeline and shares between triggers with
+the same options. Each trigger then waits on a single point-in-time timer,
+so attached automations cost nothing between firings.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_PLATFORM, CONF_TYPE
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_ENERGY_TYPE,
+    DEFAULT_CHEAPEST_SLOTS,
+    DOMAIN,
+    ENERGY_TYPE_ELECTRICITY,
+    ENERGY_TYPE_GAS,
+    PRICE_LEVELS,
+    SIGNAL_DATA_PROCESSED,
+)
+from .coordinator import EssentDataUpdateCoordinator
+
+TRIGGER_PRICE_BELOW = "price_below"
+TRIGGER_PRICE_LEVEL_CHANGED = "price_level_changed"
+TRIGGER_TOMORROW_PUBLISHED = "tomorrow_published"
+TRIGGER_CHEAPEST_WINDOW_STARTING = "cheapest_window_starting"
+
+CONF_PRICE = "price"
+CONF_TO = "to"
+CONF_SLOTS = "slots"
+
+_BASE_SCHEMA = cv.TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_PLATFORM): DOMAIN,
+        vol.Required(CONF_TYPE): str,
+        vol.Optional(ATTR_ENERGY_TYPE, default=ENERGY_TYPE_ELECTRICITY): vol.In(
+            [ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS]
+        ),
+    }
+)
+
+TRIGGER_SCHEMA = vol.All(
+    cv.key_value_schemas(
+        CONF_TYPE,
+        {
+            TRIGGER_PRICE_BELOW: _BASE_SCHEMA.extend(
+                {vol.Required(CONF_PRICE): vol.Coerce(float)}
+            ),
+            TRIGGER_PRICE_LEVEL_CHANGED: _BASE_SCHEMA.extend(
+                {
+                    vol.Optional(CONF_TO): vol.All(
+                        cv.ensure_list, vol.Length(min=1), [vol.In(PRICE_LEVELS)]
+                    )
+                }
+            ),
+            TRIGGER_TOMORROW_PUBLISHED: _BASE_SCHEMA,
+            TRIGGER_CHEAPEST_WINDOW_STARTING: _BASE_SCHEMA.extend(
+                {
+                    vol.Optional(CONF_SLOTS, default=DEFAULT_CHEAPEST_SLOTS): vol.All(
+                        vol.Coerce(int), vol.Range(min=1, max=96)
+                    )
+                }
+            ),
+        },
+    )
+)
+
+
+def _loaded_coordinator(hass: HomeAssistant) -> EssentDataUpdateCoordinator | None:
+    """Return the coordinator of the loaded config entry, if any."""
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if entry.state is ConfigEntryState.LOADED:
+            return entry.runtime_data
+    return None
+
+
+def _isoformat(timestamp: float) -> str:
+    """Format a UTC epoch as a local ISO timestamp."""
+    return dt_util.as_local(dt_util.utc_from_timestamp(timestamp)).isoformat()
+
+
+class EssentTrigger:
+    """An Essent trigger, re-planned each time the coordinator has new data."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config: ConfigType,
+        action: TriggerActionType,
+        trigger_info: TriggerInfo,
+    ) -> None:
+        """Initialize the trigger."""
+        self._hass = hass
+        self._type: str = config[CONF_TYPE]
+        self._energy_type: str = config[ATTR_ENERGY_TYPE]
+        self._config = config
+        self._job = HassJob(action, f"{DOMAIN} trigger {trigger_info}")
+        self._trigger_data = trigger_info["trigger_data"]
+        self._coordinator: EssentDataUpdateCoordinator | None = None
+        self._times: list[float] = []
+        self._next: float | None = None
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._unsub_signal: CALLBACK_TYPE | None = None
+        # Start of the first published slot of tomorrow; unknown until the
+        # first data is seen, which never fires
+        self._tomorrow_key: str | None = None
+        self._tomorrow_seen = False
+
+    @callback
+    def async_attach(self) -> CALLBACK_TYPE:
+        """Start following the coordinator's data."""
+        self._unsub_signal = async_dispatcher_connect(
+            self._hass, SIGNAL_DATA_PROCESSED, self._async_data_processed
+        )
+        if (coordinator := _loaded_coordinator(self._hass)) is not None:
+            self._async_data_processed(coordinator)
+        return self._async_detach
+
+    @callback
+    def _async_detach(self) -> None:
+        """Stop the timer and the data subscription."""
+        if self._unsub_signal:
+            self._unsub_signal()
+            self._unsub_signal = None
+        self._async_cancel_timer()
+
+    @callback
+    def _async_cancel_timer(self) -> None:
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._next = None
+
+    @callback
+    def _async_data_processed(
+        self, coordinator: EssentDataUpdateCoordinator | None
+    ) -> None:
+        """Look up the firing times in the new data."""
+        self._coordinator = coordinator
+        if coordinator is None or not coordinator.data:
+            self._times = []
+            self._async_cancel_timer()
+            return
+        if self._type == TRIGGER_TOMORROW_PUBLISHED:
+            self._async_check_tomorrow(coordinator)
+            return
+        self._times = self._firing_times(coordinator)
+        self._async_schedule()
+
+    def _firing_times(self, coordinator: EssentDataUpdateCoordinator) -> list[float]:
+        """Return every firing time, sorted, from the coordinator's shared lists."""
+        energy_type = self._energy_type
+        if self._type == TRIGGER_PRICE_BELOW:
+            return coordinator.price_below_starts(energy_type, self._config[CONF_PRICE])
+        if self._type == TRIGGER_PRICE_LEVEL_CHANGED:
+            levels = self._config.get(CONF_TO)
+            return coordinator.level_changes(
+                energy_type, frozenset(levels) if levels else None
+            )
+        return [
+            start
+            for start, _ in coordinator.cheapest_windows(
+                energy_type, self._config[CONF_SLOTS]
+            )
+        ]
+
+    @callback
+    def _async_schedule(self) -> None:
+        """Set the timer for the first firing time after now."""
+        idx = bisect_right(self._times, dt_util.utcnow().timestamp())
+        if idx == len(self._times):
+            self._async_cancel_timer()
+            return
+        if self._times[idx] == self._next:
+            return
+        self._async_cancel_timer()
+        self._next = self._times[idx]
+        self._unsub_timer = async_track_point_in_utc_time(
+            self._hass, self._async_fire, dt_util.utc_from_timestamp(self._next)
+        )
+
+    @callback
+    def _async_fire(self, _: datetime) -> None:
+        """Run the action for the time that was reached, then plan the next."""
+        when, self._unsub_timer, self._next = self._next, None, None
+        if when is not None and self._coordinator is not None:
+            self._async_run(self._variables(self._coordinator, when))
+        self._async_schedule()
+
+    def _variables(
+        self, coordinator: EssentDataUpdateCoordinator, when: float
+    ) -> dict[str, Any]:
+        """Return the trigger variables of a firing time."""
+        timeline = coordinator.timeline(self._energy_type)
+        idx = timeline.index_at(when)
+        slot = timeline.slots[idx] if idx is not None else None
+        variables: dict[str, Any] = {
+            "start": _isoformat(when),
+            "end": _isoformat(slot.end) if slot else None,
+            "price": slot.price if slot else None,
+        }
+        if self._type == TRIGGER_PRICE_BELOW:
+            variables["threshold"] = self._config[CONF_PRICE]
+        elif self._type == TRIGGER_PRICE_LEVEL_CHANGED:
+            levels = coordinator.ranking(self._energy_type).levels
+            variables["to_level"] = levels[idx] if idx is not None else None
+            previous = timeline.index_at(when - 1)
+            variables["from_level"] = levels[previous] if previous is not None else None
+        else:
+            variables["slots"] = self._config[CONF_SLOTS]
+            variables["end"] = next(
+                (
+                    _isoformat(end)
+                    for start, end in coordinator.cheapest_windows(
+                        self._energy_type, self._config[CONF_SLOTS]
+                    )
+                    if start == when
+                ),
+                variables["end"],
+            )
+        return variables
+
+    @callback
+    def _async_check_tomorrow(self, coordinator: EssentDataUpdateCoordinator) -> None:
+        """Fire when tomorrow's prices appear in the data."""
+        block = coordinator.data.get(self._energy_type) if coordinator.data else None
+        tomorrow = block.get("tariffs_tomorrow") if block else None
+        key = tomorrow[0].get("startDateTime") if tomorrow else None
+        first, self._tomorrow_seen = not self._tomorrow_seen, True
+        if key == self._tomorrow_key:
+            return
+        self._tomorrow_key = key
+        if first or key is None or block is None:
+            return
+        aggregates = block.get("tomorrow") or {}
+        self._async_run(
+            {
+                "min_price": aggregates.get("min_price"),
+                "avg_price": aggregates.get("avg_price"),
+                "max_price": aggregates.get("max_price"),
+                "cheapest_start": aggregates.get("cheapest_start"),
+                "cheapest_end": aggregates.get("cheapest_end"),
+            }
+        )
+
+    @callback
+    def _async_run(self, variables: dict[str, Any]) -> None:
+        """Run the automation action with the trigger variables."""
+        self._hass.async_run_hass_job(
+            self._job,
+            {
+                "trigger": {
+                    **self._trigger_data,
+                    CONF_PLATFORM: DOMAIN,
+                    CONF_TYPE: self._type,
+                    ATTR_ENERGY_TYPE: self._energy_type,
+                    "description": f"Essent {self._type.replace('_', ' ')}",
+                    **variables,
+                }
+            },
+        )
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> Callable[[], None]:
+    """Attach an Essent trigger."""
+    return EssentTrigger(hass, config, action, trigger_info).async_attach()
@@ -1,8 +1,20 @@
 """Test fixtures for Essent integration."""
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
 import json
 from pathlib import Path
+from typing import Any
 
+from freezegun.api import FrozenDateTimeFactory
 import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.essent.const import API_ENDPOINT, DOMAIN
 
 pytest_plugins = ("pytest_homeassistant_custom_component", "pytest_asyncio")
 pytestmark = pytest.mark.asyncio
@@ -14,6 +26,38 @@ def _load_fixture(name: str) -> dict:
         return json.load(f)
 
 
+def _day_document(
+    day: date, prices: dict[int, float] | None = None, default: float = 0.3
+) -> dict:
+    """Generate the document of a day with hourly electricity prices.
+
+    Each hour costs its price in ``prices``, or ``default``; gas has a single
+    slot from 06:00 at 1.2.
+    """
+    prices = prices or {}
+    next_day = day + timedelta(days=1)
+    tariffs = [
+        {
+            "startDateTime": f"{day}T{hour:02}:00:00",
+            "endDateTime": f"{day}T{hour + 1:02}:00:00"
+            if hour < 23
+            else f"{next_day}T00:00:00",
+            "totalAmount": prices.get(hour, default),
+        }
+        for hour in range(24)
+    ]
+    gas = {
+        "startDateTime": f"{day}T06:00:00",
+        "endDateTime": f"{next_day}T06:00:00",
+        "totalAmount": 1.2,
+    }
+    return {
+        "date": day.isoformat(),
+        "electricity": {"unitOfMeasurement": "kWh", "tariffs": tariffs},
+        "gas": {"unitOfMeasurement": "m³", "tariffs": [gas]},
+    }
+
+
 @pytest.fixture
 def electricity_api_response() -> dict:
     """Load sample electricity API response."""
@@ -30,3 +74,42 @@ def gas_api_response() -> dict:
 def essent_api_response(electricity_api_response, gas_api_response) -> dict:
     """Combined response helper for full integration tests."""
     return _load_fixture("essent_api_response.json")
+
+
+@pytest.fixture
+def day_document() -> Callable[..., dict]:
+    """Return a factory of generated day documents."""
+    return _day_document
+
+
+@pytest.fixture
+def setup_entry(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    aioclient_mock: AiohttpClientMocker,
+    enable_custom_integrations: None,
+) -> Callable[..., Awaitable[MockConfigEntry]]:
+    """Return a function setting up the integration against a stubbed API."""
+
+    async def _setup_entry(
+        at: datetime, response: dict | Callable[..., Any], options: dict | None = None
+    ) -> MockConfigEntry:
+        """Set up the integration at a local Amsterdam time.
+
+        Fetches are answered with ``response``, a payload or a handler.
+        """
+        await hass.config.async_set_time_zone("Europe/Amsterdam")
+        freezer.move_to(dt_util.as_local(at))
+        if callable(response):
+            aioclient_mock.get(API_ENDPOINT, side_effect=response)
+        else:
+            aioclient_mock.get(API_ENDPOINT, json=response)
+        entry = MockConfigEntry(
+            domain=DOMAIN, title="Essent", data={}, options=options or {}
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        return entry
+
+    return _setup_entry
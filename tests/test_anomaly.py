@@ -0,0 +1,237 @@
+"""Test the Essent price anomaly detection."""
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.essent.anomaly import (
+    ANOMALY_HIGH,
+    ANOMALY_LOW,
+    BASELINE_DAYS,
+    MIN_BASELINE_DAYS,
+    EssentAnomalyDetector,
+)
+from custom_components.essent.const import DOMAIN, SERVICE_GET_ANOMALIES
+from custom_components.essent.history import STORAGE_KEY as HISTORY_STORAGE_KEY
+from custom_components.essent.history import EssentPriceHistory
+from custom_components.essent.timeline import PriceTimeline, build_timeline
+
+TODAY = date(2025, 11, 16)
+# Today's evening spike and negative afternoon
+SPIKES = {18: 0.95, 14: -0.05}
+
+
+def _hour_price(day: date, hour: int) -> float:
+    """Return a normal price: higher in the evening, with a little noise."""
+    evening = 0.08 if 17 <= hour <= 20 else 0.0
+    return round(0.2 + evening + (day.toordinal() * 7 + hour) % 5 / 1000, 4)
+
+
+def _history_slots(day: date) -> list[list[float]]:
+    """Generate the retained hourly slots of a day."""
+    start = dt_util.as_utc(dt_util.start_of_local_day(day)).timestamp()
+    return [
+        [start + hour * 3600, start + (hour + 1) * 3600, _hour_price(day, hour)]
+        for hour in range(24)
+    ]
+
+
+def _prices(day: date, overrides: dict[int, float]) -> dict[int, float]:
+    """Return the hourly prices of a day, with some prices overridden."""
+    return {hour: _hour_price(day, hour) for hour in range(24)} | overrides
+
+
+def _timeline(
+    day_document: Callable[..., dict], overrides: dict[int, float]
+) -> PriceTimeline:
+    """Build today's electricity timeline, with some prices overridden."""
+    document = day_document(TODAY, _prices(TODAY, overrides))
+    return build_timeline(document["electricity"]["tariffs"])
+
+
+def _history(hass: HomeAssistant, days: int) -> EssentPriceHistory:
+    """Create a history holding the days before today."""
+    history = EssentPriceHistory(hass)
+    for offset in range(days, 0, -1):
+        day = TODAY - timedelta(days=offset)
+        history.async_record_days(
+            "electricity",
+            {day.isoformat(): [tuple(slot) for slot in _history_slots(day)]},
+        )
+    return history
+
+
+async def test_scores_spikes_and_dips(
+    hass: HomeAssistant, day_document: Callable[..., dict]
+) -> None:
+    """Test abnormal slots are flagged against their hour's baseline."""
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    detector = EssentAnomalyDetector()
+    timeline = _timeline(day_document, SPIKES)
+
+    report = detector.async_score(
+        _history(hass, 14), "electricity", timeline.slots, TODAY
+    )
+
+    assert report.scored == 24
+    assert report.unscored == 0
+    hours = [
+        dt_util.as_local(dt_util.utc_from_timestamp(anomaly.start)).hour
+        for anomaly in report.anomalies
+    ]
+    assert hours == [14, 18]
+    assert [anomaly.direction for anomaly in report.anomalies] == [
+        ANOMALY_LOW,
+        ANOMALY_HIGH,
+    ]
+    low, high = report.anomalies
+    assert 0.28 <= high.median <= 0.285
+    assert high.price == 0.95
+    assert report.max_score == high.score
+    assert low.score < 0
+    assert detector.reports["electricity"] is report
+    assert detector.baseline_days("electricity") == 14
+
+
+async def test_short_history_is_not_scored(
+    hass: HomeAssistant, day_document: Callable[..., dict]
+) -> None:
+    """Test hours are only scored once their baseline covers enough days."""
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    detector = EssentAnomalyDetector()
+    timeline = _timeline(day_document, SPIKES)
+
+    report = detector.async_score(
+        _history(hass, MIN_BASELINE_DAYS - 1), "electricity", timeline.slots, TODAY
+    )
+
+    assert report.scored == 0
+    assert report.unscored == 24
+    assert report.anomalies == ()
+    assert report.max_score is None
+
+
+async def test_incremental_matches_rebuild(
+    hass: HomeAssistant, day_document: Callable[..., dict]
+) -> None:
+    """Test daily pushes give the baselines a rebuild from history gives."""
+    # Without DST transitions every day covers each hour exactly once
+    await hass.config.async_set_time_zone("UTC")
+    history = _history(hass, 60)
+    timeline = _timeline(day_document, {})
+    incremental = EssentAnomalyDetector()
+    for offset in range(40, -1, -1):
+        incremental.async_score(
+            history, "electricity", timeline.slots, TODAY - timedelta(days=offset)
+        )
+
+    rebuilt = EssentAnomalyDetector()
+    rebuilt.async_score(history, "electricity", timeline.slots, TODAY)
+
+    assert (
+        incremental._windows["electricity"].baselines
+        == rebuilt._windows["electricity"].baselines
+    )
+    assert incremental.reports["electricity"] == rebuilt.reports["electricity"]
+    assert incremental.reports["electricity"].anomalies == ()
+
+
+async def test_backfill_after_scoring(
+    hass: HomeAssistant, day_document: Callable[..., dict]
+) -> None:
+    """Test days recorded after the first scoring rebuild the baselines."""
+    await hass.config.async_set_time_zone("UTC")
+    missing = [TODAY - timedelta(days=offset) for offset in range(3, 10)]
+    history = EssentPriceHistory(hass)
+    for offset in range(40, 0, -1):
+        if (day := TODAY - timedelta(days=offset)) not in missing:
+            history.async_record_days(
+                "electricity",
+                {day.isoformat(): [tuple(slot) for slot in _history_slots(day)]},
+            )
+    detector = EssentAnomalyDetector()
+    history.async_add_listener(detector.async_history_changed)
+    timeline = _timeline(day_document, SPIKES)
+
+    # The baselines cover the calendar window, not the last 28 retained days
+    detector.async_score(history, "electricity", timeline.slots, TODAY)
+    assert detector.baseline_days("electricity") == BASELINE_DAYS - 7
+
+    history.async_record_days(
+        "electricity",
+        {
+            day.isoformat(): [tuple(slot) for slot in _history_slots(day)]
+            for day in missing
+        },
+    )
+    report = detector.async_score(history, "electricity", timeline.slots, TODAY)
+
+    rebuilt = EssentAnomalyDetector()
+    assert rebuilt.async_score(history, "electricity", timeline.slots, TODAY) == report
+    assert detector.baseline_days("electricity") == BASELINE_DAYS
+    assert (
+        detector._windows["electricity"].baselines
+        == rebuilt._windows["electricity"].baselines
+    )
+
+
+async def test_sensor_and_service(
+    hass: HomeAssistant,
+    hass_storage: dict,
+    setup_entry: Callable[..., Awaitable[MockConfigEntry]],
+    day_document: Callable[..., dict],
+) -> None:
+    """Test new prices are scored once and exposed by the sensor and action."""
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    hass_storage[HISTORY_STORAGE_KEY] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": HISTORY_STORAGE_KEY,
+        "data": {
+            "electricity": {
+                (TODAY - timedelta(days=offset)).isoformat(): _history_slots(
+                    TODAY - timedelta(days=offset)
+                )
+                for offset in range(1, 15)
+            }
+        },
+    }
+    await setup_entry(
+        datetime(2025, 11, 16, 16, 30),
+        {"prices": [day_document(TODAY, _prices(TODAY, SPIKES))]},
+    )
+
+    # The afternoon dip has ended, so only the evening spike is upcoming
+    state = hass.states.get("sensor.essent_electricity_price_anomalies")
+    assert state.state == "1"
+    [anomaly] = state.attributes["anomalies"]
+    assert anomaly["start"] == "2025-11-16T18:00:00+01:00"
+    assert anomaly["direction"] == ANOMALY_HIGH
+    # Gas has no retained history to score against
+    assert hass.states.get("sensor.essent_gas_price_anomalies").state == "unknown"
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_ANOMALIES, {}, blocking=True, return_response=True
+    )
+    assert response["energy_type"] == "electricity"
+    assert response["baseline_days"] == 14
+    assert response["scored_slots"] == 24
+    assert [item["start"] for item in response["anomalies"]] == [
+        "2025-11-16T14:00:00+01:00",
+        "2025-11-16T18:00:00+01:00",
+    ]
+    assert response["anomalies"][0]["price"] == -0.05
+    assert response["anomalies"][1]["baseline"] == anomaly["baseline"]
+    assert response["max_score"] == anomaly["score"]
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_ANOMALIES,
+        {"energy_type": "gas"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["scored_slots"] == 0
+    assert response["anomalies"] == []
@@ -0,0 +1,198 @@
+"""Test the Essent historical price backfill."""
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+from unittest.mock import patch
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMockResponse,
+)
+
+from custom_components.essent.backfill import (
+    BACKFILL_CONCURRENCY,
+    NOTIFICATION_ID,
+    STORAGE_KEY,
+)
+from custom_components.essent.const import DOMAIN, SERVICE_BACKFILL
+from custom_components.essent.history import STORAGE_KEY as HISTORY_STORAGE_KEY
+
+NOON = datetime(2025, 11, 16, 12)
+# Hourly electricity prices of every generated day
+PRICES = {hour: 0.2 + hour / 100 for hour in range(24)}
+
+
+class StubServer:
+    """Answer dynamic price requests with generated per-date documents."""
+
+    def __init__(
+        self,
+        current: dict,
+        day_document: Callable[..., dict],
+        failing: set[date] | None = None,
+        ignored: set[date] | None = None,
+    ) -> None:
+        """Initialize the stub."""
+        self.current = current
+        self.day_document = day_document
+        self.failing = failing or set()
+        # Days for which the date parameter is ignored
+        self.ignored = ignored or set()
+        self.requested: list[date] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, method, url, data) -> AiohttpClientMockResponse:
+        """Return the document of the requested date."""
+        if "date" not in url.query:
+            return AiohttpClientMockResponse(method, url, json=self.current)
+        day = date.fromisoformat(url.query["date"])
+        self.requested.append(day)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        if day in self.failing:
+            return AiohttpClientMockResponse(
+                method, url, status=HTTPStatus.INTERNAL_SERVER_ERROR
+            )
+        if day in self.ignored:
+            return AiohttpClientMockResponse(method, url, json=self.current)
+        return AiohttpClientMockResponse(
+            method, url, json={"prices": [self.day_document(day, PRICES)]}
+        )
+
+
+@pytest.fixture(autouse=True)
+def _no_rate_limit():
+    """Do not pause between requests."""
+    with patch("custom_components.essent.backfill.BACKFILL_REQUEST_INTERVAL", 0):
+        yield
+
+
+async def test_backfill(
+    hass: HomeAssistant,
+    hass_storage: dict,
+    setup_entry: Callable[..., Awaitable[MockConfigEntry]],
+    day_document: Callable[..., dict],
+    essent_api_response: dict,
+) -> None:
+    """Test past days are fetched with bounded concurrency and recorded."""
+    stub = StubServer(
+        essent_api_response,
+        day_document,
+        failing={date(2025, 11, 3)},
+        ignored={date(2025, 10, 15)},
+    )
+    entry = await setup_entry(NOON, stub)
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BACKFILL,
+        {"start_date": "2025-10-01", "end_date": "2025-11-10"},
+        blocking=True,
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    backfill = entry.runtime_data.backfill
+    history = entry.runtime_data.history
+    assert backfill.progress.as_dict() | {"days_per_second": 0} == {
+        "start": "2025-10-01",
+        "end": "2025-11-10",
+        "total": 41,
+        "skipped": 0,
+        "fetched": 39,
+        "failed": ["2025-11-03"],
+        "mismatched": ["2025-10-15"],
+        "days_per_second": 0,
+        "finished": True,
+    }
+    assert 1 < stub.max_in_flight <= BACKFILL_CONCURRENCY
+    days = history.days("electricity", date(2025, 10, 1), date(2025, 11, 10))
+    assert len(days) == 39
+    assert len(days[0][1]) == 24
+    assert len(history.days("gas", date(2025, 10, 1), date(2025, 11, 10))) == 39
+    notification = hass.data["persistent_notification"][NOTIFICATION_ID]
+    assert "Backfilled 39 days" in notification["message"]
+    assert "1 days could not be fetched" in notification["message"]
+    assert "1 days were answered with the prices of other dates" in (
+        notification["message"]
+    )
+    assert STORAGE_KEY not in hass_storage
+
+    # Running it again only fetches the days that were not recorded
+    stub.requested.clear()
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_BACKFILL,
+        {"start_date": "2025-10-01", "end_date": "2025-11-10"},
+        blocking=True,
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert stub.requested == [date(2025, 10, 15), date(2025, 11, 3)]
+    assert backfill.progress.skipped == 39
+
+
+async def test_backfill_resumes_after_restart(
+    hass: HomeAssistant,
+    hass_storage: dict,
+    setup_entry: Callable[..., Awaitable[MockConfigEntry]],
+    day_document: Callable[..., dict],
+    essent_api_response: dict,
+) -> None:
+    """Test an interrupted backfill continues with the days still missing."""
+    retained = {
+        (date(2025, 11, 1) + timedelta(days=offset)).isoformat(): [[0.0, 1.0, 0.2]]
+        for offset in range(3)
+    }
+    hass_storage[HISTORY_STORAGE_KEY] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": HISTORY_STORAGE_KEY,
+        "data": {"electricity": retained, "gas": retained},
+    }
+    hass_storage[STORAGE_KEY] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {"start": "2025-11-01", "end": "2025-11-05"},
+    }
+    stub = StubServer(essent_api_response, day_document)
+
+    await setup_entry(NOON, stub)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert sorted(stub.requested) == [date(2025, 11, 4), date(2025, 11, 5)]
+    assert STORAGE_KEY not in hass_storage
+
+
+@pytest.mark.parametrize(
+    ("start_date", "end_date"),
+    [
+        ("2025-11-10", "2025-11-01"),
+        ("2025-11-10", "2025-11-16"),
+        ("2024-01-01", "2024-01-31"),
+    ],
+)
+async def test_backfill_invalid_range(
+    hass: HomeAssistant,
+    setup_entry: Callable[..., Awaitable[MockConfigEntry]],
+    day_document: Callable[..., dict],
+    essent_api_response: dict,
+    start_date: str,
+    end_date: str,
+) -> None:
+    """Test ranges that are not in the retained past are rejected."""
+    await setup_entry(NOON, StubServer(essent_api_response, day_document))
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_BACKFILL,
+            {"start_date": start_date, "end_date": end_date},
+            blocking=True,
+        )
@@ -0,0 +1,200 @@
+"""Test the Essent binary sensors."""
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.essent.binary_sensor import BINARY_SENSORS, EssentBinarySensor
+from custom_components.essent.const import ENERGY_TYPE_ELECTRICITY
+from custom_components.essent.coordinator import EssentDataUpdateCoordinator
+from custom_components.essent.pipeline import build_energy_data
+
+
+def _binary_sensor(
+    hass: HomeAssistant, fixture: dict
+) -> tuple[EssentDataUpdateCoordinator, EssentBinarySensor]:
+    """Create a coordinator holding a fixture payload and its binary sensor."""
+    coordinator = EssentDataUpdateCoordinator(hass)
+    coordinator.data = {
+        ENERGY_TYPE_ELECTRICITY: build_energy_data(
+            fixture["prices"][0], ENERGY_TYPE_ELECTRICITY, fixture["prices"][1]
+        )
+    }
+    return coordinator, EssentBinarySensor(
+        coordinator, ENERGY_TYPE_ELECTRICITY, BINARY_SENSORS[0]
+    )
+
+
+async def test_tomorrow_available(
+    hass: HomeAssistant, electricity_api_response: dict
+) -> None:
+    """Test the sensor is on once tomorrow's prices are published."""
+    _, sensor = _binary_sensor(hass, electricity_api_response)
+
+    assert sensor.unique_id == "essent_electricity_tomorrow_available"
+    assert sensor.name == "Electricity tomorrow available"
+    assert sensor.is_on is True
+
+
+async def test_tomorrow_not_available(
+    hass: HomeAssistant, electricity_api_response: dict
+) -> None:
+    """Test the sensor is off before tomorrow's prices are published."""
+    electricity_api_response["prices"][1]["tariffs"] = []
+    _, sensor = _binary_sensor(hass, electricity_api_response)
+
+    assert sensor.is_on is False
+
+
+async def test_tomorrow_available_writes_once_per_publication(
+    hass: HomeAssistant, electricity_api_response: dict
+) -> None:
+    """Test listener ticks without new data do not write the state."""
+    coordinator, sensor = _binary_sensor(hass, electricity_api_response)
+
+    with patch.object(sensor, "async_write_ha_state") as write:
+        for _ in range(3):
+            sensor._handle_coordinator_update()
+        assert write.call_count == 1
+
+        # A new fetch with the same outcome does not write either
+        coordinator.data = dict(coordinator.data)
+        sensor._handle_coordinator_update()
+        assert write.call_count == 1
+
+
+DAY = date(2025, 11, 16)
+START = datetime(2025, 11, 16, 1, 30)
+# Four cheap hours and one a little cheaper than the others at 0.3
+PRICES = {3: 0.1, 4: 0.1, 14: 0.15, 20: 0.12, 21: 0.2}
+
+
+async def _move_to(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    hour: int,
+    minute: int = 0,
+    entity_id: str = "binary_sensor.essent_electricity_cheapest_2_slots",
+) -> str:
+    """Move to a local time on the test day and return the sensor state."""
+    moment = dt_util.as_local(datetime(2025, 11, 16, hour, minute))
+    freezer.move_to(moment)
+    async_fire_time_changed(hass, moment)
+    await hass.async_block_till_done()
+    return hass.states.get(entity_id).state
+
+
+ENTITY_ID = "binary_sensor.essent_electricity_cheapest_2_slots"
+FOUR_SLOTS_ID = "binary_sensor.essent_electricity_cheapest_4_slots"
+
+
+async def test_cheapest_slots_per_day(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    setup_entry: Callable[..., Awaitable[MockConfigEntry]],
+    day_document: Callable[..., dict],
+) -> None:
+    """Test each sensor is on during its number of cheapest hours of the day."""
+    await setup_entry(
+        START, {"prices": [day_document(DAY, PRICES)]}, {"cheapest_slots": ["4", "2"]}
+    )
+
+    state = hass.states.get(FOUR_SLOTS_ID)
+    assert state.name == "Essent Electricity cheapest 4 slots"
+    assert state.state == "off"
+    assert [
+        (window["start"].hour, window["end"].hour)
+        for window in state.attributes["windows"]
+    ] == [(3, 5), (14, 15), (20, 21)]
+    assert [
+        (window["start"].hour, window["end"].hour)
+        for window in hass.states.get(ENTITY_ID).attributes["windows"]
+    ] == [(3, 5)]
+
+    # The hourly listener tick in between does not write the state
+    reported = state.last_reported
+    assert await _move_to(hass, freezer, 2, entity_id=FOUR_SLOTS_ID) == "off"
+    assert hass.states.get(FOUR_SLOTS_ID).last_reported == reported
+
+    assert await _move_to(hass, freezer, 3, entity_id=FOUR_SLOTS_ID) == "on"
+    assert await _move_to(hass, freezer, 4, 30, entity_id=FOUR_SLOTS_ID) == "on"
+    assert await _move_to(hass, freezer, 5, entity_id=FOUR_SLOTS_ID) == "off"
+    assert await _move_to(hass, freezer, 14, entity_id=FOUR_SLOTS_ID) == "on"
+    assert hass.states.get(ENTITY_ID).state == "off"
+    assert await _move_to(hass, freezer, 15, entity_id=FOUR_SLOTS_ID) == "off"
+
+
+async def test_cheapest_slots_rolling_horizon(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    setup_entry: Callable[..., Awaitable[MockConfigEntry]],
+    day_document: Callable[..., dict],
+) -> None:
+    """Test the cheapest slots are picked within a rolling horizon."""
+    await setup_entry(
+        START,
+        {"prices": [day_document(DAY, PRICES)]},
+        {"cheapest_slots": ["2"], "cheapest_horizon": 12},
+    )
+
+    # The horizon runs from the 01:00 slot to 13:00
+    windows = hass.states.get(ENTITY_ID).attributes["windows"]
+    assert [(window["start"].hour, window["end"].hour) for window in windows] == [
+        (3, 5)
+    ]
+
+    # At 13:00 the next horizon picks 14:00 and 20:00
+    assert await _move_to(hass, freezer, 13) == "off"
+    windows = hass.states.get(ENTITY_ID).attributes["windows"]
+    assert [(window["start"].hour, window["end"].hour) for window in windows] == [
+        (14, 15),
+        (20, 21),
+    ]
+    assert await _move_to(hass, freezer, 14) == "on"
+
+
+async def test_cheapest_slots_horizon_moves_at_transitions(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    setup_entry: Callable[..., Awaitable[MockConfigEntry]],
+    day_document: Callable[..., dict],
+) -> None:
+    """Test the horizon moves on at each transition, not at its end only."""
+    entry = await setup_entry(
+        START,
+        {"prices": [day_document(DAY, {2: 0.1, 5: 0.14, 6: 0.12, 7: 0.05})]},
+        {"cheapest_slots": ["2"], "cheapest_horizon": 6},
+    )
+
+    # The horizon runs from the 01:00 slot to 07:00
+    windows = hass.states.get(ENTITY_ID).attributes["windows"]
+    assert [(window["start"].hour, window["end"].hour) for window in windows] == [
+        (2, 3),
+        (6, 7),
+    ]
+    assert await _move_to(hass, freezer, 2) == "on"
+
+    # When the first window ends the horizon runs to 09:00, and the cheaper
+    # window across the old end of the horizon is picked
+    assert await _move_to(hass, freezer, 3) == "off"
+    windows = hass.states.get(ENTITY_ID).attributes["windows"]
+    assert [(window["start"].hour, window["end"].hour) for window in windows] == [
+        (6, 8)
+    ]
+    assert await _move_to(hass, freezer, 5) == "off"
+    assert await _move_to(hass, freezer, 6) == "on"
+    assert await _move_to(hass, freezer, 7, 30) == "on"
+
+    # Windows within a moving horizon are not kept with the derived data
+    assert not [
+        key
+        for key in entry.runtime_data._derived_cache()
+        if key[0].startswith("cheapest")
+    ]
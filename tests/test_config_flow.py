@@ -4,8 +4,18 @@ from unittest.mock import patch
 from homeassistant import config_entries
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.essent.const import DOMAIN
+from custom_components.essent.const import (
+    CONF_CHEAP_PERCENTILE,
+    CONF_CHEAPEST_HORIZON,
+    CONF_CHEAPEST_SLOTS,
+    CONF_ELECTRICITY_METER,
+    CONF_EXPENSIVE_PERCENTILE,
+    CONF_VERY_CHEAP_PERCENTILE,
+    CONF_VERY_EXPENSIVE_PERCENTILE,
+    DOMAIN,
+)
 
 
 async def test_form(
@@ -31,3 +41,70 @@ async def test_form(
     assert result2["type"] == FlowResultType.CREATE_ENTRY
     assert result2["title"] == "Essent"
     assert result2["data"] == {}
+
+
+async def test_options_flow(
+    hass: HomeAssistant, enable_custom_integrations: None
+) -> None:
+    """Test the options flow stores the selected meters."""
+    entry = MockConfigEntry(domain=DOMAIN, title="Essent", data={})
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.essent.async_setup_entry",
+        return_value=True,
+    ):
+        result = await hass.config_entries.options.async_init(entry.entry_id)
+        assert result["type"] == FlowResultType.FORM
+        assert result["step_id"] == "init"
+
+        result2 = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {CONF_ELECTRICITY_METER: "sensor.electricity_meter"},
+        )
+        await hass.async_block_till_done()
+
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options == {
+        CONF_ELECTRICITY_METER: "sensor.electricity_meter",
+        CONF_VERY_CHEAP_PERCENTILE: 10,
+        CONF_CHEAP_PERCENTILE: 30,
+        CONF_EXPENSIVE_PERCENTILE: 70,
+        CONF_VERY_EXPENSIVE_PERCENTILE: 90,
+        CONF_CHEAPEST_SLOTS: ["4"],
+        CONF_CHEAPEST_HORIZON: 0,
+    }
+
+
+async def test_options_flow_invalid_thresholds(
+    hass: HomeAssistant, enable_custom_integrations: None
+) -> None:
+    """Test the options flow rejects thresholds out of order."""
+    entry = MockConfigEntry(domain=DOMAIN, title="Essent", data={})
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result2 = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_CHEAP_PERCENTILE: 80},
+    )
+
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["errors"] == {"base": "invalid_thresholds"}
+
+
+async def test_options_flow_invalid_cheapest_slots(
+    hass: HomeAssistant, enable_custom_integrations: None
+) -> None:
+    """Test the options flow rejects slot counts that are not whole numbers."""
+    entry = MockConfigEntry(domain=DOMAIN, title="Essent", data={})
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    result2 = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {CONF_CHEAPEST_SLOTS: ["4", "2.5"]},
+    )
+
+    assert result2["type"] == FlowResultType.FORM
+    assert result2["errors"] == {CONF_CHEAPEST_SLOTS: "invalid_cheapest_slots"}
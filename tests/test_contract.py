@@ -0,0 +1,73 @@
+"""Test the Essent contract comparison."""
+from datetime import date, datetime
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.essent.contract import empty_months, price_chunk
+
+TIME_ZONE = dt_util.get_time_zone("Europe/Amsterdam")
+START = datetime(2025, 3, 31, tzinfo=TIME_ZONE).timestamp()
+HOUR = 3600
+
+
+def _rows(hours: range, change: float = 2.0) -> list[tuple[float, float, float]]:
+    return [(START + hour * HOUR, START + (hour + 1) * HOUR, change) for hour in hours]
+
+
+def test_empty_months() -> None:
+    """Test every month in the range is present with its number of days."""
+    months = empty_months(date(2025, 1, 30), date(2025, 3, 2))
+    assert {key: month.days for key, month in months.items()} == {
+        "2025-01": 2,
+        "2025-02": 28,
+        "2025-03": 2,
+    }
+
+
+def test_price_chunk_merge() -> None:
+    """Test hours are priced time weighted over the slots that cover them."""
+    slots = [
+        # Quarter hours of the first hour
+        *[
+            (START + quarter * 900, START + (quarter + 1) * 900, 0.1 * (quarter + 1))
+            for quarter in range(4)
+        ],
+        # A slot covering the second hour and half of the third
+        (START + HOUR, START + 2.5 * HOUR, 0.3),
+        # The next day, which starts in April
+        (START + 24 * HOUR, START + 48 * HOUR, 1.2),
+    ]
+    months = empty_months(date(2025, 3, 31), date(2025, 4, 1))
+
+    price_chunk(_rows(range(3)) + _rows(range(23, 25)), slots, TIME_ZONE, months)
+
+    march, april = months["2025-03"], months["2025-04"]
+    assert march.hours == 4
+    assert march.consumption == 8.0
+    # The third hour is only half covered and the 23rd not at all
+    assert march.unpriced_hours == 2
+    assert march.priced_consumption == 4.0
+    assert march.dynamic_energy_cost == pytest.approx(2 * 0.25 + 2 * 0.3)
+    assert april.hours == 1
+    assert april.dynamic_energy_cost == pytest.approx(2.4)
+
+
+def test_price_chunk_in_parts() -> None:
+    """Test pricing a range chunk by chunk adds up to pricing it at once."""
+    slots = [
+        (START + hour * HOUR, START + (hour + 1) * HOUR, 0.2 + hour % 24 / 100)
+        for hour in range(48)
+    ]
+    whole = empty_months(date(2025, 3, 31), date(2025, 4, 1))
+    parts = empty_months(date(2025, 3, 31), date(2025, 4, 1))
+
+    price_chunk(_rows(range(48), 1.5), slots, TIME_ZONE, whole)
+    for first in range(0, 48, 7):
+        hours = range(first, min(first + 7, 48))
+        price_chunk(_rows(hours, 1.5), slots[first:], TIME_ZONE, parts)
+
+    assert parts == whole
+    assert whole["2025-04"].dynamic_energy_cost == pytest.approx(
+        1.5 * sum(0.2 + hour / 100 for hour in range(24))
+    )
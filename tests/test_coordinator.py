@@ -1,16 +1,30 @@
 """Test the Essent coordinator."""
-from datetime import timedelta
+from datetime import datetime, timedelta
+import json
+import random
 from unittest.mock import AsyncMock, patch
 
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import UpdateFailed
 from homeassistant.util import dt as dt_util
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
 
 from custom_components.essent.coordinator import EssentDataUpdateCoordinator
-from custom_components.essent.const import DOMAIN, UPDATE_INTERVAL
+from custom_components.essent.pipeline import build_energy_data
+from custom_components.essent.const import (
+    DOMAIN,
+    EVENT_PRICES_UPDATED,
+    RESPONSE_LOG_MAX_BYTES,
+    RESPONSE_LOG_SIZE,
+    UPDATE_INTERVAL,
+)
 
 
 async def test_coordinator_fetch_success(
@@ -20,15 +34,15 @@ async def test_coordinator_fetch_success(
     coordinator = EssentDataUpdateCoordinator(hass)
 
     with patch(
-        "custom_components.essent.coordinator.async_get_clientsession"
+        "custom_components.essent.pipeline.async_get_clientsession"
     ) as mock_session, patch("homeassistant.util.dt.now") as mock_now:
         mock_now.return_value = dt_util.as_local(
             dt_util.parse_datetime("2025-11-16T12:00:00")
         )
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.text = AsyncMock(return_value="")
-        mock_response.json = AsyncMock(return_value=essent_api_response)
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.text = AsyncMock(return_value=json.dumps(essent_api_response))
         session = AsyncMock()
         session.get = AsyncMock(return_value=mock_response)
         mock_session.return_value = session
@@ -43,6 +57,9 @@ async def test_coordinator_fetch_success(
     assert coordinator.data["electricity"]["min_price"] == 0.2
     assert round(coordinator.data["electricity"]["avg_price"], 4) == 0.2233
     assert coordinator.data["electricity"]["max_price"] == 0.25
+    tomorrow = coordinator.data["electricity"]["tomorrow"]
+    assert tomorrow["min_price"] == tomorrow["max_price"] == 0.21
+    assert tomorrow["cheapest_start"].startswith("2025-11-17T00:00:00")
 
 
 async def test_coordinator_fetch_failure(hass: HomeAssistant) -> None:
@@ -50,10 +67,11 @@ async def test_coordinator_fetch_failure(hass: HomeAssistant) -> None:
     coordinator = EssentDataUpdateCoordinator(hass)
 
     with patch(
-        "custom_components.essent.coordinator.async_get_clientsession"
+        "custom_components.essent.pipeline.async_get_clientsession"
     ) as mock_session:
         mock_response = AsyncMock()
         mock_response.status = 500
+        mock_response.headers = {"Content-Type": "application/json"}
         mock_response.text = AsyncMock(return_value="")
         session = AsyncMock()
         session.get = AsyncMock(return_value=mock_response)
@@ -61,3 +79,213 @@ async def test_coordinator_fetch_failure(hass: HomeAssistant) -> None:
 
         with pytest.raises(UpdateFailed):
             await coordinator._async_update_data()
+
+
+async def test_coordinator_records_recent_responses(hass: HomeAssistant) -> None:
+    """Test raw responses are kept compressed in a bounded ring buffer."""
+    coordinator = EssentDataUpdateCoordinator(hass)
+
+    with patch(
+        "custom_components.essent.pipeline.async_get_clientsession"
+    ) as mock_session:
+        mock_response = AsyncMock()
+        mock_response.status = 503
+        mock_response.headers = {"Content-Type": "text/plain", "Set-Cookie": "x=1"}
+        mock_response.text = AsyncMock(return_value="maintenance " * 100)
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=mock_response)
+        mock_session.return_value = session
+
+        for _ in range(RESPONSE_LOG_SIZE + 5):
+            with pytest.raises(UpdateFailed):
+                await coordinator._async_update_data()
+
+    responses = coordinator.recent_responses
+    assert len(responses) == RESPONSE_LOG_SIZE
+    recorded = responses[-1]
+    assert recorded.status == 503
+    assert recorded.headers["content-type"] == "text/plain"
+    assert recorded.body_size == len("maintenance " * 100)
+    assert len(recorded.body) < recorded.body_size
+    assert recorded.as_dict()["body"] == "maintenance " * 100
+
+
+async def test_coordinator_response_buffer_memory_cap(hass: HomeAssistant) -> None:
+    """Test old responses are evicted once the compressed size cap is hit."""
+    coordinator = EssentDataUpdateCoordinator(hass)
+    body = random.Random(0).randbytes(RESPONSE_LOG_MAX_BYTES // 4).hex()
+
+    for _ in range(8):
+        coordinator._record_response(dt_util.utcnow(), 0.1, 200, {}, body)
+
+    total = sum(len(recorded.body) for recorded in coordinator.recent_responses)
+    assert total <= RESPONSE_LOG_MAX_BYTES
+    assert 1 <= len(coordinator.recent_responses) < 8
+
+
+async def test_prices_updated_event(
+    hass: HomeAssistant, electricity_api_response: dict
+) -> None:
+    """Test the event only fires when a refresh brings new prices."""
+    events = async_capture_events(hass, EVENT_PRICES_UPDATED)
+    coordinator = EssentDataUpdateCoordinator(hass)
+    today, tomorrow = electricity_api_response["prices"]
+
+    def _refresh(today_block: dict, tomorrow_block: dict | None) -> None:
+        coordinator.data = {
+            "electricity": build_energy_data(
+                today_block, "electricity", tomorrow_block
+            )
+        }
+        coordinator.async_update_listeners()
+
+    # The first data is the baseline, and refetching it changes nothing
+    _refresh(today, None)
+    _refresh(today, None)
+    await hass.async_block_till_done()
+    assert events == []
+
+    _refresh(today, tomorrow)
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    data = events[0].data
+    assert data["energy_types"] == ["electricity"]
+    assert data["electricity"]["tomorrow_became_available"] is True
+    assert data["electricity"]["tomorrow"]["min_price"] == 0.21
+    assert len(data["electricity"]["changed_ranges"]) == 1
+    assert data["electricity"]["changed_ranges"][0]["start"].startswith(
+        "2025-11-17T00:00:00"
+    )
+    assert data["electricity"]["changed_ranges"][0]["end"].startswith(
+        "2025-11-17T02:00:00"
+    )
+
+    # Yesterday dropping out after midnight is not a new publication
+    _refresh(tomorrow, None)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert len(events) == 1
+
+
+async def test_listener_ticks_per_energy_type(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    electricity_api_response: dict,
+) -> None:
+    """Test each energy type's listeners only wake at that type's boundaries."""
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    freezer.move_to(dt_util.as_local(datetime(2025, 11, 16, 10, 30)))
+    gas_day = {
+        "unitOfMeasurement": "m³",
+        "tariffs": [
+            {
+                "startDateTime": "2025-11-16T06:00:00",
+                "endDateTime": "2025-11-17T06:00:00",
+                "totalAmount": 1.2,
+            }
+        ],
+    }
+    coordinator = EssentDataUpdateCoordinator(hass)
+    coordinator.data = {
+        "electricity": build_energy_data(
+            electricity_api_response["prices"][0], "electricity", None
+        ),
+        "gas": build_energy_data(gas_day, "gas", None),
+    }
+    woken = []
+    for context in ("electricity", "gas", None):
+        coordinator.async_add_listener(
+            lambda context=context: woken.append(context), context
+        )
+    coordinator.async_update_listeners()
+    assert woken == ["electricity", "gas", None]
+
+    # Gas has no boundary before midnight, electricity one on the hour
+    now = dt_util.utcnow()
+    assert dt_util.as_local(coordinator._next_tick("gas", now)).hour == 0
+    assert dt_util.as_local(coordinator._next_tick("electricity", now)).hour == 11
+
+    # The first API fetch is not due before 11:59
+    coordinator._api_fetch_minute_offset = 59
+    coordinator.start_schedules()
+    woken.clear()
+    freezer.move_to(dt_util.as_local(datetime(2025, 11, 16, 11, 0)))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert woken == ["electricity", None]
+    assert coordinator.tick_counts == {"electricity": 1}
+    assert coordinator.snapshot("electricity").current.price == 0.22
+    assert coordinator.snapshot("gas").current.price == 1.2
+    ticks = coordinator.listener_ticks
+    assert ticks["electricity"]["next_tick"].startswith("2025-11-16T11:00:00")
+    assert ticks["gas"]["next_tick"].startswith("2025-11-16T23:00:00")
+    await coordinator.async_shutdown()
+    assert not coordinator.listener_tick_scheduled
+
+
+async def test_fanouts_coalesce_around_boundaries(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    essent_api_response: dict,
+) -> None:
+    """Test fetches next to a listener tick produce a single update."""
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    freezer.move_to(dt_util.as_local(datetime(2025, 11, 16, 10, 30)))
+    today, tomorrow = essent_api_response["prices"]
+    # A single gas slot, so the next gas boundary is at noon
+    gas = today["gas"]["tariffs"][0]
+    today["gas"]["tariffs"] = [dict(gas, endDateTime="2025-11-16T12:00:00")]
+
+    def _data(tomorrow: dict | None) -> dict:
+        return {
+            energy_type: build_energy_data(
+                today[energy_type], energy_type, tomorrow and tomorrow[energy_type]
+            )
+            for energy_type in ("electricity", "gas")
+        }
+
+    coordinator = EssentDataUpdateCoordinator(hass)
+    coordinator.data = _data(None)
+    woken = []
+    for context in ("electricity", "gas"):
+        coordinator.async_add_listener(
+            lambda context=context: woken.append(context), context
+        )
+    coordinator.async_update_listeners()
+    coordinator._api_fetch_minute_offset = 30
+    coordinator.start_schedules()
+    woken.clear()
+
+    # New data just before an electricity boundary reaches gas right away,
+    # and electricity with the tick at the boundary
+    freezer.move_to(dt_util.as_local(datetime(2025, 11, 16, 10, 59, 55)))
+    coordinator.data = _data(tomorrow)
+    coordinator.async_update_listeners()
+    assert woken == ["gas"]
+    assert coordinator.coalesced_fanouts == 1
+    freezer.move_to(dt_util.as_local(datetime(2025, 11, 16, 11, 0)))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert woken == ["gas", "electricity"]
+    assert coordinator.snapshot("electricity").current.price == 0.22
+    assert coordinator.snapshot("electricity").tomorrow is not None
+
+    # An unchanged fetch just after the boundary changes nothing
+    freezer.move_to(dt_util.as_local(datetime(2025, 11, 16, 11, 0, 3)))
+    coordinator.async_update_listeners()
+    assert woken == ["gas", "electricity"]
+    assert coordinator.coalesced_fanouts == 2
+
+    # Outside the window every update reaches the listeners
+    freezer.move_to(dt_util.as_local(datetime(2025, 11, 16, 11, 0, 30)))
+    coordinator.async_update_listeners()
+    assert woken == ["gas", "electricity", "electricity", "gas"]
+    assert coordinator.coalesced_fanouts == 2
+
+    # A forced update is never coalesced
+    freezer.move_to(dt_util.as_local(datetime(2025, 11, 16, 11, 0, 31)))
+    with patch.object(coordinator, "_async_update_data", return_value=coordinator.data):
+        await coordinator.async_refresh_and_fan_out()
+    assert woken[4:] == ["electricity", "gas"]
+    assert coordinator.coalesced_fanouts == 2
+    await coordinator.async_shutdown()
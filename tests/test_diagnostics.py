@@ -1,5 +1,6 @@
 """Test the Essent diagnostics."""
 
+import json
 from unittest.mock import AsyncMock, patch
 
 from homeassistant.core import HomeAssistant
@@ -18,15 +19,15 @@ async def test_diagnostics(
     """Test diagnostics for config entry."""
     # Mock API response
     with patch(
-        "custom_components.essent.coordinator.async_get_clientsession"
+        "custom_components.essent.pipeline.async_get_clientsession"
     ) as mock_session, patch("homeassistant.util.dt.now") as mock_now:
         mock_now.return_value = dt_util.as_local(
             dt_util.parse_datetime("2025-11-16T12:00:00")
         )
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.text = AsyncMock(return_value="")
-        mock_response.json = AsyncMock(return_value=essent_api_response)
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.text = AsyncMock(return_value=json.dumps(essent_api_response))
         session = AsyncMock()
         session.get = AsyncMock(return_value=mock_response)
         mock_session.return_value = session
@@ -50,6 +51,7 @@ async def test_diagnostics(
     assert "api_fetch_minute_offset" in diagnostics
     assert "api_refresh_scheduled" in diagnostics
     assert "listener_tick_scheduled" in diagnostics
+    assert "timeline_reports" in diagnostics
 
     # Verify data content
     assert diagnostics["last_update_success"] is True
@@ -60,6 +62,10 @@ async def test_diagnostics(
     # Verify scheduling status
     assert diagnostics["api_refresh_scheduled"] is True
     assert diagnostics["listener_tick_scheduled"] is True
+    assert set(diagnostics["listener_ticks"]) == {"electricity", "gas"}
+    assert diagnostics["listener_ticks"]["gas"]["ticks"] == 0
+    assert diagnostics["listener_ticks"]["gas"]["next_tick"] is not None
+    assert diagnostics["coalesced_fanouts"] == 0
 
     # Verify minute offset is in valid range
     assert 0 <= diagnostics["api_fetch_minute_offset"] <= 59
@@ -76,3 +82,15 @@ async def test_diagnostics(
     gas_data = diagnostics["coordinator_data"]["gas"]
     assert "tariffs" in gas_data
     assert "unit" in gas_data
+
+    # Verify timeline validation findings are reported per energy type
+    report = diagnostics["timeline_reports"]["electricity"]
+    assert report["slot_count"] == 4
+    assert report["issue_counts"] == {"gap": 1}
+
+    # Verify the raw response is included, decompressed
+    response = diagnostics["recent_responses"][-1]
+    assert response["status"] == 200
+    assert response["headers"]["content-type"] == "application/json"
+    assert response["body"] == json.dumps(essent_api_response)
+    assert "latency_ms" in response
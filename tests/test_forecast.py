@@ -0,0 +1,167 @@
+"""Test the Essent price forecast."""
+from datetime import date, datetime, timedelta
+import json
+from unittest.mock import AsyncMock, patch
+from zoneinfo import ZoneInfo
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+import voluptuous as vol
+
+from custom_components.essent.const import DOMAIN, SERVICE_GET_FORECAST
+from custom_components.essent.forecast import train_and_forecast
+from custom_components.essent.history import STORAGE_KEY, STORAGE_VERSION
+
+AMSTERDAM = ZoneInfo("Europe/Amsterdam")
+
+
+def _history_day(day: date, time_zone, level: float) -> list[tuple[float, float, float]]:
+    """Generate hourly history slots whose price rises through the day."""
+    start = datetime(day.year, day.month, day.day, tzinfo=time_zone)
+    return [
+        (
+            (start + timedelta(hours=hour)).timestamp(),
+            (start + timedelta(hours=hour + 1)).timestamp(),
+            level + 0.01 * hour,
+        )
+        for hour in range(24)
+    ]
+
+
+def test_forecast_needs_history() -> None:
+    """Test no forecast is made from too little history."""
+    days = [(date(2025, 11, 16), _history_day(date(2025, 11, 16), AMSTERDAM, 0.2))]
+
+    assert train_and_forecast("electricity", days, date(2025, 11, 18), AMSTERDAM) is None
+
+
+def test_forecast_profile_and_level() -> None:
+    """Test the forecast follows the hourly profile and the level trend."""
+    days = [
+        (day, _history_day(day, AMSTERDAM, 0.1 + 0.01 * offset))
+        for offset in range(7)
+        if (day := date(2025, 11, 10) + timedelta(days=offset))
+    ]
+
+    result = train_and_forecast("electricity", days, date(2025, 11, 18), AMSTERDAM)
+
+    assert result is not None
+    assert result.days_used == 7
+    assert result.train_seconds >= 0
+    assert result.inference_seconds >= 0
+    assert len(result.slots) == 24
+    prices = [price for _, _, price in result.slots]
+    # Hourly shape is preserved
+    assert all(later > earlier for earlier, later in zip(prices, prices[1:]))
+    # The rising level is extrapolated but clipped to the latest day's mean
+    assert sum(prices) / len(prices) == pytest.approx(0.16 + 0.115)
+
+
+def test_forecast_dst_target_day() -> None:
+    """Test a forecast for the 25 hour day has 25 hourly slots."""
+    days = [
+        (day, _history_day(day, AMSTERDAM, 0.2))
+        for offset in range(5)
+        if (day := date(2025, 10, 20) + timedelta(days=offset))
+    ]
+
+    result = train_and_forecast("electricity", days, date(2025, 10, 26), AMSTERDAM)
+
+    assert len(result.slots) == 25
+    assert result.slots[0][0] == datetime(2025, 10, 26, tzinfo=AMSTERDAM).timestamp()
+
+
+async def test_get_forecast_service(
+    hass: HomeAssistant,
+    hass_storage: dict,
+    essent_api_response: dict,
+    enable_custom_integrations: None,
+) -> None:
+    """Test a new publication triggers a forecast returned by the service."""
+    time_zone = dt_util.get_default_time_zone()
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            "electricity": {
+                day.isoformat(): [list(slot) for slot in _history_day(day, time_zone, 0.2)]
+                for offset in range(7)
+                if (day := date(2025, 11, 9) + timedelta(days=offset))
+            }
+        },
+    }
+
+    with patch(
+        "custom_components.essent.pipeline.async_get_clientsession"
+    ) as mock_session, patch("homeassistant.util.dt.now") as mock_now:
+        mock_now.return_value = dt_util.as_local(
+            dt_util.parse_datetime("2025-11-16T12:00:00")
+        )
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.text = AsyncMock(return_value=json.dumps(essent_api_response))
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=mock_response)
+        mock_session.return_value = session
+
+        entry = MockConfigEntry(domain=DOMAIN, title="Essent", data={})
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    response = await hass.services.async_call(
+        DOMAIN, SERVICE_GET_FORECAST, blocking=True, return_response=True
+    )
+
+    assert response["estimate"] is True
+    assert response["date"] == "2025-11-18"
+    assert response["days_used"] == 9
+    assert "train_time_ms" in response
+    assert "inference_time_ms" in response
+    assert len(response["slots"]) == 24
+    assert all(slot["estimate"] for slot in response["slots"])
+    assert response["slots"][-1]["price"] > response["slots"][0]["price"]
+
+
+async def test_get_forecast_service_unavailable(
+    hass: HomeAssistant,
+    essent_api_response: dict,
+    enable_custom_integrations: None,
+) -> None:
+    """Test the service reports when there is no forecast yet."""
+    with patch(
+        "custom_components.essent.pipeline.async_get_clientsession"
+    ) as mock_session, patch("homeassistant.util.dt.now") as mock_now:
+        mock_now.return_value = dt_util.as_local(
+            dt_util.parse_datetime("2025-11-16T12:00:00")
+        )
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.text = AsyncMock(return_value=json.dumps(essent_api_response))
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=mock_response)
+        mock_session.return_value = session
+
+        entry = MockConfigEntry(domain=DOMAIN, title="Essent", data={})
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_GET_FORECAST, blocking=True, return_response=True
+        )
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_FORECAST,
+            {"energy_type": "gas"},
+            blocking=True,
+            return_response=True,
+        )
@@ -1,4 +1,8 @@
 """Full integration test."""
+import json
+import subprocess
+import sys
+import time
 from unittest.mock import AsyncMock, patch
 
 from homeassistant.config_entries import ConfigEntryState
@@ -9,6 +13,35 @@ from homeassistant.util import dt as dt_util
 
 from custom_components.essent.const import DOMAIN
 
+# Generous bounds that only a regression in what is loaded up front exceeds
+IMPORT_BUDGET = 0.5
+SETUP_BUDGET = 2.0
+
+# Loaded on first use, never by importing or setting up the integration
+LAZY_MODULES = (
+    "cProfile",
+    "custom_components.essent.backfill",
+    "custom_components.essent.contract",
+    "custom_components.essent.forecast",
+    "custom_components.essent.profiling",
+    "homeassistant.components.recorder",
+    "numpy",
+    "sqlalchemy",
+)
+
+_IMPORT_SCRIPT = f"""
+import sys, time
+import homeassistant.core
+import homeassistant.helpers.config_validation
+import homeassistant.helpers.importlib
+import homeassistant.helpers.update_coordinator
+start = time.perf_counter()
+import custom_components.essent
+print(time.perf_counter() - start)
+print(",".join(name for name in {LAZY_MODULES!r} if name in sys.modules))
+print("custom_components.essent.coordinator" in sys.modules)
+"""
+
 
 async def test_full_integration_setup(
     hass: HomeAssistant,
@@ -18,15 +51,15 @@ async def test_full_integration_setup(
     """Test complete integration setup."""
     # Mock API response
     with patch(
-        "custom_components.essent.coordinator.async_get_clientsession"
+        "custom_components.essent.pipeline.async_get_clientsession"
     ) as mock_session, patch("homeassistant.util.dt.now") as mock_now:
         mock_now.return_value = dt_util.as_local(
             dt_util.parse_datetime("2025-11-16T12:00:00")
         )
         mock_response = AsyncMock()
         mock_response.status = 200
-        mock_response.text = AsyncMock(return_value="")
-        mock_response.json = AsyncMock(return_value=essent_api_response)
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.text = AsyncMock(return_value=json.dumps(essent_api_response))
         session = AsyncMock()
         session.get = AsyncMock(return_value=mock_response)
         mock_session.return_value = session
@@ -65,3 +98,55 @@ async def test_full_integration_setup(
         assert await hass.config_entries.async_unload(entry.entry_id)
         await hass.async_block_till_done()
         assert entry.state == ConfigEntryState.NOT_LOADED
+
+
+def test_cold_import() -> None:
+    """Test importing the integration stays cheap and loads no heavy modules."""
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SCRIPT],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    duration, loaded, coordinator = result.stdout.splitlines()
+    assert float(duration) < IMPORT_BUDGET
+    assert loaded == ""
+    assert coordinator == "False"
+
+
+async def test_setup_entry_budget(
+    hass: HomeAssistant,
+    essent_api_response,
+    enable_custom_integrations: None,
+) -> None:
+    """Test setting up the entry stays within budget without lazy modules."""
+    with patch(
+        "custom_components.essent.pipeline.async_get_clientsession"
+    ) as mock_session, patch.dict(sys.modules):
+        # Other tests may already have imported them; only the integration's
+        # own modules can be unloaded safely
+        for name in LAZY_MODULES:
+            if name.startswith("custom_components"):
+                sys.modules.pop(name, None)
+        preloaded = {name for name in LAZY_MODULES if name in sys.modules}
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.text = AsyncMock(return_value=json.dumps(essent_api_response))
+        mock_session.return_value.get = AsyncMock(return_value=mock_response)
+        entry = MockConfigEntry(domain=DOMAIN, title="Essent", data={})
+        entry.add_to_hass(hass)
+
+        start = time.perf_counter()
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+        duration = time.perf_counter() - start
+        loaded = [
+            name
+            for name in LAZY_MODULES
+            if name not in preloaded and name in sys.modules
+        ]
+
+    assert entry.state is ConfigEntryState.LOADED
+    assert duration < SETUP_BUDGET
+    assert not loaded
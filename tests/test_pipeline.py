@@ -0,0 +1,116 @@
+"""Test the Essent price pipeline."""
+import json
+from pathlib import Path
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from custom_components.essent.coordinator import EssentDataUpdateCoordinator
+from custom_components.essent.pipeline import PricePipeline, RecordedFileSource
+
+FIXTURE = Path(__file__).parent / "fixtures" / "essent_api_response.json"
+
+
+async def test_recorded_file_through_coordinator(hass: HomeAssistant) -> None:
+    """Test a recorded response runs through the same pipeline as the API."""
+    coordinator = EssentDataUpdateCoordinator(
+        hass, source=RecordedFileSource(hass, FIXTURE)
+    )
+
+    await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert len(coordinator.data["electricity"]["tariffs"]) == 3
+    assert coordinator.data["electricity"]["min_price"] == 0.2
+    assert coordinator.data["electricity"]["tomorrow"]["max_price"] == 0.21
+    assert coordinator.recent_responses[-1].status == 200
+    diagnostics = coordinator.pipeline.as_dict()
+    assert diagnostics["source"] == "recorded_file"
+    assert {stage["runs"] for stage in diagnostics["stages"].values()} == {1}
+
+
+async def test_unchanged_input_skips_stages(hass: HomeAssistant, tmp_path) -> None:
+    """Test stages only run again when their input fingerprint changes."""
+    path = tmp_path / "response.json"
+    document = json.loads(FIXTURE.read_text())
+    path.write_text(json.dumps(document))
+    pipeline = PricePipeline(RecordedFileSource(hass, path))
+
+    async def _run(current_date: str):
+        return pipeline.process(await pipeline.async_fetch(), current_date)
+
+    first = await _run("2025-11-16")
+    # The same body on the same day returns the very same data object
+    assert await _run("2025-11-16") is first
+    assert pipeline.stats["fetch"].runs == 2
+    assert pipeline.stats["decode"].skipped == 1
+    assert pipeline.stats["derive"].skipped == 1
+
+    # A new day selects other documents from the same decoded body
+    second = await _run("2025-11-17")
+    assert second is not first
+    assert second["electricity"]["tariffs"][0]["startDateTime"].startswith(
+        "2025-11-17"
+    )
+    assert pipeline.stats["decode"].skipped == 2
+    assert pipeline.stats["validate"].runs == 2
+
+    # A changed body runs every stage
+    document["prices"][1]["electricity"]["tariffs"][0]["totalAmount"] = 0.3
+    path.write_text(json.dumps(document))
+    third = await _run("2025-11-17")
+    assert third["electricity"]["max_price"] == 0.3
+    assert pipeline.stats["decode"].runs == 2
+    assert pipeline.stats["derive"].runs == 3
+
+
+async def test_lenient_document(hass: HomeAssistant, tmp_path) -> None:
+    """Test quoted amounts and documents without a date still load."""
+    path = tmp_path / "response.json"
+    document = json.loads(FIXTURE.read_text())
+    for price in document["prices"]:
+        del price["date"]
+        for tariff in price["electricity"]["tariffs"]:
+            tariff["totalAmount"] = str(tariff["totalAmount"])
+    path.write_text(json.dumps(document))
+    pipeline = PricePipeline(RecordedFileSource(hass, path))
+
+    data = pipeline.process(await pipeline.async_fetch(), "2025-11-16")
+
+    assert data["electricity"]["min_price"] == 0.2
+    assert data["electricity"]["tomorrow"]["max_price"] == 0.21
+
+
+async def test_stage_failures(hass: HomeAssistant, tmp_path) -> None:
+    """Test a failing stage raises UpdateFailed and is counted."""
+    path = tmp_path / "response.json"
+    pipeline = PricePipeline(RecordedFileSource(hass, path))
+    today = dt_util.now().date().isoformat()
+
+    with pytest.raises(UpdateFailed):
+        await pipeline.async_fetch()
+    assert pipeline.stats["fetch"].failures == 1
+
+    path.write_text("not json")
+    with pytest.raises(UpdateFailed, match="Invalid JSON"):
+        pipeline.process(await pipeline.async_fetch(), today)
+    assert pipeline.stats["decode"].failures == 1
+
+    document = {"prices": [{"date": today, "electricity": {"tariffs": []}}]}
+    path.write_text(json.dumps(document))
+    with pytest.raises(UpdateFailed, match="missing electricity or gas data"):
+        pipeline.process(await pipeline.async_fetch(), today)
+    assert pipeline.stats["validate"].failures == 1
+
+    document["prices"][0]["gas"] = {"tariff": []}
+    document["prices"][0]["electricity"]["tariffs"] = [{"totalAmount": "n/a"}] * 5
+    path.write_text(json.dumps(document))
+    with pytest.raises(
+        UpdateFailed,
+        match=r"prices\[0\]\.electricity\.tariffs\[0\]\.startDateTime: missing;"
+        r".* \(and 13 more\)",
+    ):
+        pipeline.process(await pipeline.async_fetch(), today)
+    assert pipeline.as_dict()["validation_errors"] == {"missing": 11, "wrong_type": 5}
@@ -0,0 +1,179 @@
+"""Test the Essent rolling price aggregates."""
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
+from functools import partial
+
+import pytest
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.essent.const import API_ENDPOINT
+from custom_components.essent.history import EssentPriceHistory
+from custom_components.essent.history import STORAGE_KEY as HISTORY_STORAGE_KEY
+from custom_components.essent.rolling import STORAGE_KEY, EssentRollingStats
+
+
+def _day_price(day: date) -> float:
+    """Return the base price of a generated day."""
+    return round(0.2 + day.toordinal() % 11 / 100, 4)
+
+
+def _history_slots(day: date) -> list[list[float]]:
+    """Generate the retained slots of a day: base price, then 0.1 higher."""
+    start = dt_util.as_utc(dt_util.start_of_local_day(day)).timestamp()
+    return [
+        [start, start + 3600, _day_price(day)],
+        [start + 3600, start + 7200, _day_price(day) + 0.1],
+    ]
+
+
+async def test_incremental_matches_recomputation(hass: HomeAssistant) -> None:
+    """Test daily pushes match aggregates computed from scratch."""
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    history = EssentPriceHistory(hass)
+    rolling = EssentRollingStats(hass)
+    first = date(2025, 9, 1)
+    days = [first + timedelta(days=offset) for offset in range(60)]
+    for day in days:
+        history.async_record_days(
+            "electricity", {day.isoformat(): [tuple(s) for s in _history_slots(day)]}
+        )
+
+    for today in days[1:]:
+        rolling.async_rollover(history, ["electricity"], today)
+
+    aggregates = rolling.aggregates("electricity")
+    for window in (7, 30):
+        recent = days[-1 - window : -1]
+        averages = [_day_price(day) + 0.05 for day in recent]
+        assert aggregates[window].days == window
+        assert aggregates[window].first_day == recent[0]
+        assert round(aggregates[window].avg_price, 9) == round(
+            sum(averages) / window, 9
+        )
+        assert aggregates[window].min_price == min(_day_price(day) for day in recent)
+        assert aggregates[window].max_price == max(
+            _day_price(day) + 0.1 for day in recent
+        )
+    assert len(rolling._rings["electricity"].days) == 30
+
+
+async def test_windows_cover_calendar_days(hass: HomeAssistant) -> None:
+    """Test missing days are left out and days recorded late are folded in."""
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    history = EssentPriceHistory(hass)
+    rolling = EssentRollingStats(hass)
+    history.async_add_listener(partial(rolling.async_history_changed, history))
+    today = date(2025, 11, 16)
+    missing = [today - timedelta(days=offset) for offset in (2, 3, 4)]
+    for offset in range(20, 0, -1):
+        if (day := today - timedelta(days=offset)) not in missing:
+            history.async_record_days(
+                "electricity",
+                {day.isoformat(): [tuple(s) for s in _history_slots(day)]},
+            )
+
+    rolling.async_rollover(history, ["electricity"], today)
+
+    # The week holds the four days that were retained, not the last seven
+    week = rolling.aggregates("electricity")[7]
+    assert week.days == 4
+    assert week.first_day == today - timedelta(days=7)
+    assert rolling.aggregates("electricity")[30].days == 17
+
+    # A backfilled day before the last finalized one rebuilds the windows
+    history.async_record_days(
+        "electricity",
+        {
+            day.isoformat(): [tuple(s) for s in _history_slots(day)]
+            for day in missing
+        },
+    )
+
+    recent = [today - timedelta(days=offset) for offset in range(7, 0, -1)]
+    week = rolling.aggregates("electricity")[7]
+    assert week.days == 7
+    assert round(week.avg_price, 9) == round(
+        sum(_day_price(day) + 0.05 for day in recent) / 7, 9
+    )
+    assert week.min_price == min(_day_price(day) for day in recent)
+    assert rolling.aggregates("electricity")[30].days == 20
+    assert rolling._finalized["electricity"] == today - timedelta(days=1)
+
+
+async def test_rollover_persists_and_sensors(
+    hass: HomeAssistant,
+    hass_storage: dict,
+    freezer: FrozenDateTimeFactory,
+    aioclient_mock: AiohttpClientMocker,
+    setup_entry: Callable[..., Awaitable[MockConfigEntry]],
+    day_document: Callable[..., dict],
+) -> None:
+    """Test days are finalized at rollover, stored and shown by the sensors."""
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    today = date(2025, 11, 16)
+    retained = {
+        (today - timedelta(days=offset)).isoformat(): _history_slots(
+            today - timedelta(days=offset)
+        )
+        for offset in range(1, 4)
+    }
+    hass_storage[HISTORY_STORAGE_KEY] = {
+        "version": 1,
+        "minor_version": 1,
+        "key": HISTORY_STORAGE_KEY,
+        "data": {"electricity": retained, "gas": retained},
+    }
+    await setup_entry(
+        datetime(2025, 11, 16, 12),
+        {"prices": [day_document(today, default=_day_price(today))]},
+    )
+
+    # The three retained days are finalized at startup
+    state = hass.states.get("sensor.essent_electricity_average_7_days")
+    expected = [_day_price(today - timedelta(days=offset)) for offset in (3, 2, 1)]
+    assert float(state.state) == pytest.approx(sum(expected) / 3 + 0.05, abs=1e-4)
+    assert state.attributes["days"] == 3
+    assert state.attributes["first_day"] == "2025-11-13"
+
+    # Today is finalized once the local date rolls over
+    aioclient_mock.clear_requests()
+    tomorrow = today + timedelta(days=1)
+    aioclient_mock.get(
+        API_ENDPOINT,
+        json={"prices": [day_document(tomorrow, default=_day_price(tomorrow))]},
+    )
+    midnight = dt_util.as_local(datetime(2025, 11, 17, 0))
+    freezer.move_to(midnight)
+    async_fire_time_changed(hass, midnight)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.essent_gas_average_7_days")
+    assert state.attributes["days"] == 4
+    assert state.attributes["first_day"] == "2025-11-13"
+
+    freezer.tick(timedelta(seconds=30))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    stored = hass_storage[STORAGE_KEY]["data"]["electricity"]
+    assert stored["finalized"] == "2025-11-16"
+    assert [day for day, *_ in stored["days"]] == [
+        "2025-11-13",
+        "2025-11-14",
+        "2025-11-15",
+        "2025-11-16",
+    ]
+    assert stored["days"][-1][1] == _day_price(today)
+
+    # After a restart the ring comes back from storage
+    rolling = EssentRollingStats(hass)
+    await rolling.async_load()
+    assert rolling.aggregates("electricity")[30].days == 4
@@ -0,0 +1,77 @@
+"""Test the Essent price document schema."""
+from custom_components.essent.schema import (
+    Array,
+    Number,
+    Object,
+    String,
+    compile_schema,
+    validate_price_document,
+)
+
+
+def test_valid_document(essent_api_response: dict) -> None:
+    """Test the recorded API response matches the schema."""
+    assert validate_price_document(essent_api_response) is None
+
+
+def test_errors_have_precise_paths(essent_api_response: dict) -> None:
+    """Test every violation is reported with the path to the value."""
+    day = essent_api_response["prices"][1]
+    day["gas"]["tariffs"][0]["totalAmount"] = "n/a"
+    day["electricity"]["tariffs"][0]["groups"][1]["amount"] = True
+    del day["electricity"]["tariffs"][0]["endDateTime"]
+    essent_api_response["prices"][0]["gas"] = []
+
+    errors = validate_price_document(essent_api_response)
+
+    assert [str(error) for error in errors] == [
+        "prices[0].gas: expected object",
+        "prices[1].electricity.tariffs[0].endDateTime: missing",
+        "prices[1].electricity.tariffs[0].groups[1].amount: expected number",
+        "prices[1].gas.tariffs[0].totalAmount: expected number",
+    ]
+    assert [error.code for error in errors] == [
+        "wrong_type",
+        "missing",
+        "wrong_type",
+        "wrong_type",
+    ]
+
+
+def test_lenient_values(essent_api_response: dict) -> None:
+    """Test values the API has served loosely are accepted."""
+    for price in essent_api_response["prices"]:
+        del price["date"]
+    tariff = essent_api_response["prices"][0]["electricity"]["tariffs"][0]
+    tariff["totalAmount"] = "0.25"
+    tariff["totalAmountEx"] = "2e-1"
+    tariff["groups"] = [{"amount": 0.1}, {"type": "TAX", "amount": "0.05"}]
+
+    assert validate_price_document(essent_api_response) is None
+
+
+def test_document_level_errors() -> None:
+    """Test errors at the root of the document."""
+    assert [str(error) for error in validate_price_document([])] == [
+        "expected object"
+    ]
+    assert [str(error) for error in validate_price_document({"prices": []})] == [
+        "prices: expected at least 1 item(s)"
+    ]
+
+
+def test_nullable_and_optional_values() -> None:
+    """Test null is only accepted where the schema allows it."""
+    validate = compile_schema(
+        Object(
+            required={"name": String()},
+            optional={"price": Number(nullable=True), "tags": Array(String())},
+        )
+    )
+
+    assert validate({"name": "a", "price": None}) is None
+    assert validate({"name": "a", "tags": ["b"]}) is None
+    assert [str(error) for error in validate({"name": None, "tags": [1]})] == [
+        "name: expected string",
+        "tags[0]: expected string",
+    ]
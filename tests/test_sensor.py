@@ -1,60 +1,122 @@
 """Test the Essent sensors."""
-from datetime import datetime
-from unittest.mock import Mock, patch
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime
+from unittest.mock import PropertyMock, patch
 
-from homeassistant.components.sensor import SensorDeviceClass
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.const import CURRENCY_EURO
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, State
+from homeassistant.helpers.entity import Entity
 from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
-from custom_components.essent.const import ENERGY_TYPE_ELECTRICITY
-from custom_components.essent.sensor import (
-    EssentAveragePriceSensor,
-    EssentCurrentPriceSensor,
-    EssentHighestPriceSensor,
-    EssentLowestPriceSensor,
-    EssentNextPriceSensor,
+from custom_components.essent.const import (
+    ENERGY_TYPE_ELECTRICITY,
+    ENERGY_TYPE_GAS,
 )
+from custom_components.essent.coordinator import EssentDataUpdateCoordinator
+from custom_components.essent.pipeline import build_energy_data
+from custom_components.essent.sensor import SENSORS, EssentCostSensor, EssentSensor
 
 
-def _coordinator_from_fixture(fixture: dict) -> Mock:
-    """Create a mock coordinator from a fixture payload."""
-    return Mock(
-        data={
-            ENERGY_TYPE_ELECTRICITY: {
-                "tariffs": fixture["prices"][0]["tariffs"],
-                "tariffs_tomorrow": fixture["prices"][1]["tariffs"],
-                "unit": fixture["prices"][0]["unit"],
-                "avg_price": 0.22333333333333333,
-                "min_price": 0.2,
-                "max_price": 0.25,
-            }
-        }
-    )
+def _coordinator_from_fixture(
+    hass: HomeAssistant, fixture: dict
+) -> EssentDataUpdateCoordinator:
+    """Create a coordinator holding a fixture payload."""
+    coordinator = EssentDataUpdateCoordinator(hass)
+    coordinator.data = {
+        ENERGY_TYPE_ELECTRICITY: build_energy_data(
+            fixture["prices"][0], ENERGY_TYPE_ELECTRICITY, fixture["prices"][1]
+        )
+    }
+    return coordinator
+
+
+def _sensor(
+    coordinator: EssentDataUpdateCoordinator,
+    key: str,
+    energy_type: str = ENERGY_TYPE_ELECTRICITY,
+) -> EssentSensor:
+    """Create the sensor for a description key."""
+    description = next(description for description in SENSORS if description.key == key)
+    return EssentSensor(coordinator, energy_type, description)
+
+
+def _tick(
+    coordinator: EssentDataUpdateCoordinator,
+    freezer: FrozenDateTimeFactory,
+    when: str,
+) -> None:
+    """Move to a local time and run a listener tick."""
+    freezer.move_to(dt_util.as_local(datetime.fromisoformat(when)))
+    coordinator.async_update_listeners()
+
+
+async def test_sensor_descriptions() -> None:
+    """Test the platform creates the expected sensors per energy type."""
+    keys = {
+        energy_type: [
+            description.key
+            for description in SENSORS
+            if energy_type in description.energy_types
+        ]
+        for energy_type in (ENERGY_TYPE_ELECTRICITY, ENERGY_TYPE_GAS)
+    }
+
+    assert keys[ENERGY_TYPE_ELECTRICITY] == [
+        "current_price",
+        "next_price",
+        "average_today",
+        "lowest_price_today",
+        "highest_price_today",
+        "average_tomorrow",
+        "lowest_price_tomorrow",
+        "highest_price_tomorrow",
+        "average_7_days",
+        "lowest_price_7_days",
+        "highest_price_7_days",
+        "average_30_days",
+        "lowest_price_30_days",
+        "highest_price_30_days",
+        "price_level",
+        "price_percentile",
+        "price_anomalies",
+    ]
+    assert keys[ENERGY_TYPE_GAS] == [
+        "current_price",
+        "next_price",
+        "average_7_days",
+        "average_30_days",
+        "price_anomalies",
+    ]
 
 
 async def test_current_price_sensor(
-    hass: HomeAssistant, electricity_api_response: dict
+    hass: HomeAssistant,
+    electricity_api_response: dict,
+    freezer: FrozenDateTimeFactory,
 ) -> None:
     """Test current price sensor."""
-    coordinator = _coordinator_from_fixture(electricity_api_response)
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
+    sensor = _sensor(coordinator, "current_price")
 
-    sensor = EssentCurrentPriceSensor(coordinator, ENERGY_TYPE_ELECTRICITY)
+    _tick(coordinator, freezer, "2025-11-16T10:30:00")
 
-    with patch("custom_components.essent.sensor.dt_util.now") as mock_now:
-        mock_now.return_value = dt_util.as_local(
-            datetime.fromisoformat("2025-11-16T10:30:00")
-        )
-
-        assert sensor.native_value == 0.25  # 10:00-11:00 price
-        assert sensor.native_unit_of_measurement == f"{CURRENCY_EURO}/kWh"
-        assert sensor.device_class == SensorDeviceClass.MONETARY
-        assert sensor.state_class is None
+    assert sensor.unique_id == "essent_electricity_current_price"
+    assert sensor.name == "Electricity current price"
+    assert sensor.native_value == 0.25  # 10:00-11:00 price
+    assert sensor.native_unit_of_measurement == f"{CURRENCY_EURO}/kWh"
+    assert sensor.device_class == SensorDeviceClass.MONETARY
+    assert sensor.state_class is None
 
 
 async def test_current_price_no_data(hass: HomeAssistant) -> None:
     """Test current price sensor with no matching tariff."""
-    coordinator = Mock()
+    coordinator = EssentDataUpdateCoordinator(hass)
     coordinator.data = {
         "electricity": {
             "tariffs": [],
@@ -63,66 +125,89 @@ async def test_current_price_no_data(hass: HomeAssistant) -> None:
         }
     }
 
-    sensor = EssentCurrentPriceSensor(coordinator, ENERGY_TYPE_ELECTRICITY)
+    sensor = _sensor(coordinator, "current_price")
     assert sensor.native_value is None
+    assert sensor.extra_state_attributes == {}
 
 
 async def test_next_price_sensor(
-    hass: HomeAssistant, electricity_api_response: dict
+    hass: HomeAssistant,
+    electricity_api_response: dict,
+    freezer: FrozenDateTimeFactory,
 ) -> None:
     """Test next price sensor."""
-    coordinator = _coordinator_from_fixture(electricity_api_response)
-
-    sensor = EssentNextPriceSensor(coordinator, ENERGY_TYPE_ELECTRICITY)
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
+    sensor = _sensor(coordinator, "next_price")
 
-    with patch("custom_components.essent.sensor.dt_util.now") as mock_now:
-        mock_now.return_value = dt_util.as_local(
-            datetime.fromisoformat("2025-11-16T10:30:00")
-        )
+    _tick(coordinator, freezer, "2025-11-16T10:30:00")
 
-        # Next hour is 11:00-12:00
-        assert sensor.native_value == 0.22
+    # Next hour is 11:00-12:00
+    assert sensor.native_value == 0.22
 
 
 async def test_current_price_sensor_uses_tomorrow(
-    hass: HomeAssistant, electricity_api_response: dict
+    hass: HomeAssistant,
+    electricity_api_response: dict,
+    freezer: FrozenDateTimeFactory,
 ) -> None:
     """Test current price sensor uses tomorrow's tariffs after midnight."""
-    coordinator = _coordinator_from_fixture(electricity_api_response)
-    sensor = EssentCurrentPriceSensor(coordinator, ENERGY_TYPE_ELECTRICITY)
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
+    sensor = _sensor(coordinator, "current_price")
 
-    with patch("custom_components.essent.sensor.dt_util.now") as mock_now:
-        # Simulate being after midnight on 2025-11-17
-        mock_now.return_value = dt_util.as_local(
-            datetime.fromisoformat("2025-11-17T00:30:00")
-        )
+    # Simulate being after midnight on 2025-11-17
+    _tick(coordinator, freezer, "2025-11-17T00:30:00")
 
-        # Should use tomorrow's tariff (which is now today)
-        assert sensor.native_value == 0.21  # First tariff from tomorrow array
+    # Should use tomorrow's tariff (which is now today)
+    assert sensor.native_value == 0.21  # First tariff from tomorrow array
 
 
 async def test_next_price_sensor_uses_tomorrow(
-    hass: HomeAssistant, electricity_api_response: dict
+    hass: HomeAssistant,
+    electricity_api_response: dict,
+    freezer: FrozenDateTimeFactory,
 ) -> None:
     """Test next price sensor falls back to tomorrow when needed."""
-    coordinator = _coordinator_from_fixture(electricity_api_response)
-    sensor = EssentNextPriceSensor(coordinator, ENERGY_TYPE_ELECTRICITY)
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
+    sensor = _sensor(coordinator, "next_price")
 
-    with patch("custom_components.essent.sensor.dt_util.now") as mock_now:
-        mock_now.return_value = dt_util.as_local(
-            datetime.fromisoformat("2025-11-16T23:30:00")
-        )
+    _tick(coordinator, freezer, "2025-11-16T23:30:00")
 
-        assert sensor.native_value == 0.21  # First tariff tomorrow
+    assert sensor.native_value == 0.21  # First tariff tomorrow
+
+
+async def test_snapshot_resolved_once_per_tick(
+    hass: HomeAssistant,
+    electricity_api_response: dict,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test all sensors share one slot resolution per listener tick."""
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
+    sensors = [_sensor(coordinator, description.key) for description in SENSORS]
+
+    _tick(coordinator, freezer, "2025-11-16T10:30:00")
+    with patch.object(
+        coordinator, "_build_snapshot", wraps=coordinator._build_snapshot
+    ) as build:
+        for sensor in sensors:
+            sensor.native_value
+            sensor.extra_state_attributes
+        assert build.call_count == 0
+
+        # Values only move on when the next tick runs
+        freezer.move_to(dt_util.as_local(datetime.fromisoformat("2025-11-16T11:30:00")))
+        assert sensors[0].native_value == 0.25
+        coordinator.async_update_listeners()
+        assert build.call_count == 1
+        assert sensors[0].native_value == 0.22
 
 
 async def test_average_price_sensor(
     hass: HomeAssistant, electricity_api_response: dict
 ) -> None:
     """Test average price sensor."""
-    coordinator = _coordinator_from_fixture(electricity_api_response)
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
 
-    sensor = EssentAveragePriceSensor(coordinator, ENERGY_TYPE_ELECTRICITY)
+    sensor = _sensor(coordinator, "average_today")
 
     assert round(sensor.native_value, 4) == 0.2233
     assert sensor.extra_state_attributes["min_price"] == 0.2
@@ -133,9 +218,9 @@ async def test_lowest_price_sensor(
     hass: HomeAssistant, electricity_api_response: dict
 ) -> None:
     """Test lowest price sensor."""
-    coordinator = _coordinator_from_fixture(electricity_api_response)
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
 
-    sensor = EssentLowestPriceSensor(coordinator, ENERGY_TYPE_ELECTRICITY)
+    sensor = _sensor(coordinator, "lowest_price_today")
 
     assert sensor.native_value == 0.2
     assert sensor.entity_registry_enabled_default is False
@@ -147,9 +232,9 @@ async def test_highest_price_sensor(
     hass: HomeAssistant, electricity_api_response: dict
 ) -> None:
     """Test highest price sensor."""
-    coordinator = _coordinator_from_fixture(electricity_api_response)
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
 
-    sensor = EssentHighestPriceSensor(coordinator, ENERGY_TYPE_ELECTRICITY)
+    sensor = _sensor(coordinator, "highest_price_today")
 
     assert sensor.native_value == 0.25
     assert sensor.entity_registry_enabled_default is False
@@ -157,25 +242,289 @@ async def test_highest_price_sensor(
     assert "2025-11-16T11:00:00" in sensor.extra_state_attributes["end"]
 
 
-async def test_current_price_energy_dashboard_attributes(
+async def test_tomorrow_aggregate_sensors(
     hass: HomeAssistant, electricity_api_response: dict
+) -> None:
+    """Test tomorrow's aggregates come from the fetched data."""
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
+
+    average = _sensor(coordinator, "average_tomorrow")
+    lowest = _sensor(coordinator, "lowest_price_tomorrow")
+    highest = _sensor(coordinator, "highest_price_tomorrow")
+
+    assert average.native_value == 0.2125
+    assert average.extra_state_attributes == {"min_price": 0.21, "max_price": 0.215}
+    assert lowest.native_value == 0.21
+    assert "2025-11-17T00:00:00" in lowest.extra_state_attributes["start"]
+    assert highest.native_value == 0.215
+    assert "2025-11-17T02:00:00" in highest.extra_state_attributes["end"]
+
+
+async def test_tomorrow_sensors_unpublished(
+    hass: HomeAssistant, electricity_api_response: dict
+) -> None:
+    """Test tomorrow's sensors are unknown until prices are published."""
+    electricity_api_response["prices"][1]["tariffs"] = []
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
+
+    sensor = _sensor(coordinator, "lowest_price_tomorrow")
+
+    assert sensor.native_value is None
+    assert sensor.extra_state_attributes == {}
+
+
+async def test_data_sensors_skip_listener_ticks(
+    hass: HomeAssistant,
+    electricity_api_response: dict,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test sensors based on fetched data only evaluate once per publication."""
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
+    sensor = _sensor(coordinator, "average_tomorrow")
+
+    with (
+        patch.object(sensor, "async_write_ha_state") as write,
+        patch.object(
+            EssentSensor, "native_value", new_callable=PropertyMock, return_value=0.2
+        ) as value,
+    ):
+        for when in ("09:30", "10:30", "11:30"):
+            _tick(coordinator, freezer, f"2025-11-16T{when}:00")
+            sensor._handle_coordinator_update()
+        assert write.call_count == 1
+        assert value.call_count == 1
+
+        coordinator.data = dict(coordinator.data)
+        sensor._handle_coordinator_update()
+        assert value.call_count == 2
+        assert write.call_count == 1
+
+
+async def test_current_price_energy_dashboard_attributes(
+    hass: HomeAssistant,
+    electricity_api_response: dict,
+    freezer: FrozenDateTimeFactory,
 ) -> None:
     """Test current price sensor attributes."""
-    coordinator = _coordinator_from_fixture(electricity_api_response)
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
+    sensor = _sensor(coordinator, "current_price")
+
+    _tick(coordinator, freezer, "2025-11-16T10:30:00")
+
+    attrs = sensor.extra_state_attributes
 
-    sensor = EssentCurrentPriceSensor(coordinator, ENERGY_TYPE_ELECTRICITY)
+    # Should NOT have prices arrays (removed for performance)
+    assert "prices_today" not in attrs
+    assert "prices_tomorrow" not in attrs
+
+    # Should still have current price breakdown
+    assert "price_ex_vat" in attrs
+    assert "market_price" in attrs
+
+
+async def test_price_level_and_percentile_sensors(
+    hass: HomeAssistant,
+    electricity_api_response: dict,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the level and percentile of the current slot within its day."""
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
+    level = _sensor(coordinator, "price_level")
+    percentile = _sensor(coordinator, "price_percentile")
+
+    assert level.device_class == SensorDeviceClass.ENUM
+    assert level.native_unit_of_measurement is None
+    assert percentile.native_unit_of_measurement == "%"
+
+    # Today holds 0.20, 0.25 and 0.22
+    _tick(coordinator, freezer, "2025-11-16T09:30:00")
+    assert level.native_value == "very_cheap"
+    assert percentile.native_value == 0
+    _tick(coordinator, freezer, "2025-11-16T10:30:00")
+    assert level.native_value == "very_expensive"
+    assert percentile.native_value == 100
+    assert percentile.extra_state_attributes == {"rank": 2}
+    _tick(coordinator, freezer, "2025-11-16T11:30:00")
+    assert level.native_value == "normal"
+
+
+async def test_sensor_skips_unchanged_writes(
+    hass: HomeAssistant,
+    electricity_api_response: dict,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test a sensor only writes its state when the level changes."""
+    electricity_api_response["prices"][0]["tariffs"][2]["totalAmount"] = 0.25
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
+    level = _sensor(coordinator, "price_level")
+
+    with patch.object(level, "async_write_ha_state") as write:
+        for when in ("09:30", "10:30", "11:30"):
+            _tick(coordinator, freezer, f"2025-11-16T{when}:00")
+            level._handle_coordinator_update()
+
+    # 10:00 and 11:00 share a price, so the level does not change at 11:00
+    assert write.call_count == 2
+
+
+# Cheap hours 00-05 and 10, and a peak from 17
+LEVEL_PRICES = {hour: 0.2 + hour / 1000 for hour in range(24)} | {
+    3: 0.05,
+    4: 0.06,
+    10: 0.07,
+    18: 0.5,
+    19: 0.51,
+}
+
+
+async def test_timestamp_sensors(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    setup_entry: Callable[..., Awaitable[MockConfigEntry]],
+    day_document: Callable[..., dict],
+) -> None:
+    """Test boundary sensors only change when a boundary is reached."""
+    await setup_entry(
+        datetime(2025, 11, 16, 1, 30),
+        {"prices": [day_document(date(2025, 11, 16), LEVEL_PRICES)]},
+    )
+
+    def _local(entity_id: str) -> str:
+        state = hass.states.get(f"sensor.essent_{entity_id}").state
+        if state == "unknown":
+            return state
+        return dt_util.as_local(dt_util.parse_datetime(state)).strftime("%H:%M")
+
+    def _move_to(hour: int) -> None:
+        moment = dt_util.as_local(datetime(2025, 11, 16, hour))
+        freezer.move_to(moment)
+        async_fire_time_changed(hass, moment)
+
+    assert hass.states.get("sensor.essent_electricity_next_cheap_start").attributes[
+        "device_class"
+    ] == SensorDeviceClass.TIMESTAMP
+    assert _local("electricity_next_cheap_start") == "10:00"
+    assert _local("electricity_next_peak_start") == "17:00"
+    assert _local("electricity_current_slot_end") == "02:00"
+    assert _local("gas_current_slot_end") == "06:00"
+    reported = hass.states.get("sensor.essent_electricity_next_cheap_start")
+
+    _move_to(2)
+    await hass.async_block_till_done()
+    assert _local("electricity_current_slot_end") == "03:00"
+    # Nothing else reached a boundary, so nothing else was written
+    assert (
+        hass.states.get("sensor.essent_electricity_next_cheap_start").last_reported
+        == reported.last_reported
+    )
 
-    with patch("custom_components.essent.sensor.dt_util.now") as mock_now:
-        mock_now.return_value = dt_util.as_local(
-            datetime.fromisoformat("2025-11-16T10:30:00")
+    _move_to(10)
+    await hass.async_block_till_done()
+    assert _local("electricity_next_cheap_start") == "unknown"
+    assert _local("electricity_next_peak_start") == "17:00"
+    assert _local("electricity_current_slot_end") == "11:00"
+
+
+def _meter_event(value: str, when: str, unit: str = "kWh") -> Event:
+    """Create a meter state change event at a local time."""
+    return Event(
+        "state_changed",
+        {
+            "entity_id": "sensor.meter",
+            "old_state": None,
+            "new_state": State(
+                "sensor.meter",
+                value,
+                {"unit_of_measurement": unit},
+                last_updated=dt_util.as_local(datetime.fromisoformat(when)),
+            ),
+        },
+    )
+
+
+async def test_cost_sensor_splits_delta_across_slots(
+    hass: HomeAssistant,
+    electricity_api_response: dict,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the cost sensor prices each part of a delta at its slot's rate."""
+    freezer.move_to(dt_util.as_local(datetime.fromisoformat("2025-11-16T09:00:00")))
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
+
+    sensor = EssentCostSensor(coordinator, ENERGY_TYPE_ELECTRICITY, "sensor.meter")
+    sensor.hass = hass
+
+    assert sensor.device_class == SensorDeviceClass.MONETARY
+    assert sensor.state_class == SensorStateClass.TOTAL
+    assert sensor.native_unit_of_measurement == CURRENCY_EURO
+
+    with patch.object(sensor, "async_write_ha_state"):
+        # First reading only sets the baseline
+        sensor._async_meter_changed(_meter_event("100.0", "2025-11-16T09:30:00"))
+        assert sensor.native_value == 0
+
+        # 2 kWh over 09:30-10:30: 1 kWh at 0.20 and 1 kWh at 0.25
+        sensor._async_meter_changed(_meter_event("102.0", "2025-11-16T10:30:00"))
+        assert round(sensor.native_value, 4) == 0.45
+
+        # Readings in Wh are converted to the kWh price unit
+        sensor._async_meter_changed(
+            _meter_event("103000", "2025-11-16T11:30:00", unit="Wh")
         )
+        assert round(sensor.native_value, 4) == 0.685
 
-        attrs = sensor.extra_state_attributes
+        # A meter reset only establishes a new baseline
+        sensor._async_meter_changed(_meter_event("1.0", "2025-11-16T11:45:00"))
+        assert round(sensor.native_value, 4) == 0.685
 
-        # Should NOT have prices arrays (removed for performance)
-        assert "prices_today" not in attrs
-        assert "prices_tomorrow" not in attrs
+    assert sensor.extra_state_attributes["unpriced_consumption"] == 0
 
-        # Should still have current price breakdown
-        assert "price_ex_vat" in attrs
-        assert "market_price" in attrs
+
+async def test_cost_sensor_reports_unpriced_consumption(
+    hass: HomeAssistant,
+    electricity_api_response: dict,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test consumption outside the known slots is not priced."""
+    freezer.move_to(dt_util.as_local(datetime.fromisoformat("2025-11-16T09:00:00")))
+    coordinator = _coordinator_from_fixture(hass, electricity_api_response)
+
+    sensor = EssentCostSensor(coordinator, ENERGY_TYPE_ELECTRICITY, "sensor.meter")
+    sensor.hass = hass
+
+    with patch.object(sensor, "async_write_ha_state"):
+        sensor._async_meter_changed(_meter_event("10.0", "2025-11-16T11:30:00"))
+        sensor._async_meter_changed(_meter_event("12.0", "2025-11-16T12:30:00"))
+
+    # Only 11:30-12:00 is covered by a slot in the fixture
+    assert round(sensor.native_value, 4) == 0.22
+    assert round(sensor.extra_state_attributes["unpriced_consumption"], 4) == 1.0
+
+
+async def test_cost_sensor_ignores_price_updates(
+    hass: HomeAssistant,
+    electricity_api_response: dict,
+) -> None:
+    """Test price updates only write the cost when availability changes."""
+    coordinator = EssentDataUpdateCoordinator(hass)
+    sensor = EssentCostSensor(coordinator, ENERGY_TYPE_ELECTRICITY, "sensor.meter")
+    sensor.hass = hass
+
+    with patch.object(Entity, "async_write_ha_state") as write:
+        # A meter update before the first fetch is not priced
+        sensor._async_meter_changed(_meter_event("100.0", "2025-11-16T09:30:00"))
+        assert sensor.native_value == 0
+        assert sensor._last_reading is None
+
+        sensor._handle_coordinator_update()
+        assert write.call_count == 1
+        coordinator.data = _coordinator_from_fixture(
+            hass, electricity_api_response
+        ).data
+        sensor._handle_coordinator_update()
+        sensor._handle_coordinator_update()
+        assert write.call_count == 1
+
+        coordinator.last_update_success = False
+        sensor._handle_coordinator_update()
+        assert write.call_count == 2
@@ -0,0 +1,417 @@
+"""Test the Essent services."""
+import asyncio
+from datetime import date, datetime, timedelta
+import json
+from pathlib import Path
+import pstats
+import tracemalloc
+from unittest.mock import AsyncMock, patch
+
+from aiohttp import ClientError
+from freezegun.api import FrozenDateTimeFactory
+
+import pytest
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.recorder.common import (
+    async_wait_recording_done,
+)
+import voluptuous as vol
+
+from custom_components.essent.const import (
+    DOMAIN,
+    SERVICE_COMPARE_CONTRACT,
+    SERVICE_GET_PRICE_AT,
+    SERVICE_PROFILE,
+    SERVICE_REFRESH,
+)
+
+
+async def _setup_entry(hass: HomeAssistant, essent_api_response: dict) -> None:
+    """Set up the integration with a fixture payload."""
+    with patch(
+        "custom_components.essent.pipeline.async_get_clientsession"
+    ) as mock_session, patch("homeassistant.util.dt.now") as mock_now:
+        mock_now.return_value = dt_util.as_local(
+            dt_util.parse_datetime("2025-11-16T12:00:00")
+        )
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.text = AsyncMock(return_value=json.dumps(essent_api_response))
+        session = AsyncMock()
+        session.get = AsyncMock(return_value=mock_response)
+        mock_session.return_value = session
+
+        entry = MockConfigEntry(domain=DOMAIN, title="Essent", data={})
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+
+async def test_get_price_at(
+    hass: HomeAssistant,
+    essent_api_response: dict,
+    enable_custom_integrations: None,
+) -> None:
+    """Test prices are returned in request order with their breakdown."""
+    await _setup_entry(hass, essent_api_response)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_PRICE_AT,
+        {
+            "energy_type": "electricity",
+            "timestamps": [
+                "2025-11-16T11:15:00",
+                "2025-11-16T08:00:00",
+                "2025-11-16T10:30:00",
+                "2025-11-17T00:45:00",
+            ],
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    prices = response["prices"]
+    assert response["unit"] == "kWh"
+    assert [price and price["price"] for price in prices] == [0.22, None, 0.25, 0.21]
+    assert prices[0]["timestamp"].startswith("2025-11-16T11:15:00")
+    assert prices[2]["start_time"].startswith("2025-11-16T10:00:00")
+    assert "market_price" in prices[2]
+
+
+async def test_get_price_at_resolution(
+    hass: HomeAssistant,
+    essent_api_response: dict,
+    enable_custom_integrations: None,
+) -> None:
+    """Test lookups against a resampled view of the timeline."""
+    await _setup_entry(hass, essent_api_response)
+    coordinator = hass.config_entries.async_entries(DOMAIN)[0].runtime_data
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_PRICE_AT,
+        {
+            "energy_type": "electricity",
+            "timestamps": ["2025-11-16T10:20:00"],
+            "resolution": "15min",
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    price = response["prices"][0]
+    assert response["resolution"] == "15min"
+    assert price["price"] == 0.25
+    assert price["start_time"].startswith("2025-11-16T10:15:00")
+    assert price["end_time"].startswith("2025-11-16T10:30:00")
+    # The view is built once and reused until new data arrives
+    assert coordinator.resampled("electricity", "15min") is coordinator.resampled(
+        "electricity", "15min"
+    )
+
+
+async def test_get_price_at_invalid_energy_type(
+    hass: HomeAssistant,
+    essent_api_response: dict,
+    enable_custom_integrations: None,
+) -> None:
+    """Test an unknown energy type is rejected."""
+    await _setup_entry(hass, essent_api_response)
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_PRICE_AT,
+            {"energy_type": "water", "timestamps": ["2025-11-16T11:15:00"]},
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_get_price_at_not_loaded(
+    hass: HomeAssistant, enable_custom_integrations: None
+) -> None:
+    """Test the service reports when the integration is not loaded."""
+    assert await async_setup_component(hass, DOMAIN, {})
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_PRICE_AT,
+            {"energy_type": "gas", "timestamps": ["2025-11-16T11:15:00"]},
+            blocking=True,
+            return_response=True,
+        )
+
+
+async def test_refresh(
+    hass: HomeAssistant,
+    essent_api_response: dict,
+    freezer: FrozenDateTimeFactory,
+    enable_custom_integrations: None,
+) -> None:
+    """Test on-demand refreshes are rate limited and share one fetch."""
+    freezer.move_to(dt_util.as_local(dt_util.parse_datetime("2025-11-16T10:30:00")))
+    fetched = asyncio.Event()
+
+    async def _get(*args, **kwargs) -> AsyncMock:
+        await fetched.wait()
+        return mock_response
+
+    mock_response = AsyncMock()
+    mock_response.status = 200
+    mock_response.headers = {"Content-Type": "application/json"}
+    mock_response.text = AsyncMock(return_value=json.dumps(essent_api_response))
+    session = AsyncMock()
+    session.get = AsyncMock(side_effect=_get)
+    with patch(
+        "custom_components.essent.pipeline.async_get_clientsession",
+        return_value=session,
+    ):
+        fetched.set()
+        entry = MockConfigEntry(
+            domain=DOMAIN, title="Essent", data={}, pref_disable_polling=True
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        # Right after the setup fetch the cached prices are returned
+        response = await hass.services.async_call(
+            DOMAIN, SERVICE_REFRESH, blocking=True, return_response=True
+        )
+        assert response["outcome"] == "too_soon"
+        assert response["data_age_seconds"] == 0
+        assert response["prices"]["electricity"]["current_price"] == 0.25
+        assert response["prices"]["electricity"]["tomorrow_available"] is True
+        assert session.get.call_count == 1
+
+        # Concurrent calls share one fetch
+        freezer.tick(timedelta(minutes=5))
+        fetched.clear()
+        calls = [
+            hass.async_create_task(
+                hass.services.async_call(
+                    DOMAIN, SERVICE_REFRESH, blocking=True, return_response=True
+                )
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        fetched.set()
+        responses = await asyncio.gather(*calls)
+        assert session.get.call_count == 2
+        assert [response["outcome"] for response in responses] == ["fetched"] * 3
+        assert sorted(response["coalesced"] for response in responses) == [
+            False,
+            True,
+            True,
+        ]
+        assert responses[0]["data_age_seconds"] == 0
+
+        freezer.tick(timedelta(minutes=5))
+        session.get.side_effect = ClientError("boom")
+        response = await hass.services.async_call(
+            DOMAIN, SERVICE_REFRESH, blocking=True, return_response=True
+        )
+        assert response["outcome"] == "failed"
+        assert response["data_age_seconds"] == 300
+
+        with pytest.raises(vol.Invalid):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_REFRESH,
+                {"energy_type": "gas"},
+                blocking=True,
+                return_response=True,
+            )
+
+
+def _hourly_history_days(first: date, days: int) -> dict[str, list[tuple]]:
+    """Generate hourly history slots priced 0.2 plus the hour / 100."""
+    result = {}
+    for offset in range(days):
+        day = first + timedelta(days=offset)
+        start = dt_util.start_of_local_day(day)
+        result[day.isoformat()] = [
+            (
+                (start + timedelta(hours=hour)).timestamp(),
+                (start + timedelta(hours=hour + 1)).timestamp(),
+                0.2 + hour / 100,
+            )
+            for hour in range(24)
+        ]
+    return result
+
+
+async def test_compare_contract(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    essent_api_response: dict,
+    freezer: FrozenDateTimeFactory,
+    enable_custom_integrations: None,
+) -> None:
+    """Test consumption is priced per month on both tariffs."""
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    freezer.move_to(dt_util.as_local(datetime(2025, 2, 10, 12)))
+    with patch(
+        "custom_components.essent.pipeline.async_get_clientsession"
+    ) as mock_session:
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.text = AsyncMock(return_value=json.dumps(essent_api_response))
+        mock_session.return_value.get = AsyncMock(return_value=mock_response)
+        entry = MockConfigEntry(
+            domain=DOMAIN, title="Essent", data={}, pref_disable_polling=True
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    # Prices are retained up to February 3rd
+    entry.runtime_data.history.async_record_days(
+        "electricity", _hourly_history_days(date(2025, 1, 20), 15)
+    )
+    # One kWh per hour, recorded in Wh, from January 30th
+    first_hour = dt_util.as_utc(dt_util.start_of_local_day(date(2025, 1, 30)))
+    async_add_external_statistics(
+        hass,
+        {
+            "has_mean": False,
+            "has_sum": True,
+            "name": None,
+            "source": "meter",
+            "statistic_id": "meter:consumption",
+            "unit_of_measurement": "Wh",
+        },
+        [
+            {"start": first_hour + timedelta(hours=hour), "sum": 1000.0 * hour}
+            for hour in range(-1, 24 * 7)
+        ],
+    )
+    await async_wait_recording_done(hass)
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_COMPARE_CONTRACT,
+        {
+            "statistic_id": "meter:consumption",
+            "start_date": "2025-01-30",
+            "end_date": "2025-02-05",
+            "fixed_price": 0.25,
+            "fixed_daily_fee": 0.5,
+            "dynamic_daily_fee": 0.3,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    january, february = response["months"]
+    assert january == {
+        "month": "2025-01",
+        "days": 2,
+        "consumption": 48.0,
+        "priced_consumption": 48.0,
+        "unpriced_consumption": 0.0,
+        "unpriced_hours": 0,
+        "dynamic_cost": 15.72,
+        "fixed_cost": 13.0,
+        "difference": 2.72,
+    }
+    # February 4th and 5th have no retained prices
+    assert february["days"] == 5
+    assert february["consumption"] == 120.0
+    assert february["priced_consumption"] == 72.0
+    assert february["unpriced_hours"] == 48
+    assert february["dynamic_cost"] == 24.18
+    assert february["fixed_cost"] == 20.5
+    assert response["total"]["days"] == 7
+    assert response["total"]["difference"] == round(2.72 + 24.18 - 20.5, 2)
+
+    with pytest.raises(ServiceValidationError) as err:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_COMPARE_CONTRACT,
+            {
+                "statistic_id": "meter:unknown",
+                "start_date": "2025-01-30",
+                "end_date": "2025-02-05",
+                "fixed_price": 0.25,
+            },
+            blocking=True,
+            return_response=True,
+        )
+    assert err.value.translation_key == "unknown_statistic"
+
+    with pytest.raises(ServiceValidationError) as err:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_COMPARE_CONTRACT,
+            {
+                "statistic_id": "meter:consumption",
+                "start_date": "2025-02-05",
+                "end_date": "2025-02-11",
+                "fixed_price": 0.25,
+            },
+            blocking=True,
+            return_response=True,
+        )
+    assert err.value.translation_key == "invalid_compare_range"
+
+
+async def test_profile(
+    hass: HomeAssistant,
+    essent_api_response: dict,
+    freezer: FrozenDateTimeFactory,
+    enable_custom_integrations: None,
+) -> None:
+    """Test a refresh is profiled and the integration's entries returned."""
+    freezer.move_to(dt_util.as_local(dt_util.parse_datetime("2025-11-16T10:30:00")))
+    with patch(
+        "custom_components.essent.pipeline.async_get_clientsession"
+    ) as mock_session:
+        mock_response = AsyncMock()
+        mock_response.status = 200
+        mock_response.headers = {"Content-Type": "application/json"}
+        mock_response.text = AsyncMock(return_value=json.dumps(essent_api_response))
+        mock_session.return_value.get = AsyncMock(return_value=mock_response)
+        entry = MockConfigEntry(
+            domain=DOMAIN, title="Essent", data={}, pref_disable_polling=True
+        )
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        response = await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PROFILE,
+            {"trace_allocations": True, "top": 100},
+            blocking=True,
+            return_response=True,
+        )
+
+    stats_file = Path(response["stats_file"])
+    try:
+        assert stats_file.parent == Path(hass.config.config_dir)
+        assert pstats.Stats(str(stats_file)).total_calls > 0
+    finally:
+        stats_file.unlink()
+    assert response["last_update_success"] is True
+    functions = response["functions"]
+    assert 0 < len(functions) <= 100
+    assert {"module", "line", "function", "calls"} <= set(functions[0])
+    # Both the fetch and the fan-out to the entities are captured; which
+    # resumed coroutine frames cProfile attributes varies between runs
+    modules = {entry["module"] for entry in functions}
+    assert {"coordinator.py", "pipeline.py", "sensor.py"} <= modules
+    assert all(entry["module"].endswith(".py") for entry in response["allocations"])
+    assert not tracemalloc.is_tracing()
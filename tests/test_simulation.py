@@ -0,0 +1,369 @@
+"""Replay generated publications through the integration in simulated time.
+
+The harness sets up the integration against a stub of the Essent API and
+moves Home Assistant's clock forward across every scheduled fetch and
+listener tick. It records each fetch, tick and state write, and how long the
+electricity price sensor showed something other than the price in effect.
+The cost of each simulated day is measured in process CPU time, because the
+wall and monotonic clocks follow the simulated clock.
+"""
+import asyncio
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+import json
+import math
+import time
+from unittest.mock import patch
+
+from aiohttp import ClientError
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import RANDOM_MICROSECOND_MAX
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.essent.const import DOMAIN
+
+TIME_ZONE = "Europe/Amsterdam"
+FETCH_MINUTE_OFFSET = 17
+PUBLISH_HOUR = 15
+
+
+def _electricity_price(start: datetime) -> float:
+    """Return the generated electricity price of the hour starting at a time."""
+    daily = 0.08 * math.sin((start.hour - 6) / 24 * 2 * math.pi)
+    return round(0.2 + daily + start.timetuple().tm_yday % 7 / 100, 5)
+
+
+def _day_document(day: date) -> dict:
+    """Generate the API document of a single day with naive local times."""
+    time_zone = dt_util.get_default_time_zone()
+    current = datetime(day.year, day.month, day.day, tzinfo=time_zone)
+    stop = datetime.combine(day + timedelta(days=1), datetime.min.time(), time_zone)
+    current, stop = current.astimezone(dt_util.UTC), stop.astimezone(dt_util.UTC)
+    tariffs = []
+    while current < stop:
+        local = current.astimezone(time_zone)
+        tariffs.append(
+            {
+                "startDateTime": local.replace(tzinfo=None).isoformat(),
+                "endDateTime": (current + timedelta(hours=1))
+                .astimezone(time_zone)
+                .replace(tzinfo=None)
+                .isoformat(),
+                "totalAmount": _electricity_price(local),
+            }
+        )
+        current += timedelta(hours=1)
+    gas_start = datetime.combine(day, datetime.min.time()) + timedelta(hours=6)
+    return {
+        "date": day.isoformat(),
+        "electricity": {"unitOfMeasurement": "kWh", "tariffs": tariffs},
+        "gas": {
+            "unitOfMeasurement": "m³",
+            "tariffs": [
+                {
+                    "startDateTime": gas_start.isoformat(),
+                    "endDateTime": (gas_start + timedelta(days=1)).isoformat(),
+                    "totalAmount": 1.2,
+                }
+            ],
+        },
+    }
+
+
+@dataclass
+class SimulationScenario:
+    """What the stub API serves over the simulated period."""
+
+    start: date
+    days: int
+    # Local hour at which tomorrow's prices appear, for late publications
+    late_publications: dict[date, int] = field(default_factory=dict)
+    # Local [start, end) windows in which the API is down
+    outages: list[tuple[datetime, datetime]] = field(default_factory=list)
+
+
+@dataclass
+class SimulationReport:
+    """Everything recorded while replaying a scenario."""
+
+    fetches: list[tuple[datetime, int | None]] = field(default_factory=list)
+    # Ticks of all listeners (None) or of one energy type's listeners
+    ticks: list[tuple[datetime, str | None]] = field(default_factory=list)
+    state_writes: list[tuple[datetime, str]] = field(default_factory=list)
+    wrong_price_seconds: float = 0.0
+    day_cpu_times: list[float] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        """Return the totals used to compare scheduling changes."""
+        return {
+            "days": len(self.day_cpu_times),
+            "api_calls": len(self.fetches),
+            "failed_fetches": sum(status != 200 for _, status in self.fetches),
+            "ticks": len(self.ticks),
+            "state_writes": len(self.state_writes),
+            "wrong_price_seconds": self.wrong_price_seconds,
+            "cpu_ms_per_day": round(
+                1000 * sum(self.day_cpu_times) / max(len(self.day_cpu_times), 1), 2
+            ),
+            "max_cpu_ms_per_day": round(1000 * max(self.day_cpu_times, default=0), 2),
+        }
+
+
+@dataclass
+class StubResponse:
+    """A successful API response, lighter than a mock over a year of fetches."""
+
+    body: str
+    status: int = 200
+    headers: dict[str, str] = field(
+        default_factory=lambda: {"Content-Type": "application/json"}
+    )
+
+    async def text(self) -> str:
+        """Return the response body."""
+        return self.body
+
+
+class StubEssentApi:
+    """Serve generated documents like the dynamic prices endpoint."""
+
+    def __init__(self, scenario: SimulationScenario, report: SimulationReport) -> None:
+        """Initialize the stub."""
+        self._scenario = scenario
+        self._report = report
+        self._documents: dict[date, dict] = {}
+
+    def _document(self, day: date) -> dict:
+        if (document := self._documents.get(day)) is None:
+            document = self._documents[day] = _day_document(day)
+        return document
+
+    async def get(self, url: str, **kwargs) -> StubResponse:
+        """Return the documents published at the current simulated time."""
+        now = dt_util.now()
+        if any(start <= now < end for start, end in self._scenario.outages):
+            self._report.fetches.append((now, None))
+            raise ClientError("Simulated outage")
+
+        today = now.date()
+        publish_hour = self._scenario.late_publications.get(today, PUBLISH_HOUR)
+        prices = [self._document(today)]
+        if now.hour >= publish_hour:
+            prices.append(self._document(today + timedelta(days=1)))
+        payload = {"prices": prices}
+
+        self._report.fetches.append((now, 200))
+        return StubResponse(json.dumps(payload))
+
+
+def _steps(start: datetime, end: datetime) -> list[datetime]:
+    """Return every hour boundary and fetch time between two UTC times."""
+    steps = []
+    current = start
+    while current < end:
+        steps.append(current)
+        steps.append(current + timedelta(minutes=FETCH_MINUTE_OFFSET))
+        current += timedelta(hours=1)
+    return steps
+
+
+async def async_simulate(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    scenario: SimulationScenario,
+) -> SimulationReport:
+    """Replay a scenario through the integration and report what happened."""
+    await hass.config.async_set_time_zone(TIME_ZONE)
+    time_zone = dt_util.get_default_time_zone()
+    report = SimulationReport()
+    stub = StubEssentApi(scenario, report)
+    start = datetime.combine(scenario.start, datetime.min.time(), time_zone)
+    end = datetime.combine(
+        scenario.start + timedelta(days=scenario.days), datetime.min.time(), time_zone
+    )
+    freezer.move_to(start + timedelta(minutes=1))
+    # The loop clock follows the simulated one, so every step looks slow, and
+    # the source tracebacks debug mode keeps for each callback dominate a year
+    hass.loop.slow_callback_duration = math.inf
+    hass.loop.set_debug(False)
+
+    @callback
+    def _is_essent(event_data: dict) -> bool:
+        return event_data["entity_id"].split(".")[1].startswith(DOMAIN)
+
+    @callback
+    def _record_write(event: Event) -> None:
+        report.state_writes.append((dt_util.utcnow(), event.data["entity_id"]))
+
+    for event_type in (EVENT_STATE_CHANGED, EVENT_STATE_REPORTED):
+        hass.bus.async_listen(event_type, _record_write, event_filter=_is_essent)
+
+    with (
+        patch(
+            "custom_components.essent.pipeline.async_get_clientsession",
+            return_value=stub,
+        ),
+        patch(
+            "custom_components.essent.coordinator.random.randint",
+            return_value=FETCH_MINUTE_OFFSET,
+        ),
+    ):
+        entry = MockConfigEntry(domain=DOMAIN, title="Essent", data={})
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator = entry.runtime_data
+        update_listeners = coordinator.async_update_listeners
+        update_energy_type_listeners = coordinator.async_update_energy_type_listeners
+
+        @callback
+        def _record_tick() -> None:
+            report.ticks.append((dt_util.utcnow(), None))
+            update_listeners()
+
+        @callback
+        def _record_energy_type_tick(energy_type: str) -> None:
+            report.ticks.append((dt_util.utcnow(), energy_type))
+            update_energy_type_listeners(energy_type)
+
+        coordinator.async_update_listeners = _record_tick
+        coordinator.async_update_energy_type_listeners = _record_energy_type_tick
+        entity_id = er.async_get(hass).async_get_entity_id(
+            "sensor", DOMAIN, "essent_electricity_current_price"
+        )
+
+        now = dt_util.utcnow()
+        day = dt_util.as_local(now).date()
+        day_started = time.process_time()
+        for step in _steps(start.astimezone(dt_util.UTC), end.astimezone(dt_util.UTC)):
+            if step <= now:
+                continue
+            # The state shown since the previous step lasted until this one
+            state = hass.states.get(entity_id)
+            expected = _electricity_price(
+                dt_util.as_local(now).replace(minute=0, second=0, microsecond=0)
+            )
+            try:
+                correct = abs(float(state.state) - expected) < 1e-9
+            except ValueError:
+                correct = False
+            if not correct:
+                report.wrong_price_seconds += (step - now).total_seconds()
+
+            if (step_day := dt_util.as_local(step).date()) != day:
+                report.day_cpu_times.append(time.process_time() - day_started)
+                day, day_started = step_day, time.process_time()
+            # Timers follow the frozen clock, so moving it past the random
+            # sub-second offset of the time trackers lets the loop run them
+            freezer.move_to(step + timedelta(microseconds=RANDOM_MICROSECOND_MAX))
+            await asyncio.sleep(0)
+            await hass.async_block_till_done()
+            now = step
+        report.day_cpu_times.append(time.process_time() - day_started)
+
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        await hass.async_block_till_done()
+    return report
+
+
+async def test_simulated_fortnight_across_dst(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    enable_custom_integrations: None,
+) -> None:
+    """Test two weeks spanning the autumn clock change run on schedule."""
+    report = await async_simulate(
+        hass, freezer, SimulationScenario(start=date(2025, 10, 19), days=14)
+    )
+    summary = report.summary()
+
+    assert summary["days"] == 14
+    # The setup fetch, then one per hour from the second hour on; the
+    # clock change adds an hour
+    assert summary["api_calls"] == 1 + 14 * 24
+    assert summary["failed_fetches"] == 0
+    assert summary["wrong_price_seconds"] == 0
+    # Price sensors change hourly, data-only entities once per publication
+    assert summary["state_writes"] < len(report.ticks) * 10
+    # Electricity listeners wake every hour from the second one on; gas
+    # listeners only at the gas day boundary and at midnight
+    per_type = Counter(energy_type for _, energy_type in report.ticks)
+    assert per_type["electricity"] == 14 * 24
+    assert per_type["gas"] == 14 + 13
+
+
+async def test_simulated_late_publication_and_outage(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    enable_custom_integrations: None,
+) -> None:
+    """Test an outage over a late publication shows up as wrong prices."""
+    time_zone = dt_util.get_time_zone(TIME_ZONE)
+    scenario = SimulationScenario(
+        start=date(2025, 11, 10),
+        days=3,
+        late_publications={date(2025, 11, 10): 23},
+        outages=[
+            (
+                datetime(2025, 11, 10, 22, tzinfo=time_zone),
+                datetime(2025, 11, 11, 2, tzinfo=time_zone),
+            )
+        ],
+    )
+
+    report = await async_simulate(hass, freezer, scenario)
+    summary = report.summary()
+
+    assert summary["failed_fetches"] == 4
+    # A failed fetch marks the sensors unavailable, so the price is wrong
+    # from the first failure at 22:17 until the next good fetch at 02:17
+    assert summary["wrong_price_seconds"] == 4 * 3600
+
+
+async def test_simulated_year(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    enable_custom_integrations: None,
+    record_property: Callable[[str, object], None],
+) -> None:
+    """Test a year with a late publication and an outage each month."""
+    time_zone = dt_util.get_time_zone(TIME_ZONE)
+    start = date(2025, 1, 1)
+    scenario = SimulationScenario(
+        start=start,
+        days=365,
+        late_publications={date(2025, month, 14): 21 for month in range(1, 13)},
+        outages=[
+            (
+                datetime(2025, month, 3, 9, tzinfo=time_zone),
+                datetime(2025, month, 3, 11, tzinfo=time_zone),
+            )
+            for month in range(1, 13)
+        ],
+    )
+
+    report = await async_simulate(hass, freezer, scenario)
+    summary = report.summary()
+    for key, value in summary.items():
+        record_property(key, value)
+
+    assert summary["days"] == 365
+    # The setup fetch, then one per hour from the second hour on; the two
+    # clock changes cancel out
+    assert summary["api_calls"] == 365 * 24
+    # Each outage fails the fetches at 09:17 and 10:17
+    assert summary["failed_fetches"] == 12 * 2
+    # and leaves the sensors unavailable until the good fetch at 11:17
+    assert summary["wrong_price_seconds"] == 12 * 2 * 3600
+    # Price sensors change hourly, data-only entities once per publication
+    assert summary["state_writes"] < len(report.ticks) * 10
+    per_type = Counter(energy_type for _, energy_type in report.ticks)
+    assert per_type["electricity"] == 365 * 24 - 1
+    assert per_type["gas"] == 365 + 364
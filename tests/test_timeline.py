@@ -0,0 +1,334 @@
+"""Test the Essent timeline validation."""
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.essent.timeline import (
+    build_timeline,
+    cheapest_windows,
+    rank_slots,
+    resample,
+)
+
+AMSTERDAM = ZoneInfo("Europe/Amsterdam")
+
+
+def _generate_day(day: date, slot_minutes: int = 60, price: float = 0.2) -> list[dict]:
+    """Generate a day of tariffs with naive wall-clock times like the API."""
+    start = datetime(day.year, day.month, day.day, tzinfo=AMSTERDAM)
+    end = datetime.combine(day + timedelta(days=1), datetime.min.time(), AMSTERDAM)
+    current = start.astimezone(dt_util.UTC)
+    stop = end.astimezone(dt_util.UTC)
+    step = timedelta(minutes=slot_minutes)
+    tariffs = []
+    while current < stop:
+        local_start = current.astimezone(AMSTERDAM).replace(tzinfo=None)
+        local_end = (current + step).astimezone(AMSTERDAM).replace(tzinfo=None)
+        tariffs.append(
+            {
+                "startDateTime": local_start.isoformat(),
+                "endDateTime": local_end.isoformat(),
+                "totalAmount": price + len(tariffs) / 1000,
+            }
+        )
+        current += step
+    return tariffs
+
+
+def _assert_contiguous(timeline, slot_seconds: int) -> None:
+    """Assert slots follow each other without gaps and have a fixed length."""
+    for previous, slot in zip(timeline.slots, timeline.slots[1:]):
+        assert slot.start == previous.end
+    assert all(slot.end - slot.start == slot_seconds for slot in timeline.slots)
+
+
+def test_regular_day_has_no_issues() -> None:
+    """Test a plain 24 hour day validates cleanly."""
+    timeline = build_timeline(_generate_day(date(2025, 11, 16)), AMSTERDAM)
+
+    assert len(timeline) == 24
+    assert timeline.report.issues == []
+    assert timeline.report.dst_days == []
+    _assert_contiguous(timeline, 3600)
+
+
+def test_spring_forward_day() -> None:
+    """Test the 23 hour day when clocks go forward."""
+    timeline = build_timeline(_generate_day(date(2025, 3, 30)), AMSTERDAM)
+
+    assert len(timeline) == 23
+    assert timeline.report.issues == []
+    assert timeline.report.dst_days == [{"date": "2025-03-30", "hours": 23}]
+    _assert_contiguous(timeline, 3600)
+
+
+def test_fall_back_day_resolves_repeated_hour() -> None:
+    """Test the 25 hour day maps the repeated wall-clock hour twice."""
+    tariffs = _generate_day(date(2025, 10, 26))
+    assert [t["startDateTime"] for t in tariffs].count("2025-10-26T02:00:00") == 2
+
+    timeline = build_timeline(tariffs, AMSTERDAM)
+
+    assert len(timeline) == 25
+    assert timeline.report.issues == []
+    assert timeline.report.dst_days == [{"date": "2025-10-26", "hours": 25}]
+    _assert_contiguous(timeline, 3600)
+    # Each repeated slot keeps its own price
+    repeated = timeline.slots[2:4]
+    assert [slot.price for slot in repeated] == [0.202, 0.203]
+    second_two_am = datetime(2025, 10, 26, 2, tzinfo=AMSTERDAM, fold=1)
+    assert repeated[0].end == second_two_am.timestamp()
+
+
+def test_fall_back_day_with_wall_clock_ends() -> None:
+    """Test the repeated hour when both slots claim to end at 03:00."""
+    tariffs = _generate_day(date(2025, 10, 26))
+    tariffs[2]["endDateTime"] = "2025-10-26T03:00:00"
+
+    timeline = build_timeline(tariffs, AMSTERDAM)
+
+    assert len(timeline) == 25
+    assert timeline.report.issues == []
+    _assert_contiguous(timeline, 3600)
+
+
+def test_fall_back_day_quarter_hours() -> None:
+    """Test 15 minute slots across the repeated hour."""
+    timeline = build_timeline(
+        _generate_day(date(2025, 10, 26), slot_minutes=15), AMSTERDAM
+    )
+
+    assert len(timeline) == 100
+    assert timeline.report.issues == []
+    _assert_contiguous(timeline, 900)
+
+
+def test_daily_gas_slot_spanning_fall_back() -> None:
+    """Test a gas day across the clock change lasts 25 hours."""
+    timeline = build_timeline(
+        [
+            {
+                "startDateTime": "2025-10-25T06:00:00",
+                "endDateTime": "2025-10-26T06:00:00",
+                "totalAmount": 1.2,
+            }
+        ],
+        AMSTERDAM,
+    )
+
+    slot = timeline.slots[0]
+    assert slot.end - slot.start == 25 * 3600
+
+
+def test_nonexistent_wall_time_is_flagged() -> None:
+    """Test a slot in the skipped hour is dropped and reported."""
+    tariffs = _generate_day(date(2025, 3, 30))
+    tariffs.insert(
+        2,
+        {
+            "startDateTime": "2025-03-30T02:00:00",
+            "endDateTime": "2025-03-30T03:00:00",
+            "totalAmount": 0.3,
+        },
+    )
+
+    timeline = build_timeline(tariffs, AMSTERDAM)
+
+    assert len(timeline) == 23
+    assert [issue.kind for issue in timeline.report.issues] == ["invalid_start"]
+
+
+def test_duplicates_overlaps_and_gaps() -> None:
+    """Test duplicates are dropped, overlaps clipped and gaps flagged."""
+    tariffs = [
+        {
+            "startDateTime": "2025-11-16T09:00:00",
+            "endDateTime": "2025-11-16T10:00:00",
+            "totalAmount": 0.2,
+        },
+        {
+            "startDateTime": "2025-11-16T09:00:00",
+            "endDateTime": "2025-11-16T10:00:00",
+            "totalAmount": 0.2,
+        },
+        {
+            "startDateTime": "2025-11-16T09:30:00",
+            "endDateTime": "2025-11-16T11:00:00",
+            "totalAmount": 0.25,
+        },
+        {
+            "startDateTime": "2025-11-16T12:00:00",
+            "endDateTime": "2025-11-16T13:00:00",
+            "totalAmount": None,
+        },
+    ]
+
+    timeline = build_timeline(tariffs, AMSTERDAM)
+    report = timeline.report.as_dict()
+
+    assert len(timeline) == 3
+    assert report["issue_counts"] == {
+        "missing_price": 1,
+        "duplicate": 1,
+        "overlap": 1,
+        "gap": 1,
+    }
+    # The overlapping slot starts where the previous one ends
+    assert timeline.slots[1].start == timeline.slots[0].end
+    assert timeline.slots[2].price is None
+
+
+def test_mixed_offsets_are_normalised() -> None:
+    """Test explicit offsets are normalised to UTC and reordered."""
+    tariffs = [
+        {
+            "startDateTime": "2025-11-16T10:00:00Z",
+            "endDateTime": "2025-11-16T11:00:00Z",
+            "totalAmount": 0.22,
+        },
+        {
+            "startDateTime": "2025-11-16T10:00:00+01:00",
+            "endDateTime": "2025-11-16T11:00:00+01:00",
+            "totalAmount": 0.2,
+        },
+    ]
+
+    timeline = build_timeline(tariffs, AMSTERDAM)
+
+    assert [issue.kind for issue in timeline.report.issues] == ["out_of_order"]
+    assert [slot.price for slot in timeline.slots] == [0.2, 0.22]
+    assert timeline.slots[1].start == timeline.slots[0].end
+
+
+def test_slot_lookup_with_hint() -> None:
+    """Test slot lookups by timestamp, with and without a hint."""
+    timeline = build_timeline(_generate_day(date(2025, 11, 16)), AMSTERDAM)
+    noon = datetime(2025, 11, 16, 12, 30, tzinfo=AMSTERDAM).timestamp()
+
+    idx = timeline.index_at(noon)
+    assert idx == 12
+    assert timeline.index_at(noon + 3600, hint=idx) == 13
+    assert timeline.next_after(noon).price == timeline.slots[13].price
+    assert timeline.slot_at(noon + 86400) is None
+
+
+def test_rank_slots_per_day() -> None:
+    """Test slots are ranked against the other slots of their own day."""
+    tariffs = _generate_day(date(2025, 11, 16), price=0.2) + _generate_day(
+        date(2025, 11, 17), price=0.5
+    )
+    tariffs[5]["totalAmount"] = tariffs[6]["totalAmount"]
+    timeline = build_timeline(tariffs, AMSTERDAM)
+
+    ranking = rank_slots(timeline, (10, 30, 70, 90), AMSTERDAM)
+
+    # Each day starts at rank 0 despite tomorrow being more expensive
+    assert ranking.ranks[0] == 0
+    assert ranking.ranks[24] == 0
+    assert ranking.percentiles[23] == 100
+    assert ranking.levels[0] == "very_cheap"
+    assert ranking.levels[23] == "very_expensive"
+    assert ranking.levels[12] == "normal"
+    # Equal prices share a rank
+    assert ranking.ranks[5] == ranking.ranks[6] == 5
+
+
+def test_batch_lookup_matches_single_lookups() -> None:
+    """Test a batch lookup answers unsorted timestamps in input order."""
+    timeline = build_timeline(
+        _generate_day(date(2025, 10, 26), slot_minutes=15), AMSTERDAM
+    )
+    first = timeline.slots[0].start
+    timestamps = [first + offset for offset in (7200.0, -1.0, 0.0, 4000.0, 7200.0)]
+    timestamps.append(timeline.slots[-1].end)
+
+    indices = timeline.indices_at(timestamps)
+
+    assert indices == [timeline.index_at(timestamp) for timestamp in timestamps]
+    assert indices[1] is None
+    assert indices[-1] is None
+    assert indices[0] == indices[4] == 8
+
+
+def test_resample_quarter_hours_to_hours() -> None:
+    """Test quarter-hour slots are averaged into hourly buckets."""
+    timeline = build_timeline(
+        _generate_day(date(2025, 11, 16), slot_minutes=15), AMSTERDAM
+    )
+
+    hourly = resample(timeline, "hour", AMSTERDAM)
+
+    assert len(hourly) == 24
+    _assert_contiguous(hourly, 3600)
+    # 0.200, 0.201, 0.202 and 0.203 average to 0.2015
+    assert round(hourly.slots[0].price, 6) == 0.2015
+
+
+def test_resample_is_time_weighted() -> None:
+    """Test buckets weigh each slot by the time it covers."""
+    tariffs = [
+        {
+            "startDateTime": "2025-11-16T09:00:00",
+            "endDateTime": "2025-11-16T09:45:00",
+            "totalAmount": 0.2,
+        },
+        {
+            "startDateTime": "2025-11-16T09:45:00",
+            "endDateTime": "2025-11-16T11:00:00",
+            "totalAmount": 0.4,
+        },
+    ]
+    timeline = build_timeline(tariffs, AMSTERDAM)
+
+    hourly = resample(timeline, "hour", AMSTERDAM)
+    quarters = resample(timeline, "15min", AMSTERDAM)
+
+    assert [round(slot.price, 6) for slot in hourly.slots] == [0.25, 0.4]
+    assert len(quarters) == 8
+    assert [slot.price for slot in quarters.slots[2:4]] == [0.2, 0.4]
+
+
+def test_resample_daily_across_dst() -> None:
+    """Test daily buckets follow local days, including the 25 hour day."""
+    tariffs = _generate_day(date(2025, 10, 25)) + _generate_day(date(2025, 10, 26))
+    timeline = build_timeline(tariffs, AMSTERDAM)
+
+    daily = resample(timeline, "day", AMSTERDAM)
+
+    assert len(daily) == 2
+    assert daily.slots[1].end - daily.slots[1].start == 25 * 3600
+    assert daily.slots[0].end == daily.slots[1].start
+
+
+def test_cheapest_windows_per_day() -> None:
+    """Test the cheapest slots of each day are merged into windows."""
+    tariffs = _generate_day(date(2025, 11, 16)) + _generate_day(date(2025, 11, 17))
+    for idx in (3, 4, 14, 23, 24, 30):
+        tariffs[idx]["totalAmount"] = 0.1
+    timeline = build_timeline(tariffs, AMSTERDAM)
+    slots = timeline.slots
+
+    windows = cheapest_windows(timeline, 4, AMSTERDAM)
+
+    # Day one picks 03-05, 14 and 23; day two its first three hours and 06,
+    # so the window runs on across midnight
+    assert windows == [
+        (slots[3].start, slots[5].start),
+        (slots[14].start, slots[15].start),
+        (slots[23].start, slots[27].start),
+        (slots[30].start, slots[31].start),
+    ]
+
+
+def test_cheapest_windows_within_horizon() -> None:
+    """Test only slots overlapping the horizon are considered."""
+    timeline = build_timeline(_generate_day(date(2025, 11, 16)), AMSTERDAM)
+    slots = timeline.slots
+
+    windows = cheapest_windows(
+        timeline, 2, horizon=(slots[10].start + 1800, slots[14].start)
+    )
+
+    # Prices rise through the day, so the first two slots of the horizon win
+    assert windows == [(slots[10].start, slots[12].start)]
@@ -0,0 +1,182 @@
+"""Test the Essent automation triggers."""
+from collections.abc import Awaitable, Callable
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from homeassistant.components import automation
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.setup import async_setup_component
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+    async_mock_service,
+)
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+)
+
+from custom_components.essent.const import API_ENDPOINT, DOMAIN
+
+DAY = date(2025, 11, 16)
+
+
+TODAY_PRICES = {3: 0.1, 4: 0.1, 14: 0.15, 20: 0.12, 21: 0.2}
+TOMORROW_PRICES = {2: 0.05}
+
+
+def _automation(trigger: dict) -> dict:
+    """Return an automation recording the trigger variables."""
+    return {
+        "alias": trigger["type"],
+        "triggers": {"platform": DOMAIN, **trigger},
+        "actions": {
+            "action": "test.automation",
+            "data_template": {
+                "type": "{{ trigger.type }}",
+                "start": "{{ trigger.start }}",
+                "price": "{{ trigger.price }}",
+                "to_level": "{{ trigger.to_level }}",
+                "avg_price": "{{ trigger.avg_price }}",
+            },
+        },
+    }
+
+
+@pytest.fixture
+async def calls(hass: HomeAssistant) -> list[ServiceCall]:
+    """Track calls to the test action."""
+    return async_mock_service(hass, "test", "automation")
+
+
+async def _setup(
+    hass: HomeAssistant,
+    setup_entry: Callable[..., Awaitable[MockConfigEntry]],
+    day_document: Callable[..., dict],
+    triggers: list[dict],
+) -> None:
+    """Attach the automations, then set up the integration at 01:30."""
+    assert await async_setup_component(
+        hass,
+        automation.DOMAIN,
+        {automation.DOMAIN: [_automation(trigger) for trigger in triggers]},
+    )
+    with patch(
+        "custom_components.essent.coordinator.random.randint", return_value=17
+    ):
+        await setup_entry(
+            datetime(2025, 11, 16, 1, 30),
+            {"prices": [day_document(DAY, TODAY_PRICES)]},
+        )
+
+
+async def _run_until(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, hour: int, minute: int = 0
+) -> None:
+    """Move through every quarter hour up to a local time on the test day."""
+    end = dt_util.as_local(datetime(2025, 11, 16, hour, minute))
+    moment = dt_util.now()
+    while moment < end:
+        moment = min(moment + timedelta(minutes=15), end)
+        freezer.move_to(moment)
+        async_fire_time_changed(hass, moment)
+        await hass.async_block_till_done()
+
+
+async def test_price_triggers(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calls: list[ServiceCall],
+    setup_entry: Callable[..., Awaitable[MockConfigEntry]],
+    day_document: Callable[..., dict],
+) -> None:
+    """Test time based triggers fire at the slot starts computed from the data."""
+    await _setup(
+        hass,
+        setup_entry,
+        day_document,
+        [
+            {"type": "price_below", "price": 0.16},
+            {"type": "cheapest_window_starting", "slots": 4},
+            {"type": "price_level_changed", "to": "very_cheap"},
+        ],
+    )
+    assert calls == []
+
+    await _run_until(hass, freezer, 23, 30)
+
+    fired = [
+        (call.data["type"], dt_util.parse_datetime(call.data["start"]).hour)
+        for call in calls
+    ]
+    assert sorted(fired) == sorted(
+        [
+            ("price_below", 3),
+            ("price_below", 14),
+            ("price_below", 20),
+            ("cheapest_window_starting", 3),
+            ("cheapest_window_starting", 14),
+            ("cheapest_window_starting", 20),
+            ("price_level_changed", 3),
+            ("price_level_changed", 20),
+        ]
+    )
+    assert {
+        call.data["price"]
+        for call in calls
+        if call.data["start"].startswith("2025-11-16T20")
+    } == {0.12}
+    assert {
+        call.data["to_level"]
+        for call in calls
+        if call.data["type"] == "price_level_changed"
+    } == {"very_cheap"}
+
+
+async def test_tomorrow_published(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    aioclient_mock: AiohttpClientMocker,
+    calls: list[ServiceCall],
+    setup_entry: Callable[..., Awaitable[MockConfigEntry]],
+    day_document: Callable[..., dict],
+) -> None:
+    """Test the trigger fires once when tomorrow's prices appear."""
+    await _setup(
+        hass,
+        setup_entry,
+        day_document,
+        [{"type": "tomorrow_published"}, {"type": "price_below", "price": 0.06}],
+    )
+
+    await _run_until(hass, freezer, 14, 30)
+    assert calls == []
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(
+        API_ENDPOINT,
+        json={
+            "prices": [
+                day_document(DAY, TODAY_PRICES),
+                day_document(DAY + timedelta(days=1), TOMORROW_PRICES),
+            ]
+        },
+    )
+    await _run_until(hass, freezer, 17, 30)
+
+    assert [call.data["type"] for call in calls] == ["tomorrow_published"]
+    assert calls[0].data["avg_price"] == pytest.approx(
+        (23 * 0.3 + 0.05) / 24
+    )
+
+    # Tomorrow's cheap slot was planned when the prices appeared
+    freezer.move_to(dt_util.as_local(datetime(2025, 11, 17, 2)))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert [call.data["type"] for call in calls] == [
+        "tomorrow_published",
+        "price_below",
+    ]
+    assert calls[1].data["start"].startswith("2025-11-17T02:00:00")